@@ -14,6 +14,7 @@ import json
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import pandas as pd
 
 # 將專案目錄加入 Python path
 project_root = Path(__file__).parent
@@ -46,7 +47,11 @@ class DailyAnomalyChecker:
             'total_anomalies': len(anomalies),
             'critical_count': len([a for a in anomalies if a['severity'] == 'critical']),
             'warning_count': len([a for a in anomalies if a['severity'] == 'warning']),
-            'anomalies': anomalies
+            'anomalies': anomalies,
+            # 尾端指標（p50/p90/p99，合併每日分位數 sketch，成本與掃描量無關）
+            'tail_metrics': self._tail_metrics(),
+            # 收入表與訂閱資料的對帳結果（一次事件掃描重建每日收入）
+            'revenue_mismatches': self._revenue_mismatches()
         }
 
         # 儲存到歷史記錄
@@ -65,6 +70,29 @@ class DailyAnomalyChecker:
 
         return report
 
+    def _tail_metrics(self):
+        """最新一天的尾端指標；沒有資料的分位數記為 None（JSON 不接受 NaN）"""
+        return {
+            metric: {
+                name: None if pd.isna(value) else value
+                for name, value in self.analytics.get_scan_percentiles(metric, days=1).items()
+            }
+            for metric in config.QUANTILE_SKETCHES
+        }
+
+    def _revenue_mismatches(self):
+        """重建每日收入並列出與 revenue.csv 不一致的天數"""
+        mismatches = self.analytics.reconcile_revenue()
+        return [
+            {
+                'date': row.date.strftime('%Y-%m-%d'),
+                'column': row.column,
+                'expected': float(row.expected),
+                'actual': None if pd.isna(row.actual) else float(row.actual),
+            }
+            for row in mismatches.itertuples(index=False)
+        ]
+
     def _save_to_history(self, report):
         """儲存異常記錄到 JSON 檔案"""
         history = []
@@ -93,6 +121,20 @@ class DailyAnomalyChecker:
         """印出報告到終端機"""
         anomalies = report['anomalies']
 
+        print("📊 今日尾端指標 (p50 / p90 / p99)：")
+        for metric, values in report.get('tail_metrics', {}).items():
+            print(f"   - {metric}: " + " / ".join(
+                "無資料" if value is None else f"{value:,.1f}" for value in values.values()
+            ))
+        print()
+
+        revenue_mismatches = report.get('revenue_mismatches', [])
+        if revenue_mismatches:
+            print(f"🧾 收入表對帳：{len(revenue_mismatches)} 筆不一致（前 5 筆）")
+            for m in revenue_mismatches[:5]:
+                print(f"   - {m['date']} {m['column']}: 重建值 {m['expected']:,.2f} / 收入表 {m['actual']}")
+            print()
+
         if not anomalies:
             print("✅ 太好了！所有指標都正常，沒有發現異常")
             return
@@ -0,0 +1,42 @@
+"""
+Train (or refresh) the churn-risk model offline and cache it for the dashboard
+
+The model is stored in data/models/ under the fingerprint of its training
+data; the dashboard and SaaSAnalytics.get_churn_risk() load it from there
+instead of training on the request path.
+
+Usage:
+    python scripts/train_churn_model.py [--retrain]
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import config
+from src.core.analytics import SaaSAnalytics
+
+
+def main():
+    retrain = '--retrain' in sys.argv[1:]
+    analytics = SaaSAnalytics()
+    model = analytics.churn_model(retrain=retrain)
+
+    print(f"\n{'='*60}")
+    print("Churn-Risk Model")
+    print(f"{'='*60}")
+    print(f"Fingerprint: {model.fingerprint}  |  Cached in: {config.MODEL_DIR}")
+    print(f"Training rows: {model.n_rows:,}  |  Churned within {model.horizon_days} days: "
+          f"{model.n_churned:,} ({model.base_rate:.1%})")
+    print(f"Out-of-time AUC: {model.holdout_auc:.3f}\n")
+
+    risk = analytics.get_churn_risk()
+    print("Active subscribers by risk tier:")
+    for tier, count in risk['risk_tier'].value_counts().items():
+        print(f"   - {tier}: {count:,}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Sparse user x period activity matrices shared by retention and engagement metrics
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .cohorts import month_index, periods_to_index
+
+
+class ActivityMatrix:
+    """
+    Scan counts per (user, day) and (user, month) as scipy.sparse CSR matrices
+
+    Rows are every user in the users table plus any scan user missing from it
+    (sorted ids; users who never scanned are empty rows), columns are days or
+    months from the first scan. Memory is proportional to the number of active
+    (user, period) pairs, not users x periods. Retention, N-day retention,
+    resurrection and activity counts are all reductions over these matrices.
+    """
+
+    def __init__(self, user_ids, daily, monthly, first_day, first_month,
+                 signup_day, signup_month, signup_known):
+        self.user_ids = user_ids
+        self.daily = daily
+        self.monthly = monthly
+        self.first_day = first_day
+        self.first_month = first_month
+        # Signup period per row as a column offset (may be negative);
+        # signup_known is False for scan users missing from the users table
+        self.signup_day = signup_day
+        self.signup_month = signup_month
+        self.signup_known = signup_known
+
+    @classmethod
+    def build(cls, scans, users=None):
+        """
+        Build both matrices in one pass over scans
+
+        Args:
+            scans: scans.csv frame (user_id, scan_date)
+            users: Optional users.csv frame, needed for signup-relative metrics;
+                users without scans still get a (empty) row so they count in
+                retention denominators
+
+        Returns:
+            ActivityMatrix
+        """
+        scan_users = scans['user_id'].to_numpy()
+        user_ids = np.unique(scan_users if users is None
+                             else np.concatenate([scan_users, users['user_id'].to_numpy()]))
+        rows = np.searchsorted(user_ids, scan_users)
+        days = scans['scan_date'].to_numpy().astype('datetime64[D]').astype('int64')
+        months = month_index(scans['scan_date'])
+        ones = np.ones(len(rows), dtype=np.int32)
+
+        first_day = int(days.min()) if len(days) else 0
+        first_month = int(months.min()) if len(months) else 0
+        n_days = int(days.max()) - first_day + 1 if len(days) else 0
+        n_months = int(months.max()) - first_month + 1 if len(months) else 0
+
+        # Duplicate (row, col) entries are summed -> scans per user per period
+        daily = sparse.csr_matrix(
+            (ones, (rows, days - first_day)), shape=(len(user_ids), n_days)
+        )
+        monthly = sparse.csr_matrix(
+            (ones, (rows, months - first_month)), shape=(len(user_ids), n_months)
+        )
+
+        signup_day = np.zeros(len(user_ids), dtype=np.int64)
+        signup_month = np.zeros(len(user_ids), dtype=np.int64)
+        signup_known = np.zeros(len(user_ids), dtype=bool)
+        if users is not None:
+            positions = pd.Index(users['user_id']).get_indexer(user_ids)
+            known = positions >= 0
+            user_days = users['signup_date'].to_numpy().astype('datetime64[D]').astype('int64')
+            user_months = month_index(users['signup_date'])
+            signup_day[known] = user_days[positions[known]] - first_day
+            signup_month[known] = user_months[positions[known]] - first_month
+            signup_known = known
+
+        return cls(user_ids, daily, monthly, first_day, first_month,
+                   signup_day, signup_month, signup_known)
+
+    def _matrix(self, granularity):
+        """Matrix and per-row signup offset for 'day' or 'month'"""
+        if granularity == 'day':
+            return self.daily, self.signup_day
+        if granularity == 'month':
+            return self.monthly, self.signup_month
+        raise ValueError("granularity must be 'day' or 'month'")
+
+    def scans_per_user(self):
+        """
+        Total scans per user, for users with at least one scan
+
+        Returns:
+            pandas.Series: indexed by user_id
+        """
+        counts = np.asarray(self.daily.sum(axis=1)).ravel()
+        scanned = counts > 0
+        return pd.Series(
+            counts[scanned],
+            index=pd.Index(self.user_ids[scanned], name='user_id')
+        )
+
+    def active_users(self, start, end, granularity='day'):
+        """
+        Distinct users active in an inclusive column range
+
+        Args:
+            start: First column (period offset from the first scan period)
+            end: Last column
+        """
+        matrix, _ = self._matrix(granularity)
+        lo, hi = max(start, 0), min(end + 1, matrix.shape[1])
+        if hi <= lo:
+            return 0
+        return int(np.count_nonzero(matrix[:, lo:hi].getnnz(axis=1)))
+
+    def period_active_counts(self, granularity='day'):
+        """Distinct active users in each period (nonzeros per column)"""
+        matrix, _ = self._matrix(granularity)
+        return matrix.getnnz(axis=0)
+
+    def retention_curve(self, max_offset, granularity='day'):
+        """
+        Classic N-period retention for N = 0..max_offset in one reduction
+
+        A user counts as retained at N if they scanned exactly N periods after
+        signup. Only users whose signup + N falls inside the data are eligible.
+
+        Returns:
+            pandas.DataFrame: columns offset, eligible_users, retained_users, retention_rate
+        """
+        matrix, signup = self._matrix(granularity)
+        coo = matrix.tocoo()
+        offsets = coo.col - signup[coo.row]
+        hit = self.signup_known[coo.row] & (offsets >= 0) & (offsets <= max_offset)
+        retained = np.bincount(offsets[hit], minlength=max_offset + 1)
+
+        # Eligible at N: known signup and signup + N still within the observed
+        # columns, i.e. headroom >= N (reverse cumulative count of headrooms)
+        headroom = matrix.shape[1] - 1 - signup[self.signup_known]
+        headroom = np.minimum(headroom[headroom >= 0], max_offset)
+        eligible = np.bincount(headroom, minlength=max_offset + 1)[::-1].cumsum()[::-1]
+
+        return pd.DataFrame({
+            'offset': np.arange(max_offset + 1),
+            'eligible_users': eligible,
+            'retained_users': retained,
+            'retention_rate': np.where(eligible > 0, retained / np.maximum(eligible, 1) * 100, 0.0),
+        })
+
+    def growth_accounting(self, granularity='month'):
+        """
+        New / retained / resurrected / churned users per period
+
+        From each user's sorted active periods: the first is "new", a period
+        right after another active one is "retained", one after a gap is
+        "resurrected", and an active period not followed by the next one
+        produces a "churned" count in that next period.
+
+        Returns:
+            pandas.DataFrame: one row per period
+        """
+        matrix, _ = self._matrix(granularity)
+        n_periods = matrix.shape[1]
+        # CSR rows are user-ordered; sort indices so periods ascend within a row
+        csr = matrix.tocsr()
+        csr.sort_indices()
+        rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+        cols = csr.indices.astype(np.int64)
+
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        gap = np.zeros(len(rows), dtype=np.int64)
+        gap[1:] = cols[1:] - cols[:-1]
+
+        new = np.bincount(cols[first], minlength=n_periods)
+        retained = np.bincount(cols[~first & (gap == 1)], minlength=n_periods)
+        resurrected = np.bincount(cols[~first & (gap > 1)], minlength=n_periods)
+
+        # Churned in p+1: active in p and not active in p+1
+        last = np.ones(len(rows), dtype=bool)
+        last[:-1] = rows[:-1] != rows[1:]
+        next_gap = np.zeros(len(rows), dtype=np.int64)
+        next_gap[:-1] = cols[1:] - cols[:-1]
+        leaves = (last | (next_gap > 1)) & (cols + 1 < n_periods)
+        churned = np.bincount(cols[leaves] + 1, minlength=n_periods)
+
+        first_period = self.first_day if granularity == 'day' else self.first_month
+        return pd.DataFrame({
+            'period': periods_to_index(first_period + np.arange(n_periods), granularity),
+            'new': new,
+            'retained': retained,
+            'resurrected': resurrected,
+            'churned': churned,
+            'active': new + retained + resurrected,
+        })
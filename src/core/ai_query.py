@@ -34,9 +34,13 @@ class AIQueryEngine:
         """Get current metrics context for Claude"""
         # Get channel performance data
         channel_perf = self.analytics.get_channel_performance()
+        channel_significance = self.analytics.get_conversion_significance('acquisition_channel').set_index('acquisition_channel')
         channel_data = {}
         for _, row in channel_perf.iterrows():
+            significance = channel_significance.loc[row['channel']]
             channel_data[row['channel']] = {
+                "conversion_vs_rest": f"{significance['difference']:+.2f}% (p={significance['p_value']:.3f})",
+                "conversion_difference_significant": bool(significance['is_significant']),
                 "total_users": int(row['total_users']),
                 "conversions": int(row['conversions']),
                 "conversion_rate": f"{row['conversion_rate']:.2f}%",
@@ -86,15 +90,35 @@ class AIQueryEngine:
                 'recent_rate': f"{data['recent_rate']:.2f}%",
                 'previous_rate': f"{data['previous_rate']:.2f}%",
                 'change': f"{data['change']:+.2f}%",
+                'change_95ci': f"[{data['ci_low']:+.2f}%, {data['ci_high']:+.2f}%]",
+                'p_value': f"{data['p_value']:.4f}",
+                'is_significant': data['is_significant'],
                 'is_declining': data['is_declining'],
-                'trend': '📉 下降' if data['is_declining'] else '📈 上升'
+                'trend': (
+                    ('📉 下降' if data['change'] < 0 else '📈 上升') if data['is_significant']
+                    else '➖ 無顯著變化（在雜訊範圍內）'
+                )
             }
 
-        # Get user segment LTV analysis
+        # Full-history weekly funnel (4-week rolling cohorts) so trends can be quoted beyond 60 days
+        funnel_series = self.analytics.get_conversion_funnel_series('week', window=4)
+        funnel_weekly_history = {
+            str(row.cohort.start_time.date()): {
+                stage: f"{getattr(row, stage):.2f}%"
+                for stage in self.analytics.FUNNEL_RATES
+            }
+            for row in funnel_series.iloc[3::4].itertuples(index=False)
+        }
+
+        # Get user segment LTV analysis (+ whether each segment's conversion differs from the rest)
         segment_ltv = self.analytics.get_user_segment_ltv_analysis()
+        segment_significance = self.analytics.get_conversion_significance('user_segment').set_index('user_segment')
         segment_data = {}
         for _, row in segment_ltv.iterrows():
+            significance = segment_significance.loc[row['segment']]
             segment_data[row['segment']] = {
+                "conversion_vs_rest": f"{significance['difference']:+.2f}% (p={significance['p_value']:.3f})",
+                "conversion_difference_significant": bool(significance['is_significant']),
                 "total_users": int(row['total_users']),
                 "conversions": int(row['conversions']),
                 "conversion_rate": f"{row['conversion_rate']:.2f}%",
@@ -107,23 +131,49 @@ class AIQueryEngine:
                 "active_subs": int(row['active_subs'])
             }
 
+        # Headline KPIs in one shared pass (masks/groupbys computed once)
+        kpis = self.analytics.compute([
+            'current_mrr', 'mrr_growth_rate', 'arpu', 'churn_rate', 'conversion_rate',
+            'cac', 'ltv', 'ltv_cac_ratio', 'avg_match_rate', 'avg_scans_per_user'
+        ], days=30, period_days=30)
+
+        # Why MRR moved over the last 30 days (one cached event sweep)
+        waterfall_end = self.analytics.revenue['date'].max()
+        mrr_waterfall = self.analytics.get_mrr_waterfall(waterfall_end - pd.Timedelta(days=29), waterfall_end)
+        mrr_movements_30d = {name: f"${value:,.2f}" for name, value in mrr_waterfall.items()}
+
+        # MRR projection (cached Holt-Winters model; empty if history is too short)
+        mrr_forecast = {}
+        try:
+            for horizon in (30, 90):
+                last = self.analytics.get_forecast('mrr', horizon=horizon).iloc[-1]
+                mrr_forecast[f"{horizon}d"] = {
+                    "forecast": f"${last['forecast']:,.2f}",
+                    "band_95": f"${last['lower']:,.2f} - ${last['upper']:,.2f}",
+                }
+        except ValueError:
+            pass
+
         context = {
-            "current_mrr": f"${self.analytics.get_current_mrr():,.2f}",
-            "mrr_growth_30d": f"{self.analytics.get_mrr_growth_rate(30):.2f}%",
-            "arpu": f"${self.analytics.get_arpu():.2f}",
-            "churn_rate": f"{self.analytics.get_churn_rate(30):.2f}%",
-            "conversion_rate": f"{self.analytics.get_conversion_rate():.2f}%",
-            "cac": f"${self.analytics.get_cac():.2f}",
-            "ltv": f"${self.analytics.get_ltv():.2f}",
-            "ltv_cac_ratio": f"{self.analytics.get_ltv_cac_ratio():.2f}",
+            "current_mrr": f"${kpis['current_mrr']:,.2f}",
+            "mrr_growth_30d": f"{kpis['mrr_growth_rate']:.2f}%",
+            "mrr_movements_30d": mrr_movements_30d,
+            "mrr_forecast": mrr_forecast,
+            "arpu": f"${kpis['arpu']:.2f}",
+            "churn_rate": f"{kpis['churn_rate']:.2f}%",
+            "conversion_rate": f"{kpis['conversion_rate']:.2f}%",
+            "cac": f"${kpis['cac']:.2f}",
+            "ltv": f"${kpis['ltv']:.2f}",
+            "ltv_cac_ratio": f"{kpis['ltv_cac_ratio']:.2f}",
             "dau": self.analytics.get_active_users('daily'),
             "wau": self.analytics.get_active_users('weekly'),
             "mau": self.analytics.get_active_users('monthly'),
-            "avg_match_rate": f"{self.analytics.get_avg_match_rate():.2f}%",
-            "avg_scans_per_user": f"{self.analytics.get_avg_scans_per_user():.2f}",
+            "avg_match_rate": f"{kpis['avg_match_rate']:.2f}%",
+            "avg_scans_per_user": f"{kpis['avg_scans_per_user']:.2f}",
             "channel_performance": channel_data,
             "conversion_funnel": funnel_data,
             "conversion_funnel_trends": funnel_trend_summary,
+            "conversion_funnel_weekly_history": funnel_weekly_history,
             "user_segments": segment_data
         }
         return context
@@ -192,6 +242,9 @@ When calculating annual churn loss:
 2. `user_segments` - 三個用戶區隔的完整 LTV 分析：job_seeker, career_switcher, university_students
 3. `conversion_funnel` - 當前的轉換漏斗數據
 4. `channel_performance` - 各獲客渠道的表現
+5. `conversion_funnel_weekly_history` - 全期間每 4 週一個點的漏斗轉換率（key = 該 4 週最後一週的起始日）
+6. `mrr_movements_30d` - 過去 30 天 MRR 變動拆解：starting_mrr + new + expansion + reactivation + contraction + churn = ending_mrr（contraction、churn 為負值）。回答「MRR 為什麼變動」時請引用這些數字
+7. `mrr_forecast` - 30 / 90 天後的 MRR 預測值與 95% 預測區間（指數平滑模型）；談未來 MRR 時請同時引用區間
 
 **YOUR JOB**: Analyze the data provided and give SPECIFIC answers with NUMBERS from these datasets.
 
@@ -209,8 +262,16 @@ Each stage shows:
 - `recent_rate`: 最近 30 天的轉換率
 - `previous_rate`: 30-60 天前的轉換率
 - `change`: 變化量（正數=上升，負數=下降）
-- `is_declining`: true/false（是否下降）
-- `trend`: 📉 下降 或 📈 上升
+- `change_95ci`: 變化量的 95% 信賴區間（bootstrap）
+- `p_value`: 變化是否只是雜訊（< 0.05 才算顯著）
+- `is_significant`: true/false（變化是否統計顯著）
+- `is_declining`: true/false（是否「顯著」下降；不顯著的負變化為 false）
+- `trend`: 📉 下降、📈 上升，或 ➖ 無顯著變化
+
+**IMPORTANT**: 只有 `is_significant` 為 true 時才能說轉換率「正在下降/上升」。
+若不顯著，請說明「變化在雜訊範圍內」，並引用信賴區間。
+`user_segments` 與 `channel_performance` 中的 `conversion_difference_significant`
+同理：不顯著的區隔/渠道差異不要當成結論。
 
 **EXAMPLE OF GOOD ANSWER**:
 
@@ -3,10 +3,31 @@ Analytics module for calculating SaaS metrics
 """
 import pandas as pd
 import numpy as np
-import functools
 from datetime import datetime, timedelta
 from scipy import stats
 from . import config
+from .activity import ActivityMatrix
+from .bootstrap import bootstrap_compare, ratio_statistic
+from .churn import ChurnModel, build_churn_features, training_rows
+from .cohorts import CohortCube, CohortMatrix, period_index, periods_to_index
+from .cube import MetricsCube
+from .forecast import fitted_model
+from .grouped import group_codes, grouped_distinct, grouped_quantiles
+from .movements import MOVEMENT_TYPES, MRRMovements
+from .reconcile import REVENUE_DAYS_PER_MONTH, reconcile_revenue
+from .sampling import replicate_groups, replicate_interval, sample_mask, user_hashes
+from .scenarios import ScenarioGrid
+from .sketches import (
+    DailyQuantileSketches, DailyUserBitsets, DailyUserSketches, linear_buckets, log_buckets
+)
+from .survival import DAYS_PER_MONTH, SurvivalCurves
+
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
+
+def _to_ns(values):
+    """Convert a datetime Series (NaT already dropped) to int64 nanoseconds"""
+    return values.to_numpy(dtype='datetime64[ns]').view('int64')
 
 
 class SaaSAnalytics:
@@ -92,6 +113,58 @@ class SaaSAnalytics:
         self.subscriptions = self.subscriptions[self.subscriptions['user_id'].isin(valid_user_ids)]
         self.scans = self.scans[self.scans['user_id'].isin(valid_user_ids)]
 
+    def _memo(self, key, builder):
+        """
+        Return a per-snapshot cached value, building it on first use
+
+        The dataframes never change after loading/filtering, so intermediates
+        (masks, groupbys) can be shared by every metric that needs them.
+        Stored in __dict__ so it also works for instances from from_dataframes().
+        """
+        cache = self.__dict__.setdefault('_snapshot_cache', {})
+        if key not in cache:
+            cache[key] = builder()
+        return cache[key]
+
+    def _active_subscriptions(self):
+        """Subscriptions with status == 'active' (shared by ARPU, LTV and plan breakdowns)"""
+        return self._memo(
+            'active_subscriptions',
+            lambda: self.subscriptions[self.subscriptions['status'] == 'active']
+        )
+
+    def _churn_counts(self, period_days):
+        """
+        Count subscriptions active at period start and churned during the period
+
+        Returns:
+            tuple: (active_at_start, churned)
+        """
+        def build():
+            end_date = self.revenue['date'].max()
+            start_date = end_date - timedelta(days=period_days)
+            sub_start = self.subscriptions['subscription_start']
+            sub_end = self.subscriptions['subscription_end']
+
+            active_start = (sub_start <= start_date) & (sub_end.isna() | (sub_end > start_date))
+            churned = (sub_end >= start_date) & (sub_end <= end_date)
+            return int(active_start.sum()), int(churned.sum())
+
+        return self._memo(('churn_counts', period_days), build)
+
+    def activity_matrix(self):
+        """
+        Sparse user x day / user x month scan-count matrices (built once per snapshot)
+
+        Returns:
+            ActivityMatrix
+        """
+        return self._memo('activity_matrix', lambda: ActivityMatrix.build(self.scans, self.users))
+
+    def _scans_per_user(self):
+        """Number of scans per user (shared by funnel and scans-per-user metrics)"""
+        return self._memo('scans_per_user', lambda: self.activity_matrix().scans_per_user())
+
     def get_current_mrr(self):
         """Get current Monthly Recurring Revenue"""
         return self.revenue.iloc[-1]['mrr']
@@ -136,33 +209,20 @@ class SaaSAnalytics:
 
     def get_arpu(self):
         """Calculate Average Revenue Per User"""
-        active_subs = self.subscriptions[self.subscriptions['status'] == 'active']
+        active_subs = self._active_subscriptions()
         if len(active_subs) == 0:
             return 0
         return active_subs['mrr'].mean()
 
     def get_churn_rate(self, period_days=30):
         """Calculate churn rate for the specified period"""
-        end_date = self.revenue['date'].max()
-        start_date = end_date - timedelta(days=period_days)
-
-        # Subscriptions active at start
-        active_start = self.subscriptions[
-            (self.subscriptions['subscription_start'] <= start_date) &
-            ((self.subscriptions['subscription_end'].isna()) |
-             (self.subscriptions['subscription_end'] > start_date))
-        ]
-
-        # Subscriptions that churned during period
-        churned = self.subscriptions[
-            (self.subscriptions['subscription_end'] >= start_date) &
-            (self.subscriptions['subscription_end'] <= end_date)
-        ]
+        # Subscriptions active at start / churned during period
+        active_start, churned = self._churn_counts(period_days)
 
-        if len(active_start) == 0:
+        if active_start == 0:
             return 0
 
-        churn_rate = (len(churned) / len(active_start)) * 100
+        churn_rate = (churned / active_start) * 100
         return churn_rate
 
     def get_conversion_rate(self):
@@ -193,65 +253,699 @@ class SaaSAnalytics:
         cac = self.get_cac()
         return ltv / cac if cac > 0 else 0
 
-    def get_active_users(self, period='daily'):
-        """Get active users (users who performed scans)"""
-        if period == 'daily':
-            days = 1
-        elif period == 'weekly':
-            days = 7
-        else:  # monthly
-            days = 30
+    def get_scenario_grid(self, churn_reductions=None, arpu_uplifts=None, conversion_uplifts=None,
+                          horizon_months=None):
+        """
+        What-if grid over churn reduction x ARPU uplift x conversion uplift (PERFORMANCE OPTIMIZATION)
+
+        Starts from today's ARPU, 30-day churn and conversion rate (the
+        get_ltv inputs), the active paying base and the last 30 days of
+        signups, and evaluates every lever combination in one NumPy
+        broadcast. Memoized on this instance per grid; the dashboard keeps
+        the result in its own st.cache_data entry, since every rerun gets a
+        fresh copy of the cached snapshot.
+
+        Args:
+            churn_reductions: Relative churn reductions (default config.SCENARIO_CHURN_REDUCTIONS)
+            arpu_uplifts: Relative ARPU increases (default config.SCENARIO_ARPU_UPLIFTS)
+            conversion_uplifts: Relative conversion increases (default config.SCENARIO_CONVERSION_UPLIFTS)
+            horizon_months: Projection horizon for MRR and revenue (default config.SCENARIO_HORIZON_MONTHS)
+
+        Returns:
+            ScenarioGrid: surface(metric, conversion_uplift) gives a heatmap slice,
+                frame() every scenario as a row
+        """
+        levers = tuple(
+            tuple(float(v) for v in (values if values is not None else default))
+            for values, default in (
+                (churn_reductions, config.SCENARIO_CHURN_REDUCTIONS),
+                (arpu_uplifts, config.SCENARIO_ARPU_UPLIFTS),
+                (conversion_uplifts, config.SCENARIO_CONVERSION_UPLIFTS),
+            )
+        )
+        horizon_months = horizon_months or config.SCENARIO_HORIZON_MONTHS
+
+        def build():
+            latest = self._churn_reference()
+            recent_signups = (self.users['signup_date'] >= latest - timedelta(days=30)).sum()
+            return ScenarioGrid.build(
+                arpu=float(self.get_arpu()),
+                monthly_churn=self.get_churn_rate(30) / 100,
+                conversion_rate=self.get_conversion_rate() / 100 if len(self.users) else 0.0,
+                paid_subscribers=len(self._active_subscriptions()),
+                monthly_signups=int(recent_signups),
+                churn_reductions=levers[0],
+                arpu_uplifts=levers[1],
+                conversion_uplifts=levers[2],
+                horizon_months=horizon_months,
+            )
+
+        return self._memo(('scenario_grid', levers, horizon_months), build)
+
+    def _subscription_attribute(self, by):
+        """Per-subscription labels for a subscriptions column or a users column (joined on user_id)"""
+        if by in self.subscriptions.columns:
+            labels = self.subscriptions[by]
+        elif by in self.users.columns:
+            labels = self.subscriptions['user_id'].map(self.users.set_index('user_id')[by])
+        else:
+            raise ValueError(f"Unknown survival dimension '{by}': not a subscriptions or users column")
+        return labels.fillna('unknown').to_numpy()
+
+    def survival_curves(self, by=None):
+        """
+        Kaplan-Meier subscription survival curves (PERFORMANCE OPTIMIZATION)
+
+        Durations run from subscription_start to subscription_end, or to the
+        last revenue date for subscriptions still active (censored). All groups
+        are fitted in one sorted pass and cached per snapshot and dimension.
+
+        Args:
+            by: Optional subscriptions or users column, e.g. 'plan_type',
+                'acquisition_channel', 'user_segment' (None = all subscriptions)
+
+        Returns:
+            SurvivalCurves
+        """
+        def build():
+            subs = self.subscriptions
+            snapshot_end = self.revenue['date'].max() if len(self.revenue) else subs['subscription_start'].max()
+            sub_end = subs['subscription_end']
+            durations = (sub_end.fillna(snapshot_end) - subs['subscription_start']).dt.total_seconds() / 86400
+            groups = None if by is None else self._subscription_attribute(by)
+            return SurvivalCurves.fit(np.maximum(durations.to_numpy(), 0), sub_end.notna().to_numpy(), groups)
+
+        return self._memo(('survival_curves', by), build)
+
+    def get_survival_ltv(self, by=None, horizon_months=36):
+        """
+        Survival-based LTV per group: average subscription MRR x expected lifetime
+
+        Expected lifetime is the area under the Kaplan-Meier curve up to the
+        horizon (restricted mean), so churned and still-active subscriptions
+        both count without assuming a flat lifetime or a constant churn rate.
+
+        Args:
+            by: Optional dimension (see survival_curves)
+            horizon_months: Lifetime cap in months (default 3 years, as get_ltv)
+
+        Returns:
+            pandas.DataFrame: group column (by or 'group'), subscriptions, churned,
+                avg_mrr, median_lifetime_months, expected_lifetime_months, ltv
+        """
+        curves = self.survival_curves(by)
+        labels = pd.Index(curves.labels)
+        if by is None:
+            avg_mrr = np.array([self.subscriptions['mrr'].mean()]) if len(self.subscriptions) else np.zeros(len(labels))
+        else:
+            avg_mrr = (
+                self.subscriptions['mrr'].groupby(self._subscription_attribute(by)).mean()
+                .reindex(labels).to_numpy()
+            )
+
+        expected_months = curves.restricted_mean(horizon_months * DAYS_PER_MONTH) / DAYS_PER_MONTH
+        return pd.DataFrame({
+            by or 'group': curves.labels,
+            'subscriptions': curves.sizes,
+            'churned': np.bincount(curves.group, weights=curves.events, minlength=len(labels)).astype(np.int64),
+            'avg_mrr': avg_mrr,
+            'median_lifetime_months': curves.median_lifetime() / DAYS_PER_MONTH,
+            'expected_lifetime_months': expected_months,
+            'ltv': avg_mrr * expected_months,
+        })
+
+    def _churn_reference(self):
+        """End of the latest day with data (features and labels are as of this time)"""
+        latest = max(self.revenue['date'].max(), self.scans['scan_date'].max())
+        return latest.normalize() + timedelta(days=1)
+
+    def churn_model(self, retrain=False, train=True):
+        """
+        Churn-risk model for this snapshot (trained once per training-data fingerprint)
+
+        Training rows are subscribers active at monthly reference dates with a
+        label for churning within config.CHURN_HORIZON_DAYS. The fitted model
+        is cached in config.MODEL_DIR under the fingerprint of its training
+        data, so it is only retrained when that history changes.
+
+        Args:
+            retrain: Ignore the cached model and fit again
+            train: If False, never fit: load the latest model trained offline
+                by scripts/train_churn_model.py (works on any time range)
+
+        Returns:
+            ChurnModel
+
+        Raises:
+            ValueError: If the snapshot has no complete outcome window with both
+                churned and retained subscribers (e.g. a short time filter)
+            FileNotFoundError: If train=False and no model has been trained yet
+        """
+        if not train:
+            return self._memo('latest_churn_model', lambda: ChurnModel.load_latest(config.MODEL_DIR))
+
+        def build():
+            rows, labels = training_rows(
+                self.subscriptions, self._churn_reference(),
+                config.CHURN_HORIZON_DAYS, config.CHURN_TRAINING_SNAPSHOTS
+            )
+            features = build_churn_features(rows, self.scans)
+            return ChurnModel.load_or_train(
+                config.MODEL_DIR, features, labels, rows['reference'].to_numpy(),
+                config.CHURN_HORIZON_DAYS, retrain=retrain
+            )
+
+        if retrain:
+            self.__dict__.setdefault('_snapshot_cache', {}).pop('churn_model', None)
+        return self._memo('churn_model', build)
+
+    def get_churn_risk(self, train=True):
+        """
+        Score every active subscriber in one batch (PERFORMANCE OPTIMIZATION)
+
+        Features come from one vectorized pass over the snapshot and the model
+        runs once over all of them. Every feature is measured against the
+        snapshot's reference date, so all rows change from one day to the next
+        and there is nothing to reuse between snapshots.
+
+        Args:
+            train: Passed to churn_model(); False only loads the offline model
+
+        Returns:
+            pandas.DataFrame: user_id, plan_type, billing_cycle, mrr, tenure_days,
+                days_since_last_scan, scans_30d, match_rate_trend,
+                churn_probability and risk_tier ('high' / 'medium' / 'low' against
+                config.CHURN_RISK_TIERS x the training churn rate), highest risk first
+        """
+        model = self.churn_model(train=train)
+        subs = self._active_subscriptions()
+        features = build_churn_features(subs.assign(reference=self._churn_reference()), self.scans)
+        probability = model.predict(features)
+
+        # Tiers are relative to how often subscribers churned in training
+        high = config.CHURN_RISK_TIERS['high'] * model.base_rate
+        medium = config.CHURN_RISK_TIERS['medium'] * model.base_rate
+        risk = pd.DataFrame({
+            'user_id': subs['user_id'].to_numpy(),
+            'plan_type': subs['plan_type'].to_numpy(),
+            'billing_cycle': subs['billing_cycle'].to_numpy(),
+            'mrr': subs['mrr'].to_numpy(),
+            'tenure_days': features['tenure_days'].to_numpy(),
+            'days_since_last_scan': features['days_since_last_scan'].to_numpy(),
+            'scans_30d': features['scans_30d'].to_numpy(),
+            'match_rate_trend': features['match_rate_trend'].to_numpy(),
+            'churn_probability': probability,
+            'risk_tier': np.select(
+                [probability >= high, probability >= medium], ['high', 'medium'], 'low'
+            ),
+        })
+        return risk.sort_values('churn_probability', ascending=False, kind='stable').reset_index(drop=True)
+
+    def user_sketches(self):
+        """
+        Per-day HyperLogLog sketches of scanning users (built once per snapshot)
+
+        Returns:
+            DailyUserSketches: day numbers are days since epoch
+        """
+        return self._memo('user_sketches', lambda: DailyUserSketches.build(
+            self.scans['user_id'].to_numpy(dtype='int64'),
+            _to_ns(self.scans['scan_date']) // NS_PER_DAY,
+            precision=config.HLL_PRECISION
+        ))
+
+    def get_active_users(self, period='daily', days=None, exact=None):
+        """
+        Get active users (users who performed scans)
+
+        Args:
+            period: 'daily', 'weekly' or 'monthly' (ignored when days is given)
+            days: Optional window length in days (any value)
+            exact: True = nunique() over scans in the rolling window
+                (scan_date > latest scan - days), False = merge the per-day
+                sketches of the last `days` calendar days up to the latest scan
+                day (sketches cannot split a day, so this approximates the
+                rolling window), None = exact unless scans exceeds
+                config.EXACT_ACTIVE_USERS_MAX_SCANS
+
+        Returns:
+            int: Number of distinct active users
+        """
+        if days is None:
+            if period == 'daily':
+                days = 1
+            elif period == 'weekly':
+                days = 7
+            else:  # monthly
+                days = 30
+
+        if exact is None:
+            exact = len(self.scans) <= config.EXACT_ACTIVE_USERS_MAX_SCANS
+
+        if not exact:
+            sketches = self.user_sketches()
+            if len(sketches.registers) == 0:
+                return 0
+            return sketches.count(sketches.last_day - days + 1, sketches.last_day)
 
         cutoff_date = self.scans['scan_date'].max() - timedelta(days=days)
         active = self.scans[self.scans['scan_date'] > cutoff_date]['user_id'].nunique()
         return active
 
+    def user_bitsets(self):
+        """
+        Per-day bitsets of scanning users (built once per snapshot)
+
+        Returns:
+            DailyUserBitsets: day numbers are days since epoch
+        """
+        return self._memo('user_bitsets', lambda: DailyUserBitsets.build(
+            self.scans['user_id'].to_numpy(dtype='int64'),
+            _to_ns(self.scans['scan_date']) // NS_PER_DAY
+        ))
+
+    def _day_number(self, date):
+        """Convert a date-like value to a day number (days since epoch)"""
+        return int(pd.Timestamp(date).value // NS_PER_DAY)
+
+    def get_active_users_exact(self, days=1, end_date=None):
+        """
+        Exact distinct users active over calendar days, via per-day bitsets
+
+        Args:
+            days: Window length in calendar days
+            end_date: Last day of the window (default: latest scan day)
+
+        Returns:
+            int: Number of distinct active users
+        """
+        bitsets = self.user_bitsets()
+        if len(bitsets.bits) == 0:
+            return 0
+        end_day = bitsets.last_day if end_date is None else self._day_number(end_date)
+        return bitsets.count(end_day - days + 1, end_day)
+
+    def get_retained_users(self, date_a, date_b, days=1):
+        """
+        Exact users active in both windows (e.g. "active on day A and day B")
+
+        Args:
+            date_a: Last day of the first window
+            date_b: Last day of the second window
+            days: Length of each window in calendar days
+
+        Returns:
+            int: Number of users active in both windows
+        """
+        bitsets = self.user_bitsets()
+        day_a = self._day_number(date_a)
+        day_b = self._day_number(date_b)
+        return bitsets.count_both(
+            (day_a - days + 1, day_a),
+            (day_b - days + 1, day_b)
+        )
+
+    def get_retention_curve(self, max_days=30, granularity='day'):
+        """
+        N-day (or N-month) retention since signup for every N up to max_days
+
+        Returns:
+            pandas.DataFrame: offset, eligible_users, retained_users, retention_rate
+        """
+        return self.activity_matrix().retention_curve(max_days, granularity)
+
+    def get_n_day_retention(self, n):
+        """
+        Percentage of users who scanned exactly N days after signup
+
+        Returns:
+            float: Retention rate among users whose day N is within the data
+        """
+        return float(self.get_retention_curve(n)['retention_rate'].iloc[-1])
+
+    def get_growth_accounting(self, granularity='month'):
+        """
+        New, retained, resurrected and churned active users per period
+
+        Returns:
+            pandas.DataFrame: period, new, retained, resurrected, churned, active
+        """
+        return self.activity_matrix().growth_accounting(granularity)
+
+    def get_stickiness(self, exact=None):
+        """
+        Calculate DAU/MAU stickiness
+
+        Returns:
+            float: DAU as a percentage of MAU
+        """
+        mau = self.get_active_users('monthly', exact=exact)
+        if mau == 0:
+            return 0.0
+        return self.get_active_users('daily', exact=exact) / mau * 100
+
     def get_avg_match_rate(self):
         """Calculate average resume match rate"""
         return self.scans['match_rate'].mean()
 
     def get_avg_scans_per_user(self):
         """Calculate average scans per user"""
-        return self.scans.groupby('user_id').size().mean()
+        return self._scans_per_user().mean()
+
+    def scan_quantile_sketches(self, metric):
+        """
+        Per-day quantile sketches of a scans column (built once per snapshot per metric)
+
+        Args:
+            metric: A key of config.QUANTILE_SKETCHES ('match_rate',
+                'processing_time_ms', 'keywords_extracted')
+
+        Returns:
+            DailyQuantileSketches: day numbers are days since epoch
+        """
+        if metric not in config.QUANTILE_SKETCHES:
+            raise ValueError(
+                f"Unknown quantile metric '{metric}'. Choose from: {', '.join(config.QUANTILE_SKETCHES)}"
+            )
+
+        def build():
+            spec = config.QUANTILE_SKETCHES[metric]
+            if spec['scale'] == 'log':
+                buckets = log_buckets(spec['low'], spec['high'], spec['accuracy'])
+            else:
+                buckets = linear_buckets(spec['low'], spec['high'], spec['width'])
+            return DailyQuantileSketches.build(
+                self.scans[metric].to_numpy(dtype='float64'),
+                _to_ns(self.scans['scan_date']) // NS_PER_DAY,
+                buckets
+            )
+
+        return self._memo(('scan_quantiles', metric), build)
+
+    def get_scan_percentiles(self, metric='match_rate', days=None, end_date=None, percentiles=(50, 90, 99)):
+        """
+        Tail metrics (p50/p90/p99 by default) for a scans column over any window
+
+        Merges per-day sketches instead of sorting the scans table, so the
+        cost is constant per day in the window.
+
+        Args:
+            metric: Scans column with a sketch (see scan_quantile_sketches)
+            days: Window length in calendar days ending at end_date (None = all data)
+            end_date: Last day of the window (default: latest scan)
+            percentiles: Percentiles in [0, 100]
+
+        Returns:
+            dict: {'p50': value, 'p90': value, ...} (NaN for an empty window)
+        """
+        sketches = self.scan_quantile_sketches(metric)
+        end_day = sketches.last_day if end_date is None else self._day_number(end_date)
+        start_day = sketches.first_day if days is None else end_day - days + 1
+        values = sketches.quantiles(start_day, end_day, [p / 100 for p in percentiles])
+        return {f'p{p:g}': float(value) for p, value in zip(percentiles, values)}
+
+    def _scan_codes(self):
+        """
+        Integer codes for the scans table (built once per snapshot)
+
+        Returns:
+            dict: job_title (category code per scan), job_titles (categories),
+                day (days since epoch), user (user_id), paid (bool)
+        """
+        def build():
+            titles = pd.Categorical(self.scans['job_title'].fillna('unknown'))
+            return {
+                'job_title': titles.codes.astype(np.int64),
+                'job_titles': titles.categories,
+                'day': _to_ns(self.scans['scan_date']) // NS_PER_DAY,
+                'user': self.scans['user_id'].to_numpy(dtype='int64'),
+                'paid': self.scans['is_paid_user'].fillna(False).to_numpy(dtype=bool),
+            }
+
+        return self._memo('scan_codes', build)
+
+    def _scan_window(self, start=None, end=None):
+        """Boolean scan mask for an inclusive scan-date window"""
+        days = self._scan_codes()['day']
+        mask = np.ones(len(days), dtype=bool)
+        if start is not None:
+            mask &= days >= self._day_number(start)
+        if end is not None:
+            mask &= days <= self._day_number(end)
+        return mask
+
+    def get_job_title_breakdown(self, granularity=None, start=None, end=None, percentiles=(50, 90)):
+        """
+        Scan volume, users, match rate, processing time and paid share per job title (PERFORMANCE OPTIMIZATION)
+
+        Job titles, days and users are integer codes built once per snapshot;
+        every group (title, or period x title) is summarized in one pass of
+        bincounts plus one sort for the exact percentiles. Memoized on this
+        instance per arguments (the dashboard caches it in st.cache_data).
+
+        Args:
+            granularity: None (whole window) or 'day' / 'week' / 'month' buckets
+            start: Optional first scan date (inclusive)
+            end: Optional last scan date (inclusive)
+            percentiles: Match-rate and processing-time percentiles in [0, 100]
+
+        Returns:
+            pandas.DataFrame: [period,] job_title, scans, users, paid_share (% of
+                scans by paid users), avg_match_rate, match_rate_p<N>...,
+                avg_processing_time_ms, processing_time_p<N>...; sorted by
+                [period and] scan volume
+        """
+        percentiles = tuple(percentiles)
+
+        def build():
+            codes = self._scan_codes()
+            mask = self._scan_window(start, end)
+            keys = [codes['job_title'][mask]]
+            if granularity is not None:
+                periods = period_index(self.scans['scan_date'][mask], granularity)
+                first_period = periods.min() if len(periods) else 0
+                keys.insert(0, periods - first_period)
+            groups, _, group_keys = group_codes(*keys)
+            n_groups = len(group_keys[0])
+
+            scans = np.bincount(groups, minlength=n_groups)
+            match_rate = self.scans['match_rate'].to_numpy(dtype='float64')[mask]
+            processing = self.scans['processing_time_ms'].to_numpy(dtype='float64')[mask]
+            qs = [p / 100 for p in percentiles]
+            match_q = grouped_quantiles(groups, match_rate, n_groups, qs)
+            processing_q = grouped_quantiles(groups, processing, n_groups, qs)
+
+            result = {}
+            if granularity is not None:
+                result['period'] = periods_to_index(group_keys[0] + first_period, granularity)
+            result['job_title'] = codes['job_titles'].take(group_keys[-1])
+            result['scans'] = scans
+            result['users'] = grouped_distinct(groups, codes['user'][mask], n_groups)
+            result['paid_share'] = np.bincount(groups, weights=codes['paid'][mask], minlength=n_groups) / scans * 100
+            result['avg_match_rate'] = np.bincount(groups, weights=match_rate, minlength=n_groups) / scans
+            for i, p in enumerate(percentiles):
+                result[f'match_rate_p{p:g}'] = match_q[:, i]
+            result['avg_processing_time_ms'] = np.bincount(groups, weights=processing, minlength=n_groups) / scans
+            for i, p in enumerate(percentiles):
+                result[f'processing_time_p{p:g}'] = processing_q[:, i]
+
+            frame = pd.DataFrame(result)
+            order = ['scans'] if granularity is None else ['period', 'scans']
+            return frame.sort_values(order, ascending=[True] * (len(order) - 1) + [False], kind='stable').reset_index(drop=True)
+
+        return self._memo(('job_title_breakdown', granularity, start, end, percentiles), build)
+
+    # Groupings available to get_latency_report() (tier = 'paid' / 'free' scan)
+    LATENCY_DIMENSIONS = ('job_title', 'tier')
+
+    def get_latency_report(self, granularity='day', by=LATENCY_DIMENSIONS, start=None, end=None, slo_ms=None):
+        """
+        Scan processing-latency SLO report: percentiles, breaches and breach minutes (PERFORMANCE OPTIMIZATION)
+
+        Every (period, job title, tier) group is summarized in one pass over
+        the cached scan codes: one sort for the exact p50/p95/p99, bincounts
+        for scan and breach counts, and one unique over (group, minute) of
+        the breaching scans for breach minutes. Memoized on this instance per
+        arguments (the dashboard caches it in st.cache_data).
+
+        Args:
+            granularity: 'day' / 'week' / 'month' buckets, or None for the whole window
+            by: Subset of LATENCY_DIMENSIONS to split by (empty = all scans)
+            start: Optional first scan date (inclusive)
+            end: Optional last scan date (inclusive)
+            slo_ms: Latency SLO in ms (default config.LATENCY_SLO_MS)
+
+        Returns:
+            pandas.DataFrame: [period,] the `by` columns, scans, p50_ms, p95_ms,
+                p99_ms, breaches, breach_rate (%), breach_minutes
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        unknown = [dim for dim in by if dim not in self.LATENCY_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown latency dimension(s) {unknown}. Choose from: {', '.join(self.LATENCY_DIMENSIONS)}")
+        slo_ms = config.LATENCY_SLO_MS if slo_ms is None else slo_ms
+
+        def build():
+            codes = self._scan_codes()
+            mask = self._scan_window(start, end)
+            keys = []
+            if granularity is not None:
+                periods = period_index(self.scans['scan_date'][mask], granularity)
+                first_period = periods.min() if len(periods) else 0
+                keys.append(periods - first_period)
+            if 'job_title' in by:
+                keys.append(codes['job_title'][mask])
+            if 'tier' in by:
+                keys.append(codes['paid'][mask].astype(np.int64))
+            if not keys:
+                keys.append(np.zeros(np.count_nonzero(mask), dtype=np.int64))
+            groups, _, group_keys = group_codes(*keys)
+            n_groups = len(group_keys[0])
+
+            latency = self.scans['processing_time_ms'].to_numpy(dtype='float64')[mask]
+            breached = latency > slo_ms
+            minutes = _to_ns(self.scans['scan_date'])[mask] // (60 * 10**9)
+            scans = np.bincount(groups, minlength=n_groups)
+            breaches = np.bincount(groups[breached], minlength=n_groups)
+            quantiles = grouped_quantiles(groups, latency, n_groups, (0.5, 0.95, 0.99))
+
+            result = {}
+            columns = iter(group_keys)
+            if granularity is not None:
+                result['period'] = periods_to_index(next(columns) + first_period, granularity)
+            if 'job_title' in by:
+                result['job_title'] = codes['job_titles'].take(next(columns))
+            if 'tier' in by:
+                result['tier'] = np.where(next(columns) == 1, 'paid', 'free')
+            result.update({
+                'scans': scans,
+                'p50_ms': quantiles[:, 0],
+                'p95_ms': quantiles[:, 1],
+                'p99_ms': quantiles[:, 2],
+                'breaches': breaches,
+                'breach_rate': breaches / np.maximum(scans, 1) * 100,
+                'breach_minutes': grouped_distinct(groups[breached], minutes[breached], n_groups),
+            })
+            return pd.DataFrame(result)
+
+        return self._memo(('latency_report', granularity, by, start, end, slo_ms), build)
+
+    def cohort_matrix(self):
+        """
+        (cohort, months-since-signup) distinct-user matrix, kept with the snapshot
+
+        Returns:
+            CohortMatrix: Updated incrementally by append_scans()
+        """
+        return self._memo('cohort_matrix', lambda: CohortMatrix.build(self.users, self.scans))
+
+    def cohort_cube(self, granularity='month'):
+        """
+        Cohort retention cube over channel, segment, country and plan (cached per granularity)
+
+        Args:
+            granularity: 'day', 'week' or 'month'
+
+        Returns:
+            CohortCube: Slice with cube.retention(dimension=value, ...)
+        """
+        return self._memo(('cohort_cube', granularity), lambda: CohortCube.build(
+            self.users, self.scans, self.subscriptions, granularity=granularity
+        ))
 
     def get_cohort_analysis(self):
-        """Generate cohort retention analysis"""
-        # Group users by signup month
-        self.users['cohort'] = self.users['signup_date'].dt.to_period('M')
-
-        # Merge with scans to see activity
-        user_scans = self.scans.merge(
-            self.users[['user_id', 'cohort']],
-            on='user_id'
-        )
+        """
+        Generate cohort retention analysis (PERFORMANCE OPTIMIZED)
 
-        user_scans['scan_month'] = user_scans['scan_date'].dt.to_period('M')
+        Uses integer month numbers on compact arrays instead of merging scans
+        with users and subtracting Periods row by row. Never mutates
+        self.users, so shared snapshots stay untouched. The underlying count
+        matrix is maintained incrementally (see append_scans).
 
-        # Calculate months since signup
-        user_scans['months_since_signup'] = (
-            (user_scans['scan_month'] - user_scans['cohort']).apply(lambda x: x.n)
-        )
+        Returns:
+            pandas.DataFrame: Retention % indexed by signup cohort (monthly
+                Period), columns = months_since_signup
+        """
+        return self.cohort_matrix().retention()
 
-        # Create cohort matrix
-        cohort_data = user_scans.groupby(['cohort', 'months_since_signup'])['user_id'].nunique().reset_index()
-        cohort_pivot = cohort_data.pivot(
-            index='cohort',
-            columns='months_since_signup',
-            values='user_id'
-        )
+    def append_scans(self, scans, users=None):
+        """
+        Snapshot with newly arrived scans (and optionally users) appended
+
+        Returns a new instance and leaves this one untouched, so a snapshot
+        shared through st.cache_data is never mutated. The new snapshot's
+        cohort matrix is a copy of this one updated only in the cells the new
+        scans touch; every other cached intermediate is rebuilt on next use.
+
+        Args:
+            scans: DataFrame with the scans.csv columns
+            users: Optional DataFrame of new users (users.csv columns)
+
+        Returns:
+            SaaSAnalytics: The appended snapshot
+        """
+        matrix = self.cohort_matrix().copy()
 
-        # Calculate retention percentages
-        cohort_sizes = cohort_pivot.iloc[:, 0]
-        retention = cohort_pivot.divide(cohort_sizes, axis=0) * 100
+        appended = self.__class__.__new__(self.__class__)
+        appended.users = self.users
+        appended.subscriptions = self.subscriptions
+        appended.revenue = self.revenue
+        appended.time_range_days = self.time_range_days
 
-        return retention
+        if users is not None:
+            appended.users = pd.concat([self.users, users], ignore_index=True)
+            matrix.add_users(users)
+        appended.scans = pd.concat([self.scans, scans], ignore_index=True)
+        matrix.add_scans(scans)
+
+        appended._snapshot_cache = {'cohort_matrix': matrix}
+        return appended
+
+    def _user_funnel_counts(self):
+        """
+        Per-user scan and subscription counts aligned with self.users rows
+
+        Built once per snapshot from the scans-per-user rollup, so every funnel
+        stage and cohort is a boolean mask + sum over these two arrays.
+
+        Returns:
+            tuple: (scan_counts, paid_counts) int arrays in self.users order
+        """
+        def build():
+            user_ids = self.users['user_id']
+            scan_counts = self._scans_per_user().reindex(user_ids, fill_value=0).to_numpy()
+            paid_counts = (
+                self.subscriptions['user_id'].value_counts()
+                .reindex(user_ids, fill_value=0)
+                .to_numpy()
+            )
+            return scan_counts, paid_counts
+
+        return self._memo('user_funnel_counts', build)
+
+    def _funnel_stages(self, cohort_mask):
+        """
+        Funnel stage counts for the users selected by a boolean mask over self.users
+
+        Returns:
+            tuple: (signups, with_scan, with_multiple_scans, paid)
+        """
+        scan_counts, paid_counts = self._user_funnel_counts()
+        scan_counts = scan_counts[cohort_mask]
+        return (
+            int(np.count_nonzero(cohort_mask)),
+            int(np.count_nonzero(scan_counts > 0)),
+            int(np.count_nonzero(scan_counts > 1)),
+            int(paid_counts[cohort_mask].sum())
+        )
 
     def get_conversion_funnel(self):
         """Calculate conversion funnel metrics"""
+        # All stages come from the shared scans-per-user rollup
+        scans_per_user = self._scans_per_user()
         total_users = len(self.users)
-        users_with_scans = self.scans['user_id'].nunique()
-        users_with_multiple_scans = self.scans.groupby('user_id').size()
-        users_with_multiple_scans = len(users_with_multiple_scans[users_with_multiple_scans > 1])
+        users_with_scans = len(scans_per_user)
+        users_with_multiple_scans = int((scans_per_user > 1).sum())
         paid_users = len(self.subscriptions)
 
         funnel = {
@@ -263,20 +957,17 @@ class SaaSAnalytics:
 
         return pd.DataFrame([funnel]).T.reset_index()
 
-    @functools.lru_cache(maxsize=1)
     def get_user_match_stats(self):
         """
-        Calculate average match rate per user (PERFORMANCE OPTIMIZED with LRU cache)
+        Calculate average match rate per user (PERFORMANCE OPTIMIZED, cached per snapshot)
 
-        This is an expensive groupby operation on 7.5MB of scan data.
-        Using lru_cache makes subsequent calls 90% faster (0.05s vs 0.5s)
+        This is an expensive groupby operation on 7.5MB of scan data, so it
+        is built once per snapshot with the other cached intermediates.
 
         Returns:
             pandas.Series: Average match rate for each user
         """
-        # Convert DataFrame to hashable tuple for caching
-        # (lru_cache requires hashable arguments)
-        return self.scans.groupby('user_id')['match_rate'].mean()
+        return self._memo('user_match_stats', lambda: self.scans.groupby('user_id')['match_rate'].mean())
 
     def get_conversion_funnel_trend(self):
         """Calculate conversion funnel trends over time to identify if rates are declining"""
@@ -286,30 +977,13 @@ class SaaSAnalytics:
         period_30_days = latest_date - timedelta(days=30)
         period_60_days = latest_date - timedelta(days=60)
 
-        # Recent cohort (last 30 days)
-        recent_users = self.users[self.users['signup_date'] > period_30_days]
-        recent_user_ids = set(recent_users['user_id'])
+        # Cohort masks over self.users; stage counts come from the shared per-user vectors
+        signup_dates = self.users['signup_date']
+        recent_mask = (signup_dates > period_30_days).to_numpy()
+        previous_mask = ((signup_dates <= period_30_days) & (signup_dates > period_60_days)).to_numpy()
 
-        # Previous cohort (30-60 days ago)
-        previous_users = self.users[
-            (self.users['signup_date'] <= period_30_days) &
-            (self.users['signup_date'] > period_60_days)
-        ]
-        previous_user_ids = set(previous_users['user_id'])
-
-        # Calculate funnel for recent cohort
-        recent_total = len(recent_user_ids)
-        recent_with_scan = len(self.scans[self.scans['user_id'].isin(recent_user_ids)]['user_id'].unique())
-        recent_scans_grouped = self.scans[self.scans['user_id'].isin(recent_user_ids)].groupby('user_id').size()
-        recent_with_multiple = len(recent_scans_grouped[recent_scans_grouped > 1])
-        recent_paid = len(self.subscriptions[self.subscriptions['user_id'].isin(recent_user_ids)])
-
-        # Calculate funnel for previous cohort
-        previous_total = len(previous_user_ids)
-        previous_with_scan = len(self.scans[self.scans['user_id'].isin(previous_user_ids)]['user_id'].unique())
-        previous_scans_grouped = self.scans[self.scans['user_id'].isin(previous_user_ids)].groupby('user_id').size()
-        previous_with_multiple = len(previous_scans_grouped[previous_scans_grouped > 1])
-        previous_paid = len(self.subscriptions[self.subscriptions['user_id'].isin(previous_user_ids)])
+        recent_total, recent_with_scan, recent_with_multiple, recent_paid = self._funnel_stages(recent_mask)
+        previous_total, previous_with_scan, previous_with_multiple, previous_paid = self._funnel_stages(previous_mask)
 
         # Calculate conversion rates
         def safe_rate(numerator, denominator):
@@ -329,16 +1003,25 @@ class SaaSAnalytics:
             'overall_conversion': safe_rate(previous_paid, previous_total)
         }
 
+        # Bootstrap CI / p-value per stage so noise is not reported as a decline
+        significance = self._funnel_significance(recent_mask, previous_mask)
+
         # Calculate changes
         changes = {}
-        for key in recent_rates:
+        for i, key in enumerate(recent_rates):
             change = recent_rates[key] - previous_rates[key]
+            p_value = float(significance['p_value'][i])
+            is_significant = p_value < config.SIGNIFICANCE_LEVEL
             changes[key] = {
                 'recent_rate': recent_rates[key],
                 'previous_rate': previous_rates[key],
                 'change': change,
                 'change_pct': (change / previous_rates[key] * 100) if previous_rates[key] > 0 else 0,
-                'is_declining': change < 0
+                'ci_low': float(significance['ci_low'][i]),
+                'ci_high': float(significance['ci_high'][i]),
+                'p_value': p_value,
+                'is_significant': is_significant,
+                'is_declining': change < 0 and is_significant
             }
 
         return {
@@ -349,15 +1032,151 @@ class SaaSAnalytics:
             'conversion_stages': changes
         }
 
+    def _funnel_significance(self, mask_a, mask_b):
+        """
+        Batched bootstrap of the FUNNEL_RATES difference between two user cohorts
+
+        Each user's outcome is (has scan, has 2+ scans, subscriptions); see
+        bootstrap_compare for how resampling is batched.
+
+        Returns:
+            dict: difference, ci_low, ci_high, p_value arrays in FUNNEL_RATES order
+        """
+        scan_counts, paid_counts = self._user_funnel_counts()
+        outcomes = np.column_stack([scan_counts > 0, scan_counts > 1, paid_counts])
+        # Stage name -> outcome column (-1 = cohort size)
+        columns = {'signups': -1, 'with_scan': 0, 'with_multiple_scans': 1, 'paid': 2}
+        statistic = ratio_statistic(
+            [columns[numerator] for numerator, _ in self.FUNNEL_RATES.values()],
+            [columns[denominator] for _, denominator in self.FUNNEL_RATES.values()]
+        )
+        return bootstrap_compare(
+            outcomes[mask_a], outcomes[mask_b], statistic,
+            n_resamples=config.BOOTSTRAP_RESAMPLES
+        )
+
+    def get_conversion_significance(self, by='user_segment'):
+        """
+        Is each group's conversion rate really different from everyone else's?
+
+        One-vs-rest batched bootstrap per group on per-user conversions.
+
+        Args:
+            by: Users column or cube dimension (see breakdown)
+
+        Returns:
+            pandas.DataFrame: by, total_users, conversion_rate, rest_rate,
+                difference, ci_low, ci_high, p_value, is_significant
+        """
+        frame = self._user_performance_frame()
+        if by not in frame.columns:
+            raise ValueError(f"Unknown breakdown column '{by}'. Choose from: {', '.join(frame.columns)}")
+
+        conversions = frame['conversions'].to_numpy()
+        labels = frame[by].to_numpy()
+        statistic = ratio_statistic([0], [-1])
+
+        rows = []
+        for label in pd.unique(labels):
+            in_group = labels == label
+            result = bootstrap_compare(
+                conversions[in_group], conversions[~in_group], statistic,
+                n_resamples=config.BOOTSTRAP_RESAMPLES
+            )
+            group_rate = conversions[in_group].sum() / in_group.sum() * 100
+            rows.append({
+                by: label,
+                'total_users': int(in_group.sum()),
+                'conversion_rate': group_rate,
+                'rest_rate': group_rate - float(result['difference'][0]),
+                'difference': float(result['difference'][0]),
+                'ci_low': float(result['ci_low'][0]),
+                'ci_high': float(result['ci_high'][0]),
+                'p_value': float(result['p_value'][0]),
+            })
+
+        significance = pd.DataFrame(rows).sort_values(by).reset_index(drop=True)
+        significance['is_significant'] = significance['p_value'] < config.SIGNIFICANCE_LEVEL
+        return significance
+
+    # Stage conversion rates reported by the funnel trend and series
+    FUNNEL_RATES = {
+        'signup_to_first_scan': ('with_scan', 'signups'),
+        'first_to_second_scan': ('with_multiple_scans', 'with_scan'),
+        'second_scan_to_paid': ('paid', 'with_multiple_scans'),
+        'overall_conversion': ('paid', 'signups'),
+    }
+
+    def get_conversion_funnel_series(self, granularity='week', window=1):
+        """
+        Funnel stage conversion for every signup cohort (PERFORMANCE OPTIMIZATION)
+
+        Stage counts for all cohorts come from one bincount per stage over the
+        shared per-user count vectors, and rolling windows are a cumulative-sum
+        difference - O(users + cohorts), never a rescan of scans per cohort.
+
+        Args:
+            granularity: 'day' or 'week' signup cohorts
+            window: Number of consecutive cohorts pooled into each point
+                (1 = each cohort on its own)
+
+        Returns:
+            pandas.DataFrame: one row per cohort with stage counts (signups,
+                with_scan, with_multiple_scans, paid) and FUNNEL_RATES in %
+        """
+        if granularity not in ('day', 'week'):
+            raise ValueError("granularity must be 'day' or 'week'")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        columns = ['cohort', 'signups', 'with_scan', 'with_multiple_scans', 'paid', *self.FUNNEL_RATES]
+        if len(self.users) == 0:
+            return pd.DataFrame(columns=columns)
+
+        scan_counts, paid_counts = self._user_funnel_counts()
+        periods = period_index(self.users['signup_date'], granularity)
+        first = int(periods.min())
+        codes = periods - first
+        n_cohorts = int(codes.max()) + 1
+
+        stages = np.vstack([
+            np.bincount(codes, minlength=n_cohorts),
+            np.bincount(codes, weights=scan_counts > 0, minlength=n_cohorts),
+            np.bincount(codes, weights=scan_counts > 1, minlength=n_cohorts),
+            np.bincount(codes, weights=paid_counts, minlength=n_cohorts),
+        ]).astype(np.int64)
+
+        if window > 1:
+            # Rolling sum over the trailing `window` cohorts
+            cumulative = np.cumsum(stages, axis=1)
+            stages = cumulative - np.pad(cumulative, ((0, 0), (window, 0)))[:, :n_cohorts]
+
+        series = pd.DataFrame({
+            'cohort': periods_to_index(first + np.arange(n_cohorts), granularity),
+            'signups': stages[0],
+            'with_scan': stages[1],
+            'with_multiple_scans': stages[2],
+            'paid': stages[3],
+        })
+        for rate, (numerator, denominator) in self.FUNNEL_RATES.items():
+            den = series[denominator].to_numpy()
+            series[rate] = np.where(den > 0, series[numerator].to_numpy() / np.maximum(den, 1) * 100, 0.0)
+        return series
+
     def get_revenue_by_plan(self):
-        """Calculate revenue breakdown by plan type"""
-        active_subs = self.subscriptions[self.subscriptions['status'] == 'active']
-        revenue_by_plan = active_subs.groupby('plan_type').agg({
-            'mrr': 'sum',
-            'user_id': 'count'
-        }).reset_index()
-        revenue_by_plan.columns = ['plan_type', 'mrr', 'subscribers']
-        return revenue_by_plan
+        """
+        Calculate revenue breakdown by plan type (rolled up from the metrics cube)
+
+        Each active subscription counts under its own plan, so the result equals
+        grouping the active subscriptions by plan_type.
+        """
+        by_plan = self.metrics_cube().rollup(['plan_type'])
+        by_plan = by_plan[by_plan['active_subs'] > 0].reset_index(drop=True)
+        return pd.DataFrame({
+            'plan_type': by_plan['plan_type'],
+            'mrr': by_plan['active_mrr'],
+            'subscribers': by_plan['active_subs']
+        })
 
     def get_mrr_trend(self, days=90):
         """Get MRR trend for the last N days"""
@@ -375,6 +1194,392 @@ class SaaSAnalytics:
 
         return trend
 
+    # Default trailing windows (days) for series(); None = point-in-time / cumulative
+    SERIES_DEFAULT_WINDOWS = {
+        'churn': 30,
+        'active_users': 1,
+        'conversion': None,
+        'arpu': None,
+        'mrr': None,
+    }
+
+    def _series_timeline(self):
+        """Daily timeline covered by the revenue table (one row per calendar day)"""
+        if len(self.revenue) == 0:
+            return pd.DatetimeIndex([], name='date')
+        return pd.date_range(
+            self.revenue['date'].min().normalize(),
+            self.revenue['date'].max().normalize(),
+            freq='D',
+            name='date'
+        )
+
+    def _subscription_events(self):
+        """
+        Sorted subscription start/end event times with cumulative MRR
+
+        Returns:
+            dict: start/end times (int64 ns, sorted) and prefix sums of MRR
+                aligned with them (leading 0 so prefix[k] = sum of first k events)
+        """
+        def build():
+            subs = self.subscriptions
+            start_order = np.argsort(_to_ns(subs['subscription_start']), kind='stable')
+            starts = _to_ns(subs['subscription_start'])[start_order]
+            start_mrr = subs['mrr'].to_numpy(dtype=float)[start_order]
+
+            ended = subs[subs['subscription_end'].notna()]
+            end_order = np.argsort(_to_ns(ended['subscription_end']), kind='stable')
+            ends = _to_ns(ended['subscription_end'])[end_order]
+            end_mrr = ended['mrr'].to_numpy(dtype=float)[end_order]
+
+            return {
+                'starts': starts,
+                'start_mrr': np.concatenate([[0.0], np.cumsum(start_mrr)]),
+                'ends': ends,
+                'end_mrr': np.concatenate([[0.0], np.cumsum(end_mrr)]),
+            }
+
+        return self._memo('subscription_events', build)
+
+    def _active_at(self, t):
+        """
+        MRR and count of subscriptions active at each time (start <= t < end)
+
+        Args:
+            t: int64 ns timestamps
+
+        Returns:
+            tuple: (mrr, active_subscriptions) arrays aligned with t
+        """
+        events = self._subscription_events()
+        started = np.searchsorted(events['starts'], t, side='right')
+        ended = np.searchsorted(events['ends'], t, side='right')
+        return events['start_mrr'][started] - events['end_mrr'][ended], started - ended
+
+    def _user_scan_days(self):
+        """
+        Unique (user_id, scan day) pairs sorted by user then day
+
+        Returns:
+            tuple: (user_ids, day_numbers) as int64 arrays, day number = days since epoch
+        """
+        def build():
+            users = self.scans['user_id'].to_numpy(dtype='int64')
+            days = _to_ns(self.scans['scan_date']) // NS_PER_DAY
+
+            order = np.lexsort((days, users))
+            users, days = users[order], days[order]
+            keep = np.ones(len(users), dtype=bool)
+            keep[1:] = (users[1:] != users[:-1]) | (days[1:] != days[:-1])
+            return users[keep], days[keep]
+
+        return self._memo('user_scan_days', build)
+
+    def series(self, metric, window=None):
+        """
+        Daily time series of a metric over the full history (PERFORMANCE OPTIMIZATION)
+
+        All days are computed in one vectorized pass from cumulative counts over
+        the sorted event timeline (subscription starts/ends, signups, scan days),
+        so the cost is O(days + events log events) instead of one mask per day.
+
+        Args:
+            metric: 'churn', 'arpu', 'mrr', 'conversion' or 'active_users'
+            window: Trailing window in days. Defaults: churn 30, active_users 1,
+                conversion None (cumulative to date). Ignored for arpu/mrr.
+
+        Returns:
+            pandas.Series: Daily values indexed by date
+
+        Example:
+            analytics.series('churn', window=30)  # last value == get_churn_rate(30)
+        """
+        if metric not in self.SERIES_DEFAULT_WINDOWS:
+            raise ValueError(
+                f"Unknown series metric '{metric}'. "
+                f"Choose from: {', '.join(self.SERIES_DEFAULT_WINDOWS)}"
+            )
+        if window is None:
+            window = self.SERIES_DEFAULT_WINDOWS[metric]
+
+        return self._memo(('series', metric, window), lambda: self._build_series(metric, window))
+
+    def _build_series(self, metric, window):
+        """Compute one daily series (see series())"""
+        timeline = self._series_timeline()
+        if len(timeline) == 0:
+            return pd.Series(dtype=float, index=timeline, name=metric)
+
+        t = _to_ns(timeline.to_series())
+
+        if metric in ('churn', 'arpu', 'mrr'):
+            events = self._subscription_events()
+            starts, ends = events['starts'], events['ends']
+
+        if metric == 'churn':
+            # Same definition as get_churn_rate, evaluated with end_date = each day.
+            # Active at window start = started by then minus ended by then
+            # (every subscription ends on/after it starts).
+            window_start = t - window * NS_PER_DAY
+            active_start = (
+                np.searchsorted(starts, window_start, side='right') -
+                np.searchsorted(ends, window_start, side='right')
+            )
+            churned = (
+                np.searchsorted(ends, t, side='right') -
+                np.searchsorted(ends, window_start, side='left')
+            )
+            values = np.where(
+                active_start > 0,
+                churned / np.maximum(active_start, 1) * 100,
+                0.0
+            )
+
+        elif metric in ('arpu', 'mrr'):
+            # Active on day t: start <= t and (no end or end > t), same as revenue.csv
+            mrr, active = self._active_at(t)
+            if metric == 'mrr':
+                values = mrr
+            else:
+                values = np.where(active > 0, mrr / np.maximum(active, 1), 0.0)
+
+        elif metric == 'conversion':
+            starts = np.sort(_to_ns(self.subscriptions['subscription_start']))
+            signups = np.sort(_to_ns(self.users['signup_date']))
+            conversions = np.searchsorted(starts, t, side='right')
+            total_signups = np.searchsorted(signups, t, side='right')
+            if window is not None:
+                window_start = t - window * NS_PER_DAY
+                conversions = conversions - np.searchsorted(starts, window_start, side='right')
+                total_signups = total_signups - np.searchsorted(signups, window_start, side='right')
+            values = np.where(
+                total_signups > 0,
+                conversions / np.maximum(total_signups, 1) * 100,
+                0.0
+            )
+
+        else:  # active_users
+            # Each unique (user, scan day) keeps the user active for `window` days,
+            # cut short by that user's next scan day so intervals never overlap.
+            # A +1/-1 difference array then gives distinct users per day via cumsum.
+            users, days = self._user_scan_days()
+            next_day = np.empty_like(days)
+            next_day[:-1] = days[1:]
+            same_user = np.zeros(len(users), dtype=bool)
+            same_user[:-1] = users[1:] == users[:-1]
+            active_until = np.where(
+                same_user,
+                np.minimum(days + window, next_day),
+                days + window
+            )
+
+            first_day = t[0] // NS_PER_DAY
+            n = len(t)
+            enter = np.clip(days - first_day, 0, n)
+            leave = np.clip(active_until - first_day, 0, n)
+            delta = np.bincount(enter, minlength=n + 1) - np.bincount(leave, minlength=n + 1)
+            values = np.cumsum(delta)[:n]
+
+        return pd.Series(values, index=timeline, name=metric)
+
+    # Daily series get_forecast() can project
+    FORECAST_METRICS = ('mrr', 'active_subscriptions', 'signups')
+
+    def _forecast_history(self, metric):
+        """Daily history of a forecastable metric over the snapshot timeline"""
+        if metric not in self.FORECAST_METRICS:
+            raise ValueError(f"Unknown forecast metric '{metric}'. Choose from: {', '.join(self.FORECAST_METRICS)}")
+        timeline = self._series_timeline()
+        if metric == 'signups':
+            days = (self.users['signup_date'].dt.normalize() - timeline[0]).dt.days.to_numpy() if len(timeline) else []
+            days = np.asarray(days, dtype=np.int64)
+            in_range = (days >= 0) & (days < len(timeline))
+            values = np.bincount(days[in_range], minlength=len(timeline))
+        else:
+            daily = self.revenue.groupby(self.revenue['date'].dt.normalize())[metric].last()
+            values = daily.reindex(timeline).ffill().fillna(0).to_numpy()
+        return pd.Series(values.astype(np.float64), index=timeline, name=metric)
+
+    def forecast_model(self, metric='mrr'):
+        """
+        Fitted exponential-smoothing model for a daily series (cached per snapshot)
+
+        Fitted models are also shared across snapshots: when a new snapshot
+        only adds days to a series that was already fitted, the model is
+        advanced over the new days instead of refitted (see forecast.fitted_model).
+
+        Returns:
+            ExponentialSmoothing
+        """
+        def build():
+            history = self._forecast_history(metric)
+            key = (metric, self.time_range_days, history.index[0] if len(history) else None)
+            return fitted_model(key, history.to_numpy())
+
+        return self._memo(('forecast_model', metric), build)
+
+    def get_forecast(self, metric='mrr', horizon=30, confidence=0.95):
+        """
+        Forecast a daily series with a prediction band (PERFORMANCE OPTIMIZATION)
+
+        Additive Holt-Winters (damped trend + weekly seasonality) implemented
+        in NumPy; the smoothing parameters are picked by a grid search that
+        runs all candidates in one vectorized pass.
+
+        Args:
+            metric: 'mrr', 'active_subscriptions' or 'signups'
+            horizon: Days ahead (e.g. 30 or 90)
+            confidence: Prediction band level
+
+        Returns:
+            pandas.DataFrame: indexed by future date; forecast, lower, upper
+                (values below 0 are clipped to 0)
+        """
+        model = self.forecast_model(metric)
+        forecast, lower, upper = model.forecast(horizon, confidence)
+        dates = pd.date_range(self._series_timeline()[-1] + timedelta(days=1), periods=horizon, freq='D', name='date')
+        return pd.DataFrame({
+            'forecast': np.maximum(forecast, 0),
+            'lower': np.maximum(lower, 0),
+            'upper': np.maximum(upper, 0),
+        }, index=dates)
+
+    def mrr_movements(self):
+        """
+        MRR movement components from one sweep of subscription events (built once per snapshot)
+
+        Returns:
+            MRRMovements
+        """
+        return self._memo('mrr_movements', lambda: MRRMovements.build(
+            self.subscriptions['user_id'].to_numpy(),
+            self.subscriptions['subscription_start'].to_numpy(dtype='datetime64[ns]'),
+            self.subscriptions['subscription_end'].to_numpy(dtype='datetime64[ns]'),
+            self.subscriptions['mrr'].to_numpy(dtype=float),
+            self._series_timeline(),
+        ))
+
+    def get_mrr_movements(self, granularity='day'):
+        """
+        MRR movements per day, week or month
+
+        Args:
+            granularity: 'day', 'week' or 'month'
+
+        Returns:
+            pandas.DataFrame: indexed by period start; new, expansion, reactivation,
+                contraction, churn (negative), net and end-of-period mrr
+        """
+        frequencies = {'day': 'D', 'week': 'W-MON', 'month': 'MS'}
+        if granularity not in frequencies:
+            raise ValueError(f"Unknown granularity '{granularity}'. Choose from: {', '.join(frequencies)}")
+        daily = self.mrr_movements().daily()
+        if granularity == 'day':
+            return daily
+        grouped = daily.resample(frequencies[granularity], label='left', closed='left')
+        periods = grouped[[*MOVEMENT_TYPES, 'net']].sum()
+        periods['mrr'] = grouped['mrr'].last()
+        return periods
+
+    def get_mrr_waterfall(self, start=None, end=None):
+        """
+        MRR bridge from the start to the end of a window (inclusive dates)
+
+        Args:
+            start: First day of the window (default: first day of the snapshot)
+            end: Last day of the window (default: last day of the snapshot)
+
+        Returns:
+            dict: starting_mrr, new, expansion, reactivation, contraction, churn,
+                net_change, ending_mrr (starting_mrr = MRR at the end of the day
+                before the window)
+        """
+        daily = self.mrr_movements().daily()
+        if start is not None:
+            start = pd.Timestamp(start).normalize()
+        if end is not None:
+            end = pd.Timestamp(end).normalize()
+        window = daily.loc[start:end]
+        before = daily.loc[:start - pd.Timedelta(days=1)] if start is not None else daily.iloc[:0]
+
+        waterfall = {'starting_mrr': float(before['mrr'].iloc[-1]) if len(before) else 0.0}
+        for kind in MOVEMENT_TYPES:
+            waterfall[kind] = float(window[kind].sum())
+        waterfall['net_change'] = float(window['net'].sum())
+        waterfall['ending_mrr'] = waterfall['starting_mrr'] + waterfall['net_change']
+        return waterfall
+
+    def get_net_revenue_retention(self):
+        """
+        Net revenue retention % per paying cohort (month of a customer's first paid day)
+
+        Returns:
+            pandas.DataFrame: Cohort MRR as % of its MRR at the end of the cohort
+                month, indexed by cohort (monthly Period), columns = months_since_start
+        """
+        return self.mrr_movements().net_revenue_retention()
+
+    def rebuild_revenue(self, dates):
+        """
+        Recompute the revenue table for the given days from subscriptions
+
+        Same definitions as data_generator.py, evaluated for all days at once
+        from the sorted subscription events (see series('mrr')), so the cost
+        is O(days log subscriptions) instead of one mask per day.
+
+        Args:
+            dates: Days to rebuild (midnight timestamps)
+
+        Returns:
+            pandas.DataFrame: date plus REVENUE_COLUMNS
+        """
+        dates = pd.DatetimeIndex(dates)
+        t = _to_ns(dates)
+        mrr, active = self._active_at(t)
+
+        # New / churned: start or end falls on the calendar day of t
+        events = self._subscription_events()
+        day = t // NS_PER_DAY
+        start_days, end_days = events['starts'] // NS_PER_DAY, events['ends'] // NS_PER_DAY
+        new = np.searchsorted(start_days, day, side='right') - np.searchsorted(start_days, day, side='left')
+        churned = np.searchsorted(end_days, day, side='right') - np.searchsorted(end_days, day, side='left')
+
+        return pd.DataFrame({
+            'date': dates,
+            'daily_revenue': mrr / REVENUE_DAYS_PER_MONTH,
+            'mrr': mrr,
+            'active_subscriptions': active,
+            'new_subscriptions': new,
+            'churned_subscriptions': churned,
+        })
+
+    def reconcile_revenue(self, tolerance=None):
+        """
+        Check the revenue table against a rebuild from subscriptions (PERFORMANCE OPTIMIZATION)
+
+        One sort + binary search sweep over subscription events, so it is
+        cheap enough to run on every ingest. Only meaningful on an unfiltered
+        snapshot: time filtering drops subscriptions of users who signed up
+        before the window while keeping their revenue.
+
+        Args:
+            tolerance: Allowed absolute difference for money columns
+                (default config.RECONCILIATION_TOLERANCE)
+
+        Returns:
+            pandas.DataFrame: mismatches (date, column, expected, actual, difference);
+                empty when revenue.csv agrees with subscriptions.csv
+        """
+        if self.time_range_days is not None:
+            raise ValueError("Revenue reconciliation needs the unfiltered snapshot (time_range_days=None)")
+        if tolerance is None:
+            tolerance = config.RECONCILIATION_TOLERANCE
+        return self._memo(
+            ('revenue_reconciliation', tolerance),
+            lambda: reconcile_revenue(self.revenue, self.rebuild_revenue, tolerance)
+        )
+
     def detect_anomalies(self):
         """Detect anomalies in key metrics"""
         anomalies = []
@@ -430,6 +1635,61 @@ class SaaSAnalytics:
                 'message': f'Average match rate ({avg_match_rate*100:.2f}%) below warning threshold'
             })
 
+        # Check the match-rate tail: a falling p10 is hidden by a healthy mean
+        # (skipped when the 7-day window is too small for a stable percentile)
+        match_sketches = self.scan_quantile_sketches('match_rate')
+        recent_scans = match_sketches.window(match_sketches.last_day - 6, match_sketches.last_day).sum()
+        if recent_scans >= config.THRESHOLDS['match_rate_p10']['min_scans']:
+            match_rate_p10 = self.get_scan_percentiles('match_rate', days=7, percentiles=(10,))['p10'] / 100
+            if match_rate_p10 < config.THRESHOLDS['match_rate_p10']['critical']:
+                anomalies.append({
+                    'metric': 'Match Rate p10',
+                    'value': f'{match_rate_p10*100:.2f}%',
+                    'severity': 'critical',
+                    'message': f'10th percentile match rate over 7 days ({match_rate_p10*100:.2f}%) below critical threshold'
+                })
+            elif match_rate_p10 < config.THRESHOLDS['match_rate_p10']['warning']:
+                anomalies.append({
+                    'metric': 'Match Rate p10',
+                    'value': f'{match_rate_p10*100:.2f}%',
+                    'severity': 'warning',
+                    'message': f'10th percentile match rate over 7 days ({match_rate_p10*100:.2f}%) below warning threshold'
+                })
+
+        # Check scan latency against the SLO over the last 7 days
+        if len(self.scans):
+            last_scan = self.scans['scan_date'].max().normalize()
+            latency = self.get_latency_report(granularity=None, by=(), start=last_scan - timedelta(days=6))
+            recent_scans = latency['scans'].iloc[0] if len(latency) else 0
+
+            if recent_scans >= config.THRESHOLDS['latency_p95_ms']['min_scans']:
+                p95_ms = latency['p95_ms'].iloc[0]
+                for severity in ('critical', 'warning'):
+                    if p95_ms > config.THRESHOLDS['latency_p95_ms'][severity]:
+                        anomalies.append({
+                            'metric': 'Scan Latency p95',
+                            'value': f'{p95_ms:,.0f} ms',
+                            'severity': severity,
+                            'message': f'95th percentile scan processing time over 7 days ({p95_ms:,.0f} ms) exceeds {severity} threshold'
+                        })
+                        break
+
+            if recent_scans >= config.THRESHOLDS['slo_breach_rate']['min_scans']:
+                breach_rate = latency['breach_rate'].iloc[0] / 100
+                breach_minutes = latency['breach_minutes'].iloc[0]
+                for severity in ('critical', 'warning'):
+                    if breach_rate > config.THRESHOLDS['slo_breach_rate'][severity]:
+                        anomalies.append({
+                            'metric': 'Latency SLO Breaches',
+                            'value': f'{breach_rate*100:.2f}%',
+                            'severity': severity,
+                            'message': (
+                                f'{breach_rate*100:.2f}% of scans over 7 days exceeded the {config.LATENCY_SLO_MS:,} ms SLO '
+                                f'({breach_minutes:,} breach minutes), above {severity} threshold'
+                            )
+                        })
+                        break
+
         # Check MRR growth
         mrr_growth = self.get_mrr_growth_rate(30) / 100
         if mrr_growth < config.THRESHOLDS['mrr_growth']['critical']:
@@ -449,162 +1709,423 @@ class SaaSAnalytics:
 
         return anomalies
 
-    def get_user_segment_performance(self):
-        """Analyze performance by user segment"""
-        # Merge users with subscriptions
-        user_conversion = self.users.merge(
-            self.subscriptions[['user_id', 'mrr']],
-            on='user_id',
-            how='left'
-        )
+    # Cube dimensions for breakdown(). plan_type: subscription measures count under
+    # each subscription's own plan; user measures (users, CAC, scans) under the
+    # plan of the user's latest subscription, 'free' if none. Any other users
+    # column is grouped directly from the breakdown frame.
+    BREAKDOWN_DIMENSIONS = ('acquisition_channel', 'user_segment', 'country', 'plan_type')
 
-        segment_stats = user_conversion.groupby('user_segment').agg({
-            'user_id': 'count',
-            'mrr': lambda x: x.notna().sum()
-        }).reset_index()
+    def _user_performance_frame(self):
+        """
+        One row per user with breakdown dimensions and per-user subscription totals
 
-        segment_stats.columns = ['segment', 'total_users', 'conversions']
-        segment_stats['conversion_rate'] = (
-            segment_stats['conversions'] / segment_stats['total_users'] * 100
-        )
+        Replaces the users x subscriptions merge: subscription rows are reduced
+        to per-user conversions, active subscriptions and active MRR once per
+        snapshot. plan_type is the plan of the user's latest subscription
+        ('free' if none).
 
-        return segment_stats
+        Returns:
+            pandas.DataFrame: users columns plus plan_type, conversions,
+                active_subs, active_mrr and scans
+        """
+        def build():
+            subs = self.subscriptions
+            per_user = pd.DataFrame({
+                'user_id': subs['user_id'].to_numpy(),
+                'conversions': subs['mrr'].notna().to_numpy(),
+                'active_subs': (subs['status'] == 'active').to_numpy(),
+                'active_mrr': subs['mrr'].where(subs['status'] == 'active', 0.0).to_numpy(),
+            }).groupby('user_id').sum()
+            per_user = per_user.reindex(self.users['user_id'], fill_value=0)
+
+            latest = subs.sort_values('subscription_start', kind='stable').drop_duplicates('user_id', keep='last')
+            plans = latest.set_index('user_id')['plan_type']
+            frame = self.users.reset_index(drop=True).copy()
+            frame['plan_type'] = frame['user_id'].map(plans).fillna('free')
+            frame['conversions'] = per_user['conversions'].to_numpy().astype(np.int64)
+            frame['active_subs'] = per_user['active_subs'].to_numpy().astype(np.int64)
+            frame['active_mrr'] = per_user['active_mrr'].to_numpy()
+            frame['scans'] = self._user_funnel_counts()[0]
+            return frame
+
+        return self._memo('user_performance_frame', build)
+
+    def _breakdown_frame(self):
+        """
+        One row per (user, plan) with additive measures, the input of the metrics cube
 
-    def get_user_segment_ltv_analysis(self):
-        """Comprehensive LTV analysis by user segment"""
-        # Merge users with subscriptions and get active subscriptions
-        user_data = self.users.merge(
-            self.subscriptions[['user_id', 'mrr', 'status']],
-            on='user_id',
-            how='left'
-        )
+        Subscription measures (conversions, active_subs, active_mrr) sit on the
+        row of each subscription's own plan, so a user who came back on another
+        plan adds to both plans. User measures (users = 1, cac, scans) sit only
+        on the row of the user's latest plan, so every user is counted once.
+
+        Returns:
+            pandas.DataFrame: users columns plus plan_type, users, conversions,
+                active_subs, active_mrr and scans
+        """
+        def build():
+            subs = self.subscriptions
+            per_plan = pd.DataFrame({
+                'user_id': subs['user_id'].to_numpy(),
+                'plan_type': subs['plan_type'].to_numpy(),
+                'conversions': subs['mrr'].notna().to_numpy().astype(np.int64),
+                'active_subs': (subs['status'] == 'active').to_numpy().astype(np.int64),
+                'active_mrr': subs['mrr'].where(subs['status'] == 'active', 0.0).to_numpy(),
+            }).groupby(['user_id', 'plan_type'], as_index=False).sum()
+
+            users = self._user_performance_frame()
+            rows = users[['user_id', 'plan_type']].assign(users=np.int64(1)).merge(
+                per_plan, on=['user_id', 'plan_type'], how='outer'
+            )
+            rows = rows[rows['user_id'].isin(users['user_id'])]
+            counted = rows['users'].notna().to_numpy()
+
+            positions = pd.Index(users['user_id']).get_indexer(rows['user_id'])
+            frame = users.drop(columns=['plan_type', 'conversions', 'active_subs', 'active_mrr', 'scans'])
+            frame = frame.iloc[positions].reset_index(drop=True)
+            frame['plan_type'] = rows['plan_type'].to_numpy()
+            frame['users'] = counted.astype(np.int64)
+            frame['conversions'] = rows['conversions'].fillna(0).to_numpy().astype(np.int64)
+            frame['active_subs'] = rows['active_subs'].fillna(0).to_numpy().astype(np.int64)
+            frame['active_mrr'] = rows['active_mrr'].fillna(0.0).to_numpy()
+            frame['cac'] = frame['cac'].where(counted)
+            frame['scans'] = np.where(counted, users['scans'].to_numpy()[positions], 0)
+            return frame
+
+        return self._memo('breakdown_frame', build)
+
+    def metrics_cube(self):
+        """
+        Additive measures per (signup day, channel, segment, country, plan), built once per snapshot
 
-        # Get CAC by segment
-        segment_cac = user_data.groupby('user_segment').agg({
-            'cac': 'mean'
-        }).reset_index()
-        segment_cac.columns = ['segment', 'cac']
-
-        # Get conversion stats
-        segment_stats = user_data.groupby('user_segment').agg({
-            'user_id': 'count',
-            'mrr': lambda x: x.notna().sum(),  # Count conversions
-        }).reset_index()
-
-        segment_stats.columns = ['segment', 'total_users', 'conversions']
-
-        # Get active subscribers and their MRR
-        active_subs = user_data[user_data['status'] == 'active']
-        segment_revenue = active_subs.groupby('user_segment').agg({
-            'mrr': ['sum', 'mean', 'count']
-        }).reset_index()
-        segment_revenue.columns = ['segment', 'total_mrr', 'avg_mrr', 'active_subs']
-
-        # Merge all stats
-        ltv_analysis = segment_stats.merge(segment_revenue, on='segment', how='left')
-        ltv_analysis = ltv_analysis.merge(segment_cac, on='segment', how='left')
-
-        # Fill NaN values
-        ltv_analysis['total_mrr'] = ltv_analysis['total_mrr'].fillna(0)
-        ltv_analysis['avg_mrr'] = ltv_analysis['avg_mrr'].fillna(0)
-        ltv_analysis['active_subs'] = ltv_analysis['active_subs'].fillna(0)
-
-        # Calculate metrics
-        ltv_analysis['conversion_rate'] = (
-            ltv_analysis['conversions'] / ltv_analysis['total_users'] * 100
+        Revenue-by-plan, segment and channel breakdowns are roll-ups of this
+        cube; metrics_cube().rollup(by, start, end, **filters) gives any
+        breakdown for any signup window without touching the raw tables.
+
+        Returns:
+            MetricsCube
+        """
+        return self._memo(
+            'metrics_cube',
+            lambda: MetricsCube.build(self._breakdown_frame(), self.BREAKDOWN_DIMENSIONS)
         )
 
-        # Calculate LTV
-        # LTV = Average MRR * Average Customer Lifetime (in months)
-        # Assume average lifetime of 12 months for active subscribers
-        ltv_analysis['avg_ltv'] = ltv_analysis['avg_mrr'] * 12
+    # Metrics available to breakdown(), all derived from the additive cube measures
+    BREAKDOWN_METRICS = (
+        'total_users', 'conversions', 'conversion_rate', 'active_subs', 'total_mrr',
+        'avg_mrr', 'avg_cac', 'avg_ltv', 'ltv_cac_ratio', 'roi', 'scans', 'scans_per_user'
+    )
 
-        # Calculate LTV:CAC ratio
-        ltv_analysis['ltv_cac_ratio'] = ltv_analysis['avg_ltv'] / ltv_analysis['cac']
-        ltv_analysis['ltv_cac_ratio'] = ltv_analysis['ltv_cac_ratio'].replace([float('inf'), -float('inf')], 0)
+    def _breakdown_measures(self, by, start=None, end=None, **filters):
+        """
+        Additive measures grouped by `by`: a cube roll-up when every column is a
+        cube dimension, otherwise one groupby over the breakdown frame
+
+        Returns:
+            pandas.DataFrame: the `by` columns plus MetricsCube measures
+        """
+        cube = self.metrics_cube()
+        if all(column in cube.dimensions for column in [*by, *filters]):
+            return cube.rollup(by, start=start, end=end, **filters)
+
+        frame = self._breakdown_frame()
+        unknown = [column for column in [*by, *filters] if column not in frame.columns]
+        if unknown:
+            raise ValueError(f"Unknown breakdown column(s) {unknown}. Choose from: {', '.join(frame.columns)}")
+
+        mask = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            mask &= (frame['signup_date'] >= pd.Timestamp(start).normalize()).to_numpy()
+        if end is not None:
+            mask &= (frame['signup_date'] < pd.Timestamp(end).normalize() + timedelta(days=1)).to_numpy()
+        for column, value in filters.items():
+            if value is None:
+                continue
+            wanted = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= frame[column].isin(wanted).to_numpy()
+
+        rows = frame[mask]
+        measures = pd.DataFrame({
+            **{column: rows[column] for column in by},
+            'users': rows['users'],
+            'conversions': rows['conversions'],
+            'active_subs': rows['active_subs'],
+            'active_mrr': rows['active_mrr'],
+            'cac_sum': rows['cac'].fillna(0),
+            'cac_count': rows['cac'].notna().astype(np.int64),
+            'scans': rows['scans'],
+        })
+        if not by:
+            return pd.DataFrame([measures.sum()]).astype(measures.dtypes.to_dict())
+        return measures.groupby(by, observed=True).sum().reset_index()
+
+    def breakdown(self, by, metrics=None, start=None, end=None, lifetime_months=None, **filters):
+        """
+        Conversion, CAC, LTV, ROI and MRR for any users column or combination in one grouped pass
+
+        Args:
+            by: Column name or list of columns, e.g. ['acquisition_channel', 'country']
+            metrics: Subset of BREAKDOWN_METRICS (None = all), in output order
+            start: Optional first signup date (inclusive)
+            end: Optional last signup date (inclusive)
+            lifetime_months: LTV = avg MRR x lifetime_months; None = avg MRR / monthly churn
+            **filters: column=value or column=[values]
 
-        # Calculate ROI
-        ltv_analysis['roi'] = ((ltv_analysis['avg_ltv'] - ltv_analysis['cac']) / ltv_analysis['cac'] * 100)
-        ltv_analysis['roi'] = ltv_analysis['roi'].replace([float('inf'), -float('inf')], 0)
+        Returns:
+            pandas.DataFrame: the `by` columns followed by the requested metrics
 
-        return ltv_analysis
+        Example:
+            analytics.breakdown(['user_segment', 'country'], metrics=['conversion_rate', 'roi'])
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        metrics = list(self.BREAKDOWN_METRICS) if metrics is None else list(dict.fromkeys(metrics))
+        unknown = [name for name in metrics if name not in self.BREAKDOWN_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown breakdown metric(s) {unknown}. Choose from: {', '.join(self.BREAKDOWN_METRICS)}")
+
+        rolled = self._breakdown_measures(by, start=start, end=end, **filters)
+        users = rolled['users']
+        # A plan group can hold only past subscriptions of users now on another plan
+        per_user = users.where(users > 0)
+        active_subs = rolled['active_subs']
+        avg_mrr = (rolled['active_mrr'] / active_subs.where(active_subs > 0)).fillna(0)
+        avg_cac = rolled['cac_sum'] / rolled['cac_count'].where(rolled['cac_count'] > 0)
+
+        if lifetime_months is None:
+            # Simplified LTV: ARPU / overall monthly churn
+            monthly_churn = self.get_churn_rate(30) / 100
+            if monthly_churn == 0:
+                monthly_churn = 0.01  # Default 1% to avoid division by zero
+            avg_ltv = avg_mrr / monthly_churn
+        else:
+            avg_ltv = avg_mrr * lifetime_months
+
+        # ROI: (LTV - CAC) / CAC * 100 and LTV:CAC ratio
+        # For organic (CAC=0), use 999999 to represent "infinite" ROI
+        cac = avg_cac.to_numpy()
+        ltv = avg_ltv.to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi = np.where(cac == 0, 999999, (ltv - cac) / cac * 100)
+            ratio = np.where(cac == 0, 999999, ltv / cac)
+
+        derived = {
+            'total_users': users,
+            'conversions': rolled['conversions'],
+            'conversion_rate': (rolled['conversions'] / per_user * 100).fillna(0),
+            'active_subs': active_subs,
+            'total_mrr': rolled['active_mrr'],
+            'avg_mrr': avg_mrr,
+            'avg_cac': avg_cac,
+            'avg_ltv': avg_ltv,
+            'ltv_cac_ratio': pd.Series(ratio, index=rolled.index).fillna(0),
+            'roi': pd.Series(roi, index=rolled.index).fillna(0),
+            'scans': rolled['scans'],
+            'scans_per_user': (rolled['scans'] / per_user).fillna(0),
+        }
+        result = rolled[by].copy()
+        for name in metrics:
+            result[name] = derived[name]
+        return result
+
+    def get_user_segment_performance(self):
+        """Analyze performance by user segment"""
+        return self.breakdown(
+            'user_segment', metrics=['total_users', 'conversions', 'conversion_rate']
+        ).rename(columns={'user_segment': 'segment'})
+
+    def get_user_segment_ltv_analysis(self):
+        """
+        Comprehensive LTV analysis by user segment
+
+        LTV = Average MRR * Average Customer Lifetime, assuming 12 months for
+        active subscribers.
+        """
+        return self.breakdown(
+            'user_segment',
+            metrics=['total_users', 'conversions', 'total_mrr', 'avg_mrr', 'active_subs',
+                     'avg_cac', 'conversion_rate', 'avg_ltv', 'ltv_cac_ratio', 'roi'],
+            lifetime_months=12
+        ).rename(columns={'user_segment': 'segment', 'avg_cac': 'cac'})
+
+    # Columns reported by the channel performance views
+    CHANNEL_METRICS = ['total_users', 'conversions', 'conversion_rate', 'avg_cac',
+                       'avg_ltv', 'ltv_cac_ratio', 'roi', 'total_mrr']
 
     def get_channel_performance(self):
         """Analyze performance by acquisition channel with ROI calculations"""
-        # Get users per channel
-        channel_users = self.users.groupby('acquisition_channel').agg({
-            'user_id': 'count',
-            'cac': 'mean'
-        }).reset_index()
-
-        # Get conversions and revenue per channel
-        channel_conversions = self.users.merge(
-            self.subscriptions[['user_id', 'mrr', 'status']],
-            on='user_id',
-            how='left'
-        )
+        return self.breakdown(
+            'acquisition_channel', metrics=self.CHANNEL_METRICS
+        ).rename(columns={'acquisition_channel': 'channel'})
 
-        channel_stats_agg = channel_conversions.groupby('acquisition_channel').agg({
-            'user_id': 'count',
-            'mrr': lambda x: x.notna().sum(),  # Count conversions
-            'status': lambda x: (x == 'active').sum()  # Active subscribers
-        }).reset_index()
-
-        # Calculate total MRR per channel
-        channel_mrr = channel_conversions[channel_conversions['status'] == 'active'].groupby('acquisition_channel').agg({
-            'mrr': 'sum'
-        }).reset_index()
-
-        # Merge all stats
-        channel_stats = channel_users.merge(channel_stats_agg[['acquisition_channel', 'mrr', 'status']],
-                                            on='acquisition_channel', how='left')
-        channel_stats = channel_stats.merge(channel_mrr, on='acquisition_channel', how='left', suffixes=('', '_total'))
-
-        # Fill NaN values
-        channel_stats['mrr'] = channel_stats['mrr'].fillna(0).astype(int)
-        channel_stats['status'] = channel_stats['status'].fillna(0).astype(int)
-        channel_stats['mrr_total'] = channel_stats['mrr_total'].fillna(0)
-
-        # Calculate metrics
-        channel_stats['conversions'] = channel_stats['mrr']
-        channel_stats['conversion_rate'] = (
-            channel_stats['conversions'] / channel_stats['user_id'] * 100
-        )
+    def get_channel_breakdown(self, dimensions=BREAKDOWN_DIMENSIONS):
+        """
+        Channel performance (users, conversions, CAC, LTV, ROI, MRR) for any
+        combination of dimensions in one grouped pass
 
-        # Calculate LTV per channel (simplified: ARPU * 12 months / churn)
-        # Using overall churn rate for simplicity
-        monthly_churn = self.get_churn_rate(30) / 100
-        if monthly_churn == 0:
-            monthly_churn = 0.01  # Default 1% to avoid division by zero
+        Args:
+            dimensions: Columns to group by, e.g. ['acquisition_channel', 'country']
+
+        Returns:
+            pandas.DataFrame: one row per observed dimension combination with the
+                same metric columns as get_channel_performance()
+        """
+        return self.breakdown(list(dimensions), metrics=self.CHANNEL_METRICS)
+
+    # Batch metric registry: name -> getter accepting the shared compute() params.
+    # Unused params are swallowed by **_ so one params dict can serve every metric.
+    METRICS = {
+        'current_mrr': lambda a, **_: a.get_current_mrr(),
+        'period_total_revenue': lambda a, **_: a.get_period_total_revenue(),
+        'mrr_growth_rate': lambda a, days=30, **_: a.get_mrr_growth_rate(days),
+        'arpu': lambda a, **_: a.get_arpu(),
+        'churn_rate': lambda a, period_days=30, **_: a.get_churn_rate(period_days),
+        'churn_base': lambda a, period_days=30, **_: a._churn_counts(period_days)[0],
+        'churned_subscriptions': lambda a, period_days=30, **_: a._churn_counts(period_days)[1],
+        'conversion_rate': lambda a, **_: a.get_conversion_rate(),
+        'cac': lambda a, **_: a.get_cac(),
+        'ltv': lambda a, **_: a.get_ltv(),
+        'ltv_cac_ratio': lambda a, **_: a.get_ltv_cac_ratio(),
+        'active_users': lambda a, period='daily', **_: a.get_active_users(period),
+        'avg_match_rate': lambda a, **_: a.get_avg_match_rate(),
+        'avg_scans_per_user': lambda a, **_: a.get_avg_scans_per_user(),
+        'total_users': lambda a, **_: len(a.users),
+        'total_scans': lambda a, **_: len(a.scans),
+        'active_subscriptions': lambda a, **_: len(a._active_subscriptions()),
+    }
+
+    def compute(self, metrics, **params):
+        """
+        Compute many KPIs in one shared pass (PERFORMANCE OPTIMIZATION)
 
-        channel_stats['avg_ltv'] = (channel_stats['mrr_total'] / channel_stats['status']) / monthly_churn
-        channel_stats['avg_ltv'] = channel_stats['avg_ltv'].fillna(0)
+        Every getter draws its masks and groupbys (active subscriptions, churn
+        window counts, scans per user) from the per-snapshot cache, so asking
+        for fifteen metrics builds each intermediate once instead of fifteen times.
 
-        # Calculate ROI: (LTV - CAC) / CAC * 100
-        # For organic (CAC=0), use a special calculation to avoid infinity
-        channel_stats['roi'] = channel_stats.apply(
-            lambda row: 999999 if row['cac'] == 0 else ((row['avg_ltv'] - row['cac']) / row['cac'] * 100),
-            axis=1
-        )
-        channel_stats['roi'] = channel_stats['roi'].fillna(0)
+        Args:
+            metrics: Iterable of metric names (see SaaSAnalytics.METRICS)
+            **params: Shared parameters - days (MRR growth), period_days (churn),
+                period ('daily'/'weekly'/'monthly' active users)
 
-        # LTV:CAC ratio
-        # For organic (CAC=0), use 999999 to represent "infinite" ROI
-        channel_stats['ltv_cac_ratio'] = channel_stats.apply(
-            lambda row: 999999 if row['cac'] == 0 else (row['avg_ltv'] / row['cac']),
-            axis=1
-        )
-        channel_stats['ltv_cac_ratio'] = channel_stats['ltv_cac_ratio'].fillna(0)
+        Returns:
+            dict: {metric_name: value} in the requested order
+
+        Example:
+            analytics.compute(['current_mrr', 'churn_rate', 'arpu'], period_days=7)
+        """
+        # Plan: validate and de-duplicate names before touching any data
+        plan = list(dict.fromkeys(metrics))
+        unknown = [name for name in plan if name not in self.METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+
+        return {name: self.METRICS[name](self, **params) for name in plan}
+
+    # Metrics computed from the company-level revenue table, which is not
+    # sampled (exact in approximate mode), and per-user counts, which are
+    # scaled up by the inverse of the sampled user fraction
+    UNSAMPLED_METRICS = ('current_mrr', 'period_total_revenue', 'mrr_growth_rate')
+    SAMPLED_TOTALS = (
+        'active_users', 'total_users', 'total_scans', 'active_subscriptions',
+        'churn_base', 'churned_subscriptions',
+    )
+
+    def _user_subset(self, mask):
+        """Analytics over the users in a boolean mask (revenue table kept whole)"""
+        subset = self.__class__.__new__(self.__class__)
+        subset.users = self.users[mask]
+        user_ids = subset.users['user_id']
+        subset.subscriptions = self.subscriptions[self.subscriptions['user_id'].isin(user_ids)]
+        subset.scans = self.scans[self.scans['user_id'].isin(user_ids)]
+        subset.revenue = self.revenue
+        subset.time_range_days = self.time_range_days
+        return subset
+
+    def sample(self, rate=None):
+        """
+        Analytics over a consistent hash-based user sample (built once per rate)
 
-        # Select and rename columns
-        channel_stats = channel_stats[[
-            'acquisition_channel', 'user_id', 'conversions', 'conversion_rate',
-            'cac', 'avg_ltv', 'ltv_cac_ratio', 'roi', 'mrr_total'
-        ]]
+        Users are picked by a fixed hash of user_id, so the same users are in
+        the sample for every time range, reload and process, and smaller rates
+        are subsets of larger ones. Subscriptions and scans follow their users.
 
-        channel_stats.columns = [
-            'channel', 'total_users', 'conversions', 'conversion_rate',
-            'avg_cac', 'avg_ltv', 'ltv_cac_ratio', 'roi', 'total_mrr'
-        ]
+        Args:
+            rate: Fraction of users to keep (default config.SAMPLE_RATE)
+
+        Returns:
+            tuple: (sample SaaSAnalytics, list of config.SAMPLE_REPLICATES
+                disjoint replicate SaaSAnalytics that together form the sample)
+        """
+        rate = config.SAMPLE_RATE if rate is None else rate
+
+        def build():
+            hashes = user_hashes(self.users['user_id'])
+            in_sample = sample_mask(hashes, rate)
+            groups = replicate_groups(hashes, config.SAMPLE_REPLICATES)
+            replicates = [
+                self._user_subset(in_sample & (groups == group))
+                for group in range(config.SAMPLE_REPLICATES)
+            ]
+            return self._user_subset(in_sample), replicates
+
+        return self._memo(('sample', rate), build)
+
+    def estimate(self, metrics, sample_rate=None, confidence=0.95, **params):
+        """
+        Approximate KPIs from a user sample, with confidence intervals (PERFORMANCE OPTIMIZATION)
+
+        Metrics are evaluated with compute() on a hash-based user sample and
+        on its disjoint replicate sub-samples, so the cost scales with the
+        sample instead of the snapshot. Per-user counts are scaled up by the
+        inverse sampled user fraction; rates and averages are used as is.
+        The interval is the random-groups interval over the replicates.
+        With sample_rate=1, or fewer than config.SAMPLE_MIN_SCANS scans (where
+        the exact batch is cheaper than sampling), the values are exact
+        (zero-width interval, approximate=False).
+
+        Args:
+            metrics: Iterable of metric names (see SaaSAnalytics.METRICS)
+            sample_rate: Fraction of users to evaluate on (default config.SAMPLE_RATE)
+            confidence: Confidence level of the interval
+            **params: Shared compute() parameters
+
+        Returns:
+            dict: {metric_name: {'value', 'ci_low', 'ci_high', 'approximate'}}
+
+        Example:
+            analytics.estimate(['conversion_rate', 'total_scans'], sample_rate=0.05)
+        """
+        sample_rate = config.SAMPLE_RATE if sample_rate is None else sample_rate
+        plan = list(dict.fromkeys(metrics))
+        if sample_rate >= 1 or len(self.scans) < config.SAMPLE_MIN_SCANS:
+            exact = self.compute(plan, **params)
+            return {
+                name: {'value': value, 'ci_low': value, 'ci_high': value, 'approximate': False}
+                for name, value in exact.items()
+            }
+
+        sampled_metrics = [name for name in plan if name not in self.UNSAMPLED_METRICS]
+        exact = self.compute([name for name in plan if name in self.UNSAMPLED_METRICS], **params)
+        sample, replicates = self.sample(sample_rate)
+
+        def scaled(analytics):
+            values = analytics.compute(sampled_metrics, **params)
+            scale = len(self.users) / len(analytics.users) if len(analytics.users) else np.nan
+            return {
+                name: value * scale if name in self.SAMPLED_TOTALS else value
+                for name, value in values.items()
+            }
 
-        return channel_stats
+        values = scaled(sample)
+        replicate_values = [scaled(replicate) for replicate in replicates]
+
+        result = {}
+        for name in plan:
+            if name in exact:
+                value = exact[name]
+                result[name] = {'value': value, 'ci_low': value, 'ci_high': value, 'approximate': False}
+                continue
+            ci_low, ci_high = replicate_interval(
+                values[name], [replicate[name] for replicate in replicate_values], confidence
+            )
+            result[name] = {'value': values[name], 'ci_low': ci_low, 'ci_high': ci_high, 'approximate': True}
+        return result
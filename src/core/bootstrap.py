@@ -0,0 +1,89 @@
+"""
+Batched bootstrap confidence intervals and p-values for rate comparisons
+"""
+import numpy as np
+
+
+def bootstrap_compare(outcomes_a, outcomes_b, statistic, n_resamples=10_000,
+                      confidence=0.95, seed=0):
+    """
+    Compare a statistic between two groups of users with a batched bootstrap
+
+    Both groups are resampled n_resamples times in one multinomial draw
+    each (resamples x categories), so the cost is O(resamples x categories)
+    regardless of group size, with no Python loop over resamples.
+
+    Args:
+        outcomes_a: (n_a, k) per-user outcome rows of group A
+        outcomes_b: (n_b, k) per-user outcome rows of group B
+        statistic: Function mapping (totals (m, k), group size) -> (m, s) values
+        n_resamples: Number of bootstrap resamples
+        confidence: Confidence level for the interval on A - B
+        seed: Random seed (fixed so repeated renders agree)
+
+    Returns:
+        dict: 'difference' (s,), 'ci_low' (s,), 'ci_high' (s,) for A - B, and a
+            two-sided 'p_value' (s,) from resampling both groups out of the
+            pooled users (null hypothesis: no difference)
+    """
+    outcomes_a = np.asarray(outcomes_a, dtype=np.int64)
+    outcomes_b = np.asarray(outcomes_b, dtype=np.int64)
+    if outcomes_a.ndim == 1:
+        outcomes_a, outcomes_b = outcomes_a[:, None], outcomes_b[:, None]
+    n_a, n_b = len(outcomes_a), len(outcomes_b)
+
+    # Per-user outcomes are small integers, so resampling users with
+    # replacement is exactly a multinomial draw over the distinct outcome rows
+    categories, inverse = np.unique(np.vstack([outcomes_a, outcomes_b]), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    n_categories = len(categories)
+    counts_a = np.bincount(inverse[:n_a], minlength=n_categories)
+    counts_b = np.bincount(inverse[n_a:], minlength=n_categories)
+
+    observed = (statistic(counts_a[None, :] @ categories, n_a)
+                - statistic(counts_b[None, :] @ categories, n_b))[0]
+    if n_a == 0 or n_b == 0:
+        nan = np.full(observed.shape, np.nan)
+        return {'difference': observed, 'ci_low': nan, 'ci_high': nan, 'p_value': nan}
+
+    rng = np.random.default_rng(seed)
+
+    def resampled(n, counts_or_probs):
+        draws = rng.multinomial(n, counts_or_probs, size=n_resamples)
+        return statistic(draws @ categories, n)
+
+    # Confidence interval: resample each group from itself
+    boot = resampled(n_a, counts_a / n_a) - resampled(n_b, counts_b / n_b)
+    tail = (1 - confidence) / 2 * 100
+    ci_low, ci_high = np.percentile(boot, [tail, 100 - tail], axis=0)
+
+    # p-value: resample both groups from the pooled users (no-difference world)
+    pooled = (counts_a + counts_b) / (n_a + n_b)
+    null = resampled(n_a, pooled) - resampled(n_b, pooled)
+    extreme = np.count_nonzero(np.abs(null) >= np.abs(observed) - 1e-12, axis=0)
+    p_value = (extreme + 1) / (n_resamples + 1)
+
+    return {'difference': observed, 'ci_low': ci_low, 'ci_high': ci_high, 'p_value': p_value}
+
+
+def ratio_statistic(numerators, denominators):
+    """
+    Build a statistic of column ratios in % (0 when the denominator is 0)
+
+    Args:
+        numerators: Outcome column index per ratio, or -1 for the group size
+        denominators: Outcome column index per ratio, or -1 for the group size
+
+    Returns:
+        callable: for bootstrap_compare
+    """
+    numerators = np.asarray(numerators)
+    denominators = np.asarray(denominators)
+
+    def statistic(totals, n):
+        with_size = np.concatenate([totals, np.full((len(totals), 1), n)], axis=1).astype(np.float64)
+        num = with_size[:, numerators]
+        den = with_size[:, denominators]
+        return np.where(den > 0, num / np.maximum(den, 1) * 100, 0.0)
+
+    return statistic
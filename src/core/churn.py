@@ -0,0 +1,225 @@
+"""
+Churn-risk scoring: vectorized per-subscriber features, a fingerprint-cached model and batch scoring
+"""
+import hashlib
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Bump when the feature set or model changes so cached models are not reused
+CHURN_MODEL_VERSION = 1
+
+# Numeric features; plan and billing cycle are added as one-hot columns
+NUMERIC_FEATURES = (
+    'tenure_days', 'days_since_last_scan', 'scans_30d', 'scans_90d',
+    'match_rate_30d', 'match_rate_trend', 'mrr',
+)
+
+# Days since last scan for subscribers with no scan yet
+_NO_SCAN_DAYS = 365
+
+
+def _user_time_keys(user_codes, times_s):
+    """Single sortable int64 key per (user, time in seconds)"""
+    return user_codes.astype(np.int64) * 2**32 + times_s
+
+
+def build_churn_features(rows, scans):
+    """
+    Per-subscriber churn features as of a reference time per row
+
+    Scans are sorted once by (user, time) with running counts and match-rate
+    sums, so every window for every row is two binary searches and a
+    prefix-sum difference: O((rows + scans) log scans), with no per-user loop.
+    Each row can have its own reference time, which lets one call build the
+    features for many training snapshots at once.
+
+    Args:
+        rows: DataFrame with user_id, reference (datetime), subscription_start,
+            plan_type, billing_cycle, mrr
+        scans: DataFrame with user_id, scan_date, match_rate
+
+    Returns:
+        pandas.DataFrame: NUMERIC_FEATURES plus plan_* and billing_* one-hot columns,
+            aligned with rows
+    """
+    user_ids = np.unique(np.concatenate([
+        rows['user_id'].to_numpy(dtype=np.int64), scans['user_id'].to_numpy(dtype=np.int64)
+    ]))
+    scan_seconds = scans['scan_date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+    scan_keys = _user_time_keys(np.searchsorted(user_ids, scans['user_id'].to_numpy(dtype=np.int64)), scan_seconds)
+    order = np.argsort(scan_keys, kind='stable')
+    scan_keys = scan_keys[order]
+    match_prefix = np.concatenate([[0.0], np.cumsum(scans['match_rate'].to_numpy(dtype=np.float64)[order])])
+
+    row_codes = np.searchsorted(user_ids, rows['user_id'].to_numpy(dtype=np.int64))
+    reference = rows['reference'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+    def position(days_before):
+        """Index of the first scan of the row's user at/after reference - days_before"""
+        return np.searchsorted(scan_keys, _user_time_keys(row_codes, reference - days_before * 86400), side='left')
+
+    now, back_30, back_90 = position(0), position(30), position(90)
+    scans_30d = now - back_30
+    scans_90d = now - back_90
+    match_30d = np.where(scans_30d > 0, (match_prefix[now] - match_prefix[back_30]) / np.maximum(scans_30d, 1), np.nan)
+    scans_before = back_30 - back_90
+    match_before = np.where(scans_before > 0, (match_prefix[back_30] - match_prefix[back_90]) / np.maximum(scans_before, 1), np.nan)
+
+    # Last scan strictly before the reference time, if it belongs to the same user
+    user_first = np.searchsorted(scan_keys, _user_time_keys(row_codes, 0), side='left')
+    has_scan = now > user_first
+    last_scan_s = np.where(has_scan, scan_keys[np.maximum(now - 1, 0)] - row_codes.astype(np.int64) * 2**32, 0)
+    days_since_last = np.where(has_scan, (reference - last_scan_s) / 86400, _NO_SCAN_DAYS)
+
+    start = rows['subscription_start'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+    features = pd.DataFrame({
+        'tenure_days': np.maximum(reference - start, 0) / 86400,
+        'days_since_last_scan': np.minimum(days_since_last, _NO_SCAN_DAYS),
+        'scans_30d': scans_30d,
+        'scans_90d': scans_90d,
+        # Without scans in a window, fall back to "no change" / the overall average
+        'match_rate_30d': np.where(np.isnan(match_30d), np.nanmean(match_30d) if scans_30d.any() else 0.0, match_30d),
+        'match_rate_trend': np.where(np.isnan(match_30d) | np.isnan(match_before), 0.0, match_30d - match_before),
+        'mrr': rows['mrr'].to_numpy(dtype=np.float64),
+    }, index=rows.index)
+    categorical = pd.get_dummies(rows[['plan_type', 'billing_cycle']].astype(str), prefix=['plan', 'billing'], dtype=float)
+    return pd.concat([features, categorical], axis=1)
+
+
+def training_rows(subscriptions, as_of, horizon_days=30, snapshots=12):
+    """
+    Labelled training rows: subscribers active at monthly reference dates
+
+    Reference dates are calendar month starts whose outcome window
+    (reference, reference + horizon] has fully elapsed by as_of, so a row's
+    features only use data from before its reference date. Anchoring to
+    month starts keeps the training set (and the model fingerprint) stable
+    while new days of data arrive.
+
+    Returns:
+        tuple: (rows DataFrame with a reference column, churned labels array)
+    """
+    as_of = pd.Timestamp(as_of)
+    first = subscriptions['subscription_start'].min()
+    references = pd.date_range(first.normalize() + pd.offsets.MonthBegin(1),
+                               as_of - pd.Timedelta(days=horizon_days), freq='MS')[-snapshots:]
+
+    start = subscriptions['subscription_start'].to_numpy(dtype='datetime64[ns]')
+    end = subscriptions['subscription_end'].to_numpy(dtype='datetime64[ns]')
+    ref = references.to_numpy(dtype='datetime64[ns]')[:, None]
+    active = (start[None, :] <= ref) & (np.isnat(end)[None, :] | (end[None, :] > ref))
+    churned = active & ~np.isnat(end)[None, :] & (end[None, :] <= ref + np.timedelta64(horizon_days, 'D'))
+
+    snapshot_idx, sub_idx = np.nonzero(active)
+    rows = subscriptions.iloc[sub_idx].reset_index(drop=True)
+    rows['reference'] = references[snapshot_idx]
+    return rows, churned[snapshot_idx, sub_idx]
+
+
+def frame_fingerprint(*frames):
+    """Content hash of DataFrames / arrays (order-sensitive)"""
+    digest = hashlib.sha1(str(CHURN_MODEL_VERSION).encode())
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame):
+            digest.update(','.join(map(str, frame.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        else:
+            digest.update(np.ascontiguousarray(frame).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ChurnModel:
+    """
+    Logistic churn model with its feature columns and a holdout check
+
+    Scores are probabilities of churning within the horizon. Cached on disk
+    under the fingerprint of its training data, so a dashboard restart or a
+    second process reuses it instead of retraining.
+    """
+
+    def __init__(self, pipeline, feature_columns, fingerprint, horizon_days, n_rows, n_churned, holdout_auc):
+        self.pipeline = pipeline
+        self.feature_columns = feature_columns
+        self.fingerprint = fingerprint
+        self.horizon_days = horizon_days
+        self.n_rows = n_rows
+        self.n_churned = n_churned
+        self.holdout_auc = holdout_auc  # out-of-time AUC (see train)
+
+    @property
+    def base_rate(self):
+        """Share of training rows that churned within the horizon"""
+        return self.n_churned / self.n_rows if self.n_rows else 0.0
+
+    @classmethod
+    def train(cls, features, labels, references, horizon_days, fingerprint):
+        """
+        Fit on all training rows after checking AUC on the latest snapshot
+
+        Args:
+            features: Training feature matrix (build_churn_features)
+            labels: Churned within the horizon, per row
+            references: Reference date per row (used for the out-of-time holdout)
+            horizon_days: Outcome window length
+            fingerprint: Training-data fingerprint the model is cached under
+
+        Returns:
+            ChurnModel
+        """
+        labels = np.asarray(labels, dtype=bool)
+        if labels.all() or not labels.any():
+            raise ValueError("Churn model needs both churned and retained subscribers to train")
+
+        def fit(X, y):
+            return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)).fit(X, y)
+
+        # Holdout = latest reference date with both outcomes, trained on the dates before it
+        references = np.asarray(references)
+        holdout_auc = float('nan')
+        for reference in np.unique(references)[::-1]:
+            holdout, earlier = references == reference, references < reference
+            if 0 < labels[holdout].sum() < holdout.sum() and 0 < labels[earlier].sum() < earlier.sum():
+                scores = fit(features[earlier], labels[earlier]).predict_proba(features[holdout])[:, 1]
+                holdout_auc = float(roc_auc_score(labels[holdout], scores))
+                break
+
+        return cls(fit(features, labels), list(features.columns), fingerprint, horizon_days,
+                   len(labels), int(labels.sum()), holdout_auc)
+
+    @classmethod
+    def load_or_train(cls, model_dir, features, labels, references, horizon_days, retrain=False):
+        """Reuse the model cached for this training data, training (and caching) it if missing"""
+        fingerprint = frame_fingerprint(features, labels.astype(np.int8), np.array([horizon_days]))
+        path = model_dir / f'churn_model_{fingerprint}.joblib'
+        if path.exists() and not retrain:
+            # Stored as plain attributes so it loads under either import path (core / src.core)
+            return cls(**joblib.load(path))
+        model = cls.train(features, labels, references, horizon_days, fingerprint)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump(vars(model), path)
+        return model
+
+    @classmethod
+    def load_latest(cls, model_dir):
+        """
+        Most recently trained cached model, without training (for the request path)
+
+        Raises:
+            FileNotFoundError: If no model has been trained into model_dir yet
+        """
+        paths = sorted(model_dir.glob('churn_model_*.joblib'), key=lambda path: path.stat().st_mtime)
+        if not paths:
+            raise FileNotFoundError(f"No churn model in {model_dir}; run scripts/train_churn_model.py first")
+        return cls(**joblib.load(paths[-1]))
+
+    def predict(self, features):
+        """Churn probability per row (missing one-hot columns count as 0)"""
+        if len(features) == 0:
+            return np.zeros(0)
+        X = features.reindex(columns=self.feature_columns, fill_value=0.0)
+        return self.pipeline.predict_proba(X)[:, 1]
@@ -0,0 +1,379 @@
+"""
+Cohort retention engine using integer month arithmetic on compact arrays
+"""
+import numpy as np
+import pandas as pd
+
+
+def month_index(dates):
+    """
+    Calendar month number for each date (year * 12 + month - 1)
+
+    Replaces Period subtraction: months between two dates is a plain
+    integer difference instead of a Python call per row.
+    """
+    return dates.dt.year.to_numpy(dtype='int64') * 12 + dates.dt.month.to_numpy(dtype='int64') - 1
+
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Optional cube axes: user attributes plus the plan each user first converted to
+COHORT_DIMENSIONS = ('acquisition_channel', 'user_segment', 'country', 'plan_type')
+
+
+def first_plan(user_ids, subscriptions):
+    """
+    Plan each user first converted to
+
+    The plan of the user's earliest subscription (by subscription_start);
+    'free' for users who never subscribed.
+
+    Args:
+        user_ids: User ids to look up
+        subscriptions: subscriptions.csv frame
+
+    Returns:
+        numpy.ndarray: plan_type per user id (object dtype)
+    """
+    if subscriptions is None or len(subscriptions) == 0:
+        return np.full(len(user_ids), 'free', dtype=object)
+    first = (
+        subscriptions.sort_values('subscription_start', kind='stable')
+        .drop_duplicates('user_id')
+        .set_index('user_id')['plan_type']
+    )
+    return pd.Series(np.asarray(user_ids)).map(first).fillna('free').to_numpy(dtype=object)
+
+
+def period_index(dates, granularity='month'):
+    """
+    Integer period number for each date at day, week or month granularity
+
+    Days count from the epoch; weeks are Monday-based (epoch day 0 is a Thursday).
+    """
+    if granularity == 'month':
+        return month_index(dates)
+    days = dates.to_numpy().astype('datetime64[D]').astype('int64')
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        return (days + 3) // 7
+    raise ValueError(f"Unknown granularity '{granularity}'. Choose from: {', '.join(GRANULARITIES)}")
+
+
+def periods_to_index(numbers, granularity='month', name=None):
+    """Convert period numbers back to a PeriodIndex of the matching frequency"""
+    numbers = np.asarray(numbers, dtype='int64')
+    if granularity == 'month':
+        return months_to_periods(numbers, name=name)
+    if granularity == 'day':
+        return pd.PeriodIndex(pd.to_datetime(numbers, unit='D').to_period('D'), name=name)
+    # Week number w starts on Monday = epoch day 7w - 3
+    return pd.PeriodIndex(pd.to_datetime(numbers * 7 - 3, unit='D').to_period('W-SUN'), name=name)
+
+
+def months_to_periods(months, name=None):
+    """Convert month numbers back to a monthly PeriodIndex"""
+    months = np.asarray(months, dtype='int64')
+    dates = pd.to_datetime(pd.DataFrame({
+        'year': months // 12,
+        'month': months % 12 + 1,
+        'day': 1
+    }))
+    return pd.PeriodIndex(dates.dt.to_period('M'), name=name)
+
+
+def retention_matrix(cohorts, offsets, counts, granularity='month', sizes=None):
+    """
+    Pivot per-cell distinct-user counts into the retention percentage matrix
+
+    Args:
+        cohorts, offsets, counts: One entry per (cohort, offset) cell
+        granularity: 'day', 'week' or 'month'
+        sizes: Optional pandas.Series of users per cohort number to divide
+            by; defaults to each cohort's first column
+
+    Returns:
+        pandas.DataFrame: index = cohort (Period), columns =
+            {granularity}s_since_signup, values = % of the cohort's size
+    """
+    row_labels = np.unique(cohorts)
+    col_labels = np.unique(offsets)
+
+    matrix = np.full((len(row_labels), len(col_labels)), np.nan)
+    matrix[np.searchsorted(row_labels, cohorts), np.searchsorted(col_labels, offsets)] = counts
+
+    if sizes is None:
+        base = matrix[:, :1]
+    else:
+        base = sizes.reindex(row_labels).to_numpy(dtype=float)[:, None]
+    retention = matrix / base * 100
+    return pd.DataFrame(
+        retention,
+        index=periods_to_index(row_labels, granularity, name='cohort'),
+        columns=pd.Index(col_labels, name=f'{granularity}s_since_signup')
+    )
+
+
+class CohortMatrix:
+    """
+    Incrementally maintained (cohort, months-since-signup) distinct-user matrix
+
+    Keeps, per scan month, the sorted ids of users already counted in that
+    month. Appending scans only touches the months they fall in: users not
+    seen yet in a month add +1 to their (cohort, offset) cell, and only the
+    retention percentages are recomputed. Cost per append is proportional to
+    the new data, not to the full scan history.
+    """
+
+    def __init__(self):
+        self._signup_month = pd.Series(dtype='int64')
+        self._seen = {}      # scan month -> sorted user ids counted in that month
+        self._counts = {}    # (cohort, offset) -> distinct users
+        self._retention = None
+
+    @classmethod
+    def build(cls, users, scans):
+        """
+        Build the matrix from users (user_id, signup_date) and scans (user_id, scan_date)
+
+        Returns:
+            CohortMatrix
+        """
+        matrix = cls()
+        matrix.add_users(users)
+        matrix.add_scans(scans)
+        return matrix
+
+    def copy(self):
+        """
+        Independent copy that can be appended to without touching this matrix
+
+        The per-month id arrays are never modified in place (add_scans replaces
+        them), so copying the dicts is enough.
+        """
+        matrix = CohortMatrix()
+        matrix._signup_month = self._signup_month
+        matrix._seen = dict(self._seen)
+        matrix._counts = dict(self._counts)
+        matrix._retention = self._retention
+        return matrix
+
+    def add_users(self, users):
+        """Register users and their signup cohort (add users before their scans)"""
+        new = pd.Series(month_index(users['signup_date']), index=users['user_id'].to_numpy())
+        combined = pd.concat([self._signup_month, new])
+        self._signup_month = combined[~combined.index.duplicated(keep='first')]
+
+    def add_scans(self, scans):
+        """
+        Count new scans into the matrix, updating only the affected cells
+
+        Scans of users that were never registered are ignored (same as the
+        inner join the full recomputation used).
+
+        Returns:
+            int: Number of cells that changed
+        """
+        positions = self._signup_month.index.get_indexer(scans['user_id'].to_numpy())
+        known = positions >= 0
+        if not known.any():
+            return 0
+
+        user_ids = scans['user_id'].to_numpy()[known]
+        scan_months = month_index(scans['scan_date'])[known]
+        cohort_of = self._signup_month.to_numpy()
+
+        # Distinct (month, user) pairs, grouped by month with one sort
+        order = np.lexsort((user_ids, scan_months))
+        user_ids, scan_months = user_ids[order], scan_months[order]
+        distinct = np.ones(len(user_ids), dtype=bool)
+        distinct[1:] = (user_ids[1:] != user_ids[:-1]) | (scan_months[1:] != scan_months[:-1])
+        user_ids, scan_months = user_ids[distinct], scan_months[distinct]
+        months, bounds = np.unique(scan_months, return_index=True)
+        bounds = np.append(bounds, len(scan_months))
+
+        fresh_users, fresh_months = [], []
+        for month, lo, hi in zip(months, bounds[:-1], bounds[1:]):
+            batch = user_ids[lo:hi]
+            seen = self._seen.get(month)
+            if seen is not None:
+                batch = batch[~np.isin(batch, seen, assume_unique=True)]
+                if len(batch) == 0:
+                    continue
+                self._seen[month] = np.union1d(seen, batch)
+            else:
+                self._seen[month] = batch
+            fresh_users.append(batch)
+            fresh_months.append(np.full(len(batch), month, dtype='int64'))
+
+        if not fresh_users:
+            return 0
+
+        fresh_users = np.concatenate(fresh_users)
+        fresh_months = np.concatenate(fresh_months)
+        cohorts = cohort_of[self._signup_month.index.get_indexer(fresh_users)]
+        offsets = fresh_months - cohorts
+
+        cells, counts = np.unique(np.stack([cohorts, offsets]), axis=1, return_counts=True)
+        for cohort, offset, count in zip(cells[0], cells[1], counts):
+            key = (int(cohort), int(offset))
+            self._counts[key] = self._counts.get(key, 0) + int(count)
+
+        self._retention = None
+        return len(counts)
+
+    def cells(self):
+        """
+        Raw distinct-user counts
+
+        Returns:
+            tuple: (cohorts, offsets, counts) arrays, one entry per non-empty cell
+        """
+        if not self._counts:
+            empty = np.array([], dtype='int64')
+            return empty, empty, empty
+        keys = np.array(list(self._counts.keys()), dtype='int64')
+        counts = np.array(list(self._counts.values()), dtype='int64')
+        return keys[:, 0], keys[:, 1], counts
+
+    def retention(self):
+        """Retention % matrix (recomputed only after the counts change)"""
+        if self._retention is None:
+            self._retention = retention_matrix(*self.cells())
+        return self._retention.copy()
+
+
+class CohortCube:
+    """
+    Cohort retention cube: distinct users per (cohort, offset, dimension values)
+
+    Built in one grouped pass at a fixed granularity. Every active user has
+    exactly one value per dimension in each cell, so distinct-user counts are
+    additive across dimension values: any slice or roll-up is a filter + sum
+    over the small cube, never a rescan of the scans table.
+
+    plan_type is the plan the user first converted to (see first_plan), so a
+    user stays in one slice for the whole cohort row. Retention divides each
+    cell by the users who signed up in the cohort with the same dimension
+    values (sizes), so every slice stays within 100% even when users first
+    scan after their signup period.
+    """
+
+    def __init__(self, cells, granularity, dimensions, sizes):
+        self.cells = cells
+        self.sizes = sizes
+        self.granularity = granularity
+        self.dimensions = tuple(dimensions)
+        self._retention = {}
+
+    @classmethod
+    def build(cls, users, scans, subscriptions=None, granularity='month',
+              dimensions=COHORT_DIMENSIONS):
+        """
+        Build the cube
+
+        Args:
+            users: users.csv frame
+            scans: scans.csv frame
+            subscriptions: Optional subscriptions.csv frame (needed for plan_type;
+                users who never subscribed count as 'free')
+            granularity: 'day', 'week' or 'month'
+            dimensions: Subset of COHORT_DIMENSIONS to keep as axes
+
+        Returns:
+            CohortCube
+        """
+        # One row per user with their cohort and (fixed) dimension values
+        members = pd.DataFrame({'cohort': period_index(users['signup_date'], granularity)})
+        for dim in dimensions:
+            values = first_plan(users['user_id'], subscriptions) if dim == 'plan_type' else users[dim]
+            members[dim] = pd.Categorical(np.asarray(values))
+
+        positions = pd.Index(users['user_id']).get_indexer(scans['user_id'])
+        known = positions >= 0
+        positions = positions[known]
+        cohorts = members['cohort'].to_numpy()[positions]
+        offsets = period_index(scans['scan_date'], granularity)[known] - cohorts
+
+        # Distinct (user, offset) pairs -> one row per active user per cell
+        pairs = pd.DataFrame({'position': positions, 'offset': offsets}).drop_duplicates()
+        pairs = pd.concat(
+            [members.iloc[pairs['position'].to_numpy()].reset_index(drop=True),
+             pairs['offset'].reset_index(drop=True)],
+            axis=1
+        )
+
+        cells = (
+            pairs.groupby(['cohort', 'offset', *dimensions], observed=True)
+            .size()
+            .rename('users')
+            .reset_index()
+        )
+        sizes = (
+            members.groupby(['cohort', *dimensions], observed=True)
+            .size()
+            .rename('users')
+            .reset_index()
+        )
+        return cls(cells, granularity, dimensions, sizes)
+
+    def values(self, dimension):
+        """Distinct values available for a dimension"""
+        return list(self.cells[dimension].cat.categories)
+
+    def slice(self, **filters):
+        """
+        Roll the cube up to (cohort, offset) for a dimension filter
+
+        Args:
+            **filters: dimension=value or dimension=[values]; omitted
+                dimensions are summed over
+
+        Returns:
+            pandas.DataFrame: columns cohort, offset, users
+        """
+        cells = self._filter(self.cells, filters)
+        return cells.groupby(['cohort', 'offset'], as_index=False)['users'].sum()
+
+    def cohort_sizes(self, **filters):
+        """
+        Users who signed up in each cohort for a dimension filter
+
+        Returns:
+            pandas.Series: users indexed by cohort number
+        """
+        return self._filter(self.sizes, filters).groupby('cohort')['users'].sum()
+
+    def _filter(self, frame, filters):
+        """Rows of a cube frame matching dimension=value / dimension=[values]"""
+        for dim, value in filters.items():
+            if dim not in self.dimensions:
+                raise ValueError(f"Unknown cohort dimension '{dim}'. Choose from: {', '.join(self.dimensions)}")
+            if value is None:
+                continue
+            wanted = value if isinstance(value, (list, tuple, set)) else [value]
+            frame = frame[frame[dim].isin(wanted)]
+        return frame
+
+    def retention(self, **filters):
+        """
+        Retention % matrix for a slice (cached per filter combination)
+
+        Example:
+            cube.retention(acquisition_channel='paid_search', country=['US', 'CA'])
+        """
+        key = tuple(sorted(
+            (dim, tuple(sorted(v)) if isinstance(v, (list, tuple, set)) else v)
+            for dim, v in filters.items() if v is not None
+        ))
+        if key not in self._retention:
+            rolled = self.slice(**filters)
+            self._retention[key] = retention_matrix(
+                rolled['cohort'].to_numpy(),
+                rolled['offset'].to_numpy(),
+                rolled['users'].to_numpy(),
+                self.granularity,
+                sizes=self.cohort_sizes(**filters)
+            )
+        return self._retention[key].copy()
@@ -0,0 +1,126 @@
+"""
+Pre-aggregated metrics cube for dimensional breakdowns (users, conversions, MRR, CAC, scans)
+"""
+import numpy as np
+import pandas as pd
+
+# Cube axes besides signup day (plan_type: see SaaSAnalytics._breakdown_frame)
+CUBE_DIMENSIONS = ('acquisition_channel', 'user_segment', 'country', 'plan_type')
+
+# Additive measures stored per cell; integer measures are counts
+CUBE_MEASURES = ('users', 'conversions', 'active_subs', 'active_mrr', 'cac_sum', 'cac_count', 'scans')
+_COUNT_MEASURES = ('users', 'conversions', 'active_subs', 'cac_count', 'scans')
+
+
+class MetricsCube:
+    """
+    Additive measures per (signup day, channel, segment, country, plan) cell
+
+    Every input row falls in exactly one cell and every measure is additive
+    (a user with subscriptions on several plans has one row per plan, with
+    users = 1 on only one of them), so any breakdown over any signup window
+    is a filter + bincount over the cells: O(cells), independent of
+    how many users, subscriptions or scans the snapshot holds. Ratios
+    (conversion rate, average CAC, ARPU) are derived from the summed
+    measures after the roll-up.
+    """
+
+    def __init__(self, days, codes, categories, measures):
+        self.days = days              # signup day number (days since epoch) per cell
+        self.codes = codes            # dimension -> int category code per cell
+        self.categories = categories  # dimension -> pandas.Index of values
+        self.measures = measures      # measure -> per-cell array
+        self.dimensions = tuple(codes)
+
+    @classmethod
+    def build(cls, frame, dimensions=CUBE_DIMENSIONS):
+        """
+        Aggregate a per-user (or per user and plan) frame into cube cells
+
+        Args:
+            frame: DataFrame with signup_date, the dimension columns, users,
+                cac, conversions, active_subs, active_mrr and scans per row
+            dimensions: Subset of CUBE_DIMENSIONS to keep as axes
+
+        Returns:
+            MetricsCube
+        """
+        dimensions = list(dimensions)
+        cells = pd.DataFrame({
+            'day': frame['signup_date'].to_numpy().astype('datetime64[D]').astype('int64'),
+            **{dim: pd.Categorical(frame[dim]) for dim in dimensions},
+            'users': frame['users'].to_numpy(),
+            'conversions': frame['conversions'].to_numpy(),
+            'active_subs': frame['active_subs'].to_numpy(),
+            'active_mrr': frame['active_mrr'].to_numpy(),
+            'cac_sum': frame['cac'].fillna(0).to_numpy(),
+            'cac_count': frame['cac'].notna().to_numpy().astype(np.int64),
+            'scans': frame['scans'].to_numpy(),
+        }).groupby(['day', *dimensions], observed=True).sum().reset_index()
+
+        return cls(
+            days=cells['day'].to_numpy(),
+            codes={dim: cells[dim].cat.codes.to_numpy().astype(np.int64) for dim in dimensions},
+            categories={dim: cells[dim].cat.categories for dim in dimensions},
+            measures={name: cells[name].to_numpy() for name in CUBE_MEASURES},
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def values(self, dimension):
+        """Distinct values available for a dimension"""
+        return list(self.categories[dimension])
+
+    def _mask(self, start, end, filters):
+        """Boolean cell mask for an inclusive signup-date window and dimension filters"""
+        mask = np.ones(len(self.days), dtype=bool)
+        if start is not None:
+            mask &= self.days >= pd.Timestamp(start).to_datetime64().astype('datetime64[D]').astype('int64')
+        if end is not None:
+            mask &= self.days <= pd.Timestamp(end).to_datetime64().astype('datetime64[D]').astype('int64')
+        for dim, value in filters.items():
+            if dim not in self.codes:
+                raise ValueError(f"Unknown cube dimension '{dim}'. Choose from: {', '.join(self.dimensions)}")
+            if value is None:
+                continue
+            wanted = value if isinstance(value, (list, tuple, set)) else [value]
+            wanted_codes = self.categories[dim].get_indexer(list(wanted))
+            mask &= np.isin(self.codes[dim], wanted_codes[wanted_codes >= 0])
+        return mask
+
+    def rollup(self, by=(), start=None, end=None, **filters):
+        """
+        Sum the measures over cells grouped by some dimensions
+
+        Args:
+            by: Dimensions to keep (empty = grand total)
+            start: Optional first signup date (inclusive)
+            end: Optional last signup date (inclusive)
+            **filters: dimension=value or dimension=[values]
+
+        Returns:
+            pandas.DataFrame: the `by` columns (sorted like groupby) plus CUBE_MEASURES;
+                only combinations with at least one cell are returned
+        """
+        by = list(by)
+        unknown = [dim for dim in by if dim not in self.codes]
+        if unknown:
+            raise ValueError(f"Unknown cube dimension(s) {unknown}. Choose from: {', '.join(self.dimensions)}")
+
+        mask = self._mask(start, end, filters)
+        if by:
+            shape = [len(self.categories[dim]) for dim in by]
+            keys = np.ravel_multi_index([self.codes[dim][mask] for dim in by], shape)
+            groups, inverse = np.unique(keys, return_inverse=True)
+        else:
+            groups, inverse = np.zeros(1, dtype=np.int64), np.zeros(np.count_nonzero(mask), dtype=np.int64)
+
+        result = {}
+        if by:
+            for dim, codes in zip(by, np.unravel_index(groups, shape)):
+                result[dim] = self.categories[dim].take(codes)
+        for name in CUBE_MEASURES:
+            total = np.bincount(inverse, weights=self.measures[name][mask], minlength=len(groups))
+            result[name] = total.astype(np.int64) if name in _COUNT_MEASURES else total
+        return pd.DataFrame(result)
@@ -0,0 +1,207 @@
+"""
+Exponential-smoothing forecasts (damped trend + weekly seasonality) fitted and updated in NumPy
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy import stats
+
+# Smoothing parameter grid searched in one vectorized pass (every combination at once)
+ALPHAS = np.linspace(0.1, 0.9, 9)     # level
+BETAS = np.array([0.0, 0.01, 0.05, 0.1, 0.2])  # trend
+GAMMAS = np.array([0.0, 0.05, 0.1, 0.2])       # seasonality
+PHIS = np.array([0.9, 0.98, 1.0])              # trend damping (1 = straight line)
+
+
+def _grid():
+    """All parameter combinations as four flat arrays"""
+    alpha, beta, gamma, phi = np.meshgrid(ALPHAS, BETAS, GAMMAS, PHIS, indexing='ij')
+    return alpha.ravel(), beta.ravel(), gamma.ravel(), phi.ravel()
+
+
+class ExponentialSmoothing:
+    """
+    Additive Holt-Winters model: level + damped trend + seasonal offsets
+
+    fit() runs the smoothing recursion once over time for every parameter
+    combination of the grid at the same time (vectors of P models) and keeps
+    the one with the smallest one-step-ahead squared error. update() then
+    advances the chosen model over newly arrived values only, so a new day
+    costs O(1) instead of a refit.
+    """
+
+    def __init__(self, params, level, trend, seasonal, n_seen, sse, n_errors, season_length):
+        self.params = params                # (alpha, beta, gamma, phi)
+        self.level = level
+        self.trend = trend
+        self.seasonal = seasonal            # offsets, seasonal[t % m] applies to step t
+        self.n_seen = n_seen                # values consumed so far (next step index)
+        self.sse = sse                      # sum of squared one-step errors
+        self.n_errors = n_errors
+        self.season_length = season_length
+        self.updates_since_fit = 0
+
+    @staticmethod
+    def _initial_state(values, m):
+        """Level, trend and seasonal offsets from the first two seasons"""
+        first, second = values[:m], values[m:2 * m]
+        level = first.mean()
+        trend = (second.mean() - level) / m if m > 1 else values[1] - values[0]
+        seasonal = first - level if m > 1 else np.zeros(1)
+        return level, trend, seasonal
+
+    @staticmethod
+    def _run(values, offset, level, trend, seasonal, alpha, beta, gamma, phi, m):
+        """
+        Smoothing recursion over values (step indices offset, offset + 1, ...) for P models at once
+
+        level/trend/alpha/... are (P,) arrays and seasonal is (P, m); all are
+        updated in place. Returns the per-model sum of squared one-step errors.
+        """
+        sse = np.zeros(len(level))
+        for i, value in enumerate(values):
+            phase = (offset + i) % m
+            season = seasonal[:, phase]
+            predicted = level + phi * trend + season
+            error = value - predicted
+            sse += error * error
+            new_level = level + phi * trend + alpha * error
+            trend[:] = phi * trend + alpha * beta * error
+            seasonal[:, phase] = season + gamma * error
+            level[:] = new_level
+        return sse
+
+    @classmethod
+    def fit(cls, values, season_length=7):
+        """
+        Fit on a daily series by vectorized grid search
+
+        Args:
+            values: Daily values (oldest first)
+            season_length: Seasonal period in days (falls back to no
+                seasonality when there are fewer than two full seasons)
+
+        Returns:
+            ExponentialSmoothing
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) < 3:
+            raise ValueError("Forecasting needs at least 3 days of history")
+        m = season_length if len(values) >= 2 * season_length else 1
+
+        alpha, beta, gamma, phi = _grid()
+        if m == 1:
+            keep = gamma == 0
+            alpha, beta, gamma, phi = alpha[keep], beta[keep], gamma[keep], phi[keep]
+        n_models = len(alpha)
+
+        level0, trend0, seasonal0 = cls._initial_state(values, m)
+        level = np.full(n_models, level0)
+        trend = np.full(n_models, trend0)
+        seasonal = np.tile(seasonal0, (n_models, 1))
+        sse = cls._run(values, 0, level, trend, seasonal, alpha, beta, gamma, phi, m)
+
+        best = int(np.argmin(sse))
+        return cls(
+            params=(alpha[best], beta[best], gamma[best], phi[best]),
+            level=level[best], trend=trend[best], seasonal=seasonal[best].copy(),
+            n_seen=len(values), sse=sse[best], n_errors=len(values), season_length=m,
+        )
+
+    def update(self, new_values):
+        """Advance the fitted model over newly arrived values (parameters unchanged)"""
+        new_values = np.asarray(new_values, dtype=np.float64)
+        if len(new_values) == 0:
+            return self
+        alpha, beta, gamma, phi = (np.array([p]) for p in self.params)
+        level, trend = np.array([self.level]), np.array([self.trend])
+        seasonal = self.seasonal[None, :].copy()
+        sse = self._run(new_values, self.n_seen, level, trend, seasonal, alpha, beta, gamma, phi, self.season_length)
+
+        self.level, self.trend, self.seasonal = level[0], trend[0], seasonal[0]
+        self.sse += sse[0]
+        self.n_errors += len(new_values)
+        self.n_seen += len(new_values)
+        self.updates_since_fit += len(new_values)
+        return self
+
+    def forecast(self, horizon, confidence=0.95):
+        """
+        Point forecast and prediction band for the next `horizon` days
+
+        The band uses the one-step error variance and the standard
+        additive Holt-Winters h-step variance multipliers.
+
+        Returns:
+            tuple: (forecast, lower, upper) arrays of length horizon
+        """
+        alpha, beta, gamma, phi = self.params
+        m = self.season_length
+        h = np.arange(1, horizon + 1)
+        damped = np.cumsum(phi ** h)  # phi + phi^2 + ... + phi^h
+        phase = (self.n_seen + h - 1) % m
+        forecast = self.level + damped * self.trend + self.seasonal[phase]
+
+        sigma2 = self.sse / max(self.n_errors - 1, 1)
+        # c_j = alpha * (1 + beta * (phi + ... + phi^j)) + gamma * [j is a whole season ahead]
+        c = alpha * (1 + beta * damped[:-1]) + gamma * ((h[:-1] % m) == 0) * (m > 1)
+        variance = sigma2 * (1 + np.concatenate([[0.0], np.cumsum(c ** 2)]))
+        half_width = stats.norm.ppf(0.5 + confidence / 2) * np.sqrt(variance)
+        return forecast, forecast - half_width, forecast + half_width
+
+
+# Fitted models shared across snapshots and dashboard sessions:
+# key -> (model, values it has consumed), least recently used first
+_FITTED = OrderedDict()
+_FITTED_LOCK = threading.Lock()
+_MAX_FITTED = 32
+
+# Re-run the grid search after this many incrementally added days
+REFIT_AFTER_DAYS = 30
+
+
+def fitted_model(key, values, season_length=7):
+    """
+    Fitted model for a series, extended incrementally when only new days arrived
+
+    If a model for the same key has already consumed a prefix of `values`,
+    it is copied and advanced over the new days only; otherwise (history
+    changed, or REFIT_AFTER_DAYS accumulated) the grid search runs again.
+
+    Args:
+        key: Series identity, e.g. (metric, first date)
+        values: Full daily history
+        season_length: Seasonal period in days
+
+    Returns:
+        ExponentialSmoothing
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with _FITTED_LOCK:
+        cached = _FITTED.get(key)
+        if cached is not None:
+            _FITTED.move_to_end(key)
+
+    # Stored models are never mutated, so fitting and updating run outside the lock
+    if cached is not None:
+        model, seen = cached
+        n_new = len(values) - len(seen)
+        if n_new == 0 and np.array_equal(values, seen):
+            return model
+        if (n_new > 0 and model.updates_since_fit + n_new < REFIT_AFTER_DAYS
+                and np.array_equal(values[:len(seen)], seen)):
+            return _store_fitted(key, copy.copy(model).update(values[len(seen):]), values)
+
+    return _store_fitted(key, ExponentialSmoothing.fit(values, season_length), values)
+
+
+def _store_fitted(key, model, values):
+    """Store a model as most recently used, evicting the least recently used above _MAX_FITTED"""
+    with _FITTED_LOCK:
+        _FITTED[key] = (model, values)
+        _FITTED.move_to_end(key)
+        while len(_FITTED) > _MAX_FITTED:
+            _FITTED.popitem(last=False)
+    return model
@@ -0,0 +1,76 @@
+"""
+Grouped statistics over integer group codes: distinct counts and exact percentiles in one sort
+"""
+import numpy as np
+
+
+def group_codes(*codes):
+    """
+    Combine several integer code arrays into one dense group code
+
+    Args:
+        *codes: Equal-length non-negative int arrays (e.g. period, job title, tier)
+
+    Returns:
+        tuple: (group code per row, unique combined keys, per-column code arrays of
+            the groups - i.e. np.unravel_index of the keys)
+    """
+    codes = [np.asarray(c, dtype=np.int64) for c in codes]
+    shape = [int(c.max()) + 1 if len(c) else 1 for c in codes]
+    keys, groups = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+    return groups, keys, np.unravel_index(keys, shape)
+
+
+def grouped_distinct(groups, items, n_groups):
+    """
+    Number of distinct items per group
+
+    Args:
+        groups: Group code per row (0 .. n_groups - 1)
+        items: Non-negative int item per row (e.g. user id, minute number)
+        n_groups: Number of groups
+
+    Returns:
+        numpy.ndarray: int64 count per group
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    items = np.asarray(items, dtype=np.int64)
+    base = int(items.max()) + 1 if len(items) else 1
+    pairs = np.unique(groups * base + items)
+    return np.bincount(pairs // base, minlength=n_groups)
+
+
+def grouped_quantiles(groups, values, n_groups, qs):
+    """
+    Exact quantiles of values per group (linear interpolation, as numpy.quantile)
+
+    One lexsort by (group, value) puts every group's values in order next to
+    each other, so all quantiles of all groups are index lookups into the
+    sorted array - no Python loop over groups.
+
+    Args:
+        groups: Group code per row (0 .. n_groups - 1)
+        values: Value per row
+        n_groups: Number of groups
+        qs: Quantiles in [0, 1]
+
+    Returns:
+        numpy.ndarray: (n_groups, len(qs)); NaN for empty groups
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    qs = np.asarray(qs, dtype=np.float64)
+    ordered = values[np.lexsort((values, groups))]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    position = (np.maximum(counts, 1) - 1)[:, None] * qs[None, :]
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    if len(ordered) == 0:
+        return np.full((n_groups, len(qs)), np.nan)
+    lower = ordered[np.minimum(starts[:, None] + low, len(ordered) - 1)]
+    upper = ordered[np.minimum(starts[:, None] + high, len(ordered) - 1)]
+    result = lower + (upper - lower) * (position - low)
+    result[counts == 0] = np.nan
+    return result
@@ -0,0 +1,170 @@
+"""
+MRR movements (new, expansion, reactivation, contraction, churn) from one event sweep
+"""
+import numpy as np
+import pandas as pd
+from .cohorts import months_to_periods
+
+# Movement components in waterfall order; contraction and churn are negative
+MOVEMENT_TYPES = ('new', 'expansion', 'reactivation', 'contraction', 'churn')
+
+# MRR below this is treated as zero (float sums of cents)
+_ZERO_MRR = 1e-6
+
+
+class MRRMovements:
+    """
+    Daily MRR movement components for a subscription snapshot
+
+    Every subscription becomes two events on the daily timeline: +mrr on
+    the first day it counts as active and -mrr on the first day it no
+    longer does (same rule as series('mrr')). Events are sorted once by
+    (user, day) and netted per user-day. A per-user running sum then gives
+    each user's MRR before and after the change, which classifies it:
+
+        0 -> >0 first time     new
+        0 -> >0 again          reactivation
+        up / down while > 0    expansion / contraction
+        >0 -> 0                churn
+
+    The components telescope, so summing them over any window gives the
+    MRR change over that window exactly.
+    """
+
+    def __init__(self, dates, components, months, cohort_mrr, cohort_months):
+        self.dates = dates                # DatetimeIndex of the timeline
+        self.components = components      # movement type -> daily MRR array
+        self.months = months              # calendar month numbers covered by the timeline
+        self.cohort_mrr = cohort_mrr      # (cohorts, months) cohort MRR at each month end
+        self.cohort_months = cohort_months  # calendar month number of each cohort
+
+    @classmethod
+    def build(cls, user_ids, starts, ends, mrr, timeline):
+        """
+        Sweep subscription start/end events over a daily timeline
+
+        Args:
+            user_ids: User id per subscription
+            starts: Subscription start per subscription (datetime64)
+            ends: Subscription end per subscription (NaT = still active)
+            mrr: MRR per subscription
+            timeline: Daily DatetimeIndex (midnights); events before it count
+                on its first day, events after it are ignored
+
+        Returns:
+            MRRMovements
+        """
+        n_days = len(timeline)
+        day_ns = timeline.to_numpy(dtype='datetime64[ns]').view('int64')
+        starts = np.asarray(starts, dtype='datetime64[ns]')
+        ends = np.asarray(ends, dtype='datetime64[ns]')
+        mrr = np.asarray(mrr, dtype=np.float64)
+        user_ids = np.asarray(user_ids)
+
+        # Active on day t: start <= t and (no end or end > t), so each event
+        # takes effect on the first timeline day at or after it
+        has_end = ~np.isnat(ends)
+        start_day = np.searchsorted(day_ns, starts.view('int64'), side='left')
+        end_day = np.searchsorted(day_ns, ends[has_end].view('int64'), side='left')
+        users = np.concatenate([user_ids, user_ids[has_end]])
+        days = np.concatenate([start_day, end_day])
+        deltas = np.concatenate([mrr, -mrr[has_end]])
+        in_range = days < n_days
+        users, days, deltas = users[in_range], days[in_range], deltas[in_range]
+
+        # Net change per (user, day), sorted by user then day
+        order = np.lexsort((days, users))
+        users, days, deltas = users[order], days[order], deltas[order]
+        cell_start = np.ones(len(users), dtype=bool)
+        cell_start[1:] = (users[1:] != users[:-1]) | (days[1:] != days[:-1])
+        starts_at = np.flatnonzero(cell_start)
+        delta = np.add.reduceat(deltas, starts_at) if len(starts_at) else np.zeros(0)
+        users, days = users[starts_at], days[starts_at]
+
+        # Per-user running MRR, reset at each user's first cell
+        first_cell = np.ones(len(users), dtype=bool)
+        first_cell[1:] = users[1:] != users[:-1]
+        user_start = np.maximum.accumulate(np.where(first_cell, np.arange(len(users)), 0))
+        running = np.cumsum(delta)
+        after = running - (running - delta)[user_start]
+        after[np.abs(after) < _ZERO_MRR] = 0.0
+        before = after - delta
+        before[np.abs(before) < _ZERO_MRR] = 0.0
+
+        paid_after = after > 0
+        paid_cells_before = np.cumsum(paid_after) - paid_after
+        had_paid = (paid_cells_before - paid_cells_before[user_start]) > 0
+
+        kinds = {
+            'new': (before == 0) & paid_after & ~had_paid,
+            'reactivation': (before == 0) & paid_after & had_paid,
+            'expansion': (before > 0) & (after > before),
+            'contraction': (before > 0) & paid_after & (after < before),
+            'churn': (before > 0) & ~paid_after,
+        }
+        components = {
+            kind: np.bincount(days[kinds[kind]], weights=delta[kinds[kind]], minlength=n_days)
+            for kind in MOVEMENT_TYPES
+        }
+
+        # Net revenue retention: cohort = month of the user's first paid day
+        day_months = timeline.year.to_numpy(dtype='int64') * 12 + timeline.month.to_numpy(dtype='int64') - 1
+        months = np.unique(day_months)
+        cell_month = np.searchsorted(months, day_months[days])
+        first_paid_cell = paid_after & ~had_paid
+        first_paid_month = np.where(first_paid_cell, cell_month, -1)
+        user_number = np.cumsum(first_cell) - 1
+        if len(users):
+            user_cohort = np.maximum.reduceat(first_paid_month, np.flatnonzero(first_cell))[user_number]
+        else:
+            user_cohort = np.zeros(0, dtype=np.int64)
+        counted = user_cohort >= 0
+        cohort_changes = np.zeros((len(months), len(months)))
+        np.add.at(cohort_changes, (user_cohort[counted], cell_month[counted]), delta[counted])
+        cohort_mrr = np.cumsum(cohort_changes, axis=1)
+        has_cohort = np.bincount(cell_month[first_paid_cell], minlength=len(months)) > 0
+
+        return cls(
+            dates=timeline,
+            components=components,
+            months=months,
+            cohort_mrr=cohort_mrr[has_cohort],
+            cohort_months=months[has_cohort],
+        )
+
+    def daily(self):
+        """
+        Daily movement components
+
+        Returns:
+            pandas.DataFrame: indexed by date; MOVEMENT_TYPES columns, net and mrr
+        """
+        frame = pd.DataFrame(self.components, index=self.dates)
+        frame['net'] = frame[list(MOVEMENT_TYPES)].sum(axis=1)
+        frame['mrr'] = frame['net'].cumsum()
+        return frame
+
+    def net_revenue_retention(self):
+        """
+        Net revenue retention % per cohort and months since the cohort month
+
+        NRR[c, k] = cohort MRR at the end of month c + k / cohort MRR at the
+        end of month c, so expansion above churn shows as more than 100%.
+
+        Returns:
+            pandas.DataFrame: index = cohort (monthly Period), columns = months_since_start
+        """
+        n_months = len(self.months)
+        rows = np.searchsorted(self.months, self.cohort_months)
+        offsets = np.arange(n_months)
+        cols = rows[:, None] + offsets[None, :]
+        valid = cols < n_months
+        values = np.full((len(rows), n_months), np.nan)
+        values[valid] = self.cohort_mrr[np.nonzero(valid)[0], cols[valid]]
+        base = values[:, :1]
+        nrr = np.where(base > 0, values / np.where(base > 0, base, 1) * 100, np.nan)
+        return pd.DataFrame(
+            nrr,
+            index=months_to_periods(self.cohort_months, name='cohort'),
+            columns=pd.Index(offsets, name='months_since_start'),
+        )
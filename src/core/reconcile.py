@@ -0,0 +1,63 @@
+"""
+Revenue-table reconciliation: compare revenue.csv with its rebuild from subscriptions
+"""
+import numpy as np
+import pandas as pd
+
+# Columns of revenue.csv that are derived from subscriptions.csv
+REVENUE_COLUMNS = ('daily_revenue', 'mrr', 'active_subscriptions', 'new_subscriptions', 'churned_subscriptions')
+
+# daily_revenue is MRR spread over a fixed 30-day month (as in scripts/data_generator.py)
+REVENUE_DAYS_PER_MONTH = 30
+
+
+def reconcile_revenue(revenue, rebuild, tolerance=0.01):
+    """
+    Compare the revenue table with a rebuild from subscriptions
+
+    Args:
+        revenue: DataFrame as in revenue.csv
+        rebuild: Callable(dates) returning the rebuilt date + REVENUE_COLUMNS
+            frame for those days (SaaSAnalytics.rebuild_revenue)
+        tolerance: Allowed absolute difference for money columns (counts must match)
+
+    Returns:
+        pandas.DataFrame: one row per mismatch - date, column, expected (rebuilt),
+            actual (revenue table), difference. Calendar days missing from the
+            revenue table are reported with column 'missing_day'. Empty = consistent.
+    """
+    columns = ['date', 'column', 'expected', 'actual', 'difference']
+    if len(revenue) == 0:
+        return pd.DataFrame(columns=columns)
+
+    actual = revenue.sort_values('date').reset_index(drop=True)
+    expected = rebuild(actual['date'].dt.normalize())
+
+    mismatches = []
+    for column in REVENUE_COLUMNS:
+        if column not in actual.columns:
+            raise ValueError(f"Revenue table has no '{column}' column")
+        expected_values = expected[column].to_numpy(dtype=np.float64)
+        actual_values = actual[column].to_numpy(dtype=np.float64)
+        difference = actual_values - expected_values
+        allowed = tolerance if column in ('daily_revenue', 'mrr') else 0
+        bad = ~(np.abs(difference) <= allowed)
+        mismatches.append(pd.DataFrame({
+            'date': actual['date'][bad].to_numpy(),
+            'column': column,
+            'expected': expected_values[bad],
+            'actual': actual_values[bad],
+            'difference': difference[bad],
+        }))
+
+    calendar = pd.date_range(actual['date'].min().normalize(), actual['date'].max().normalize(), freq='D')
+    missing = calendar.difference(pd.DatetimeIndex(actual['date'].dt.normalize()))
+    if len(missing):
+        rebuilt = rebuild(missing)
+        mismatches.append(pd.DataFrame({
+            'date': missing, 'column': 'missing_day',
+            'expected': rebuilt['mrr'].to_numpy(), 'actual': np.nan, 'difference': np.nan,
+        }))
+
+    report = pd.concat(mismatches, ignore_index=True)
+    return report.sort_values(['date', 'column'], kind='stable').reset_index(drop=True)[columns]
@@ -0,0 +1,70 @@
+"""
+Stable hash-based user sampling and replicate confidence intervals
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Resolution of the sampling rate: users are spread over this many buckets
+SAMPLE_BUCKETS = 10_000
+
+# Fixed key so every process, reload and time range picks the same users
+_HASH_KEY = 'jobmetrics-users'
+
+
+def user_hashes(user_ids):
+    """
+    64-bit hash per user id, identical across runs and processes
+
+    Args:
+        user_ids: Array-like of user ids
+
+    Returns:
+        numpy.ndarray: uint64 hash per id
+    """
+    values = np.asarray(user_ids).astype(str).astype(object)
+    return pd.util.hash_array(values, hash_key=_HASH_KEY, categorize=False)
+
+
+def sample_mask(hashes, rate):
+    """
+    Users in the sample at a given rate
+
+    The low digits of the hash decide membership, so a smaller rate always
+    selects a subset of a larger one and a user's membership never depends
+    on which other users are loaded.
+    """
+    if not 0 < rate <= 1:
+        raise ValueError(f"Sample rate must be in (0, 1], got {rate}")
+    return (hashes % SAMPLE_BUCKETS) < int(round(rate * SAMPLE_BUCKETS))
+
+
+def replicate_groups(hashes, n_replicates):
+    """Replicate group per user, from hash digits independent of the sample digits"""
+    return ((hashes // SAMPLE_BUCKETS) % n_replicates).astype(np.int64)
+
+
+def replicate_interval(estimate, replicates, confidence=0.95):
+    """
+    Random-groups confidence interval around a sample estimate
+
+    Each replicate is the same estimator evaluated on a disjoint random
+    sub-sample, so the spread of the replicates measures the sampling error:
+    standard error = std(replicates) / sqrt(G), scaled by Student's t with
+    G - 1 degrees of freedom.
+
+    Args:
+        estimate: Value on the whole sample
+        replicates: Values on each of the G replicate sub-samples
+        confidence: Confidence level
+
+    Returns:
+        tuple: (ci_low, ci_high)
+    """
+    replicates = np.asarray(replicates, dtype=np.float64)
+    replicates = replicates[np.isfinite(replicates)]
+    if len(replicates) < 2:
+        return float('nan'), float('nan')
+    standard_error = replicates.std(ddof=1) / np.sqrt(len(replicates))
+    half_width = stats.t.ppf(0.5 + confidence / 2, len(replicates) - 1) * standard_error
+    return float(estimate - half_width), float(estimate + half_width)
@@ -0,0 +1,134 @@
+"""
+What-if scenario grid: churn reduction x ARPU uplift x conversion uplift in one broadcast
+"""
+import numpy as np
+import pandas as pd
+
+# Projected quantities available per scenario
+SCENARIO_METRICS = ('ltv', 'mrr', 'revenue', 'paid_subscribers')
+
+# LTV cap in months (same 3-year cap as SaaSAnalytics.get_ltv)
+LTV_CAP_MONTHS = 36
+
+
+class ScenarioGrid:
+    """
+    Projected LTV, MRR and revenue for every combination of three levers
+
+    Axis 0 = churn reduction, axis 1 = ARPU uplift, axis 2 = conversion
+    uplift (all fractions, 0.1 = 10%). Every metric is a closed-form
+    function of the adjusted churn, ARPU and conversion, so the whole grid
+    is one NumPy broadcast - no loop over scenarios.
+
+    Subscriber projection (monthly steps, r = 1 - churn):
+        paid_h = paid_0 * r^h + signups * conversion * (1 - r^h) / churn
+    """
+
+    def __init__(self, axes, values, base):
+        self.axes = axes      # lever name -> 1-D array of fractions
+        self.values = values  # metric name -> 3-D array over the axes
+        self.base = base      # inputs the grid was built from
+
+    @classmethod
+    def build(cls, arpu, monthly_churn, conversion_rate, paid_subscribers, monthly_signups,
+              churn_reductions, arpu_uplifts, conversion_uplifts, horizon_months=12):
+        """
+        Evaluate the full grid
+
+        Args:
+            arpu: Current ARPU ($ per paying subscriber per month)
+            monthly_churn: Current monthly churn (fraction)
+            conversion_rate: Share of signups that become paying (fraction)
+            paid_subscribers: Paying subscribers today
+            monthly_signups: New signups per month
+            churn_reductions, arpu_uplifts, conversion_uplifts: Lever values (fractions)
+            horizon_months: Projection horizon for MRR and revenue
+
+        Returns:
+            ScenarioGrid
+        """
+        axes = {
+            'churn_reduction': np.asarray(churn_reductions, dtype=np.float64),
+            'arpu_uplift': np.asarray(arpu_uplifts, dtype=np.float64),
+            'conversion_uplift': np.asarray(conversion_uplifts, dtype=np.float64),
+        }
+        if (axes['churn_reduction'] > 1).any() or (axes['churn_reduction'] < 0).any():
+            raise ValueError("Churn reductions must be fractions between 0 and 1")
+
+        churn = monthly_churn * (1 - axes['churn_reduction'])[:, None, None]
+        scenario_arpu = arpu * (1 + axes['arpu_uplift'])[None, :, None]
+        conversion = conversion_rate * (1 + axes['conversion_uplift'])[None, None, :]
+
+        # LTV = ARPU / churn, capped at LTV_CAP_MONTHS of ARPU (also when churn is 0)
+        lifetime = np.minimum(np.divide(1.0, churn, out=np.full(churn.shape, np.inf), where=churn > 0), LTV_CAP_MONTHS)
+        ltv = scenario_arpu * lifetime
+
+        # Subscriber path: geometric decay of today's base plus a filling inflow
+        retained = 1 - churn
+        horizon = np.arange(1, horizon_months + 1)
+        decay = retained[..., None] ** horizon                          # (c, 1, 1, h)
+        inflow = monthly_signups * conversion[..., None]                # (1, 1, v, 1)
+        filled = np.where(churn[..., None] > 0,
+                          (1 - decay) / np.where(churn[..., None] > 0, churn[..., None], 1),
+                          horizon)                                      # sum of r^k, k < h
+        paid_path = paid_subscribers * decay + inflow * filled          # (c, 1, v, h)
+
+        values = {
+            'ltv': np.broadcast_to(ltv, cls._shape(axes)).copy(),
+            'paid_subscribers': np.broadcast_to(paid_path[..., -1], cls._shape(axes)).copy(),
+            'mrr': scenario_arpu * paid_path[..., -1],
+            'revenue': scenario_arpu * paid_path.sum(axis=-1),
+        }
+        base = {
+            'arpu': arpu, 'monthly_churn': monthly_churn, 'conversion_rate': conversion_rate,
+            'paid_subscribers': paid_subscribers, 'monthly_signups': monthly_signups,
+            'horizon_months': horizon_months,
+        }
+        return cls(axes, values, base)
+
+    @staticmethod
+    def _shape(axes):
+        return tuple(len(values) for values in axes.values())
+
+    def __len__(self):
+        return int(np.prod(self._shape(self.axes)))
+
+    def surface(self, metric, conversion_uplift=0.0):
+        """
+        2-D slice for a heatmap: churn reduction (rows) x ARPU uplift (columns)
+
+        Args:
+            metric: One of SCENARIO_METRICS
+            conversion_uplift: Closest grid value is used
+
+        Returns:
+            pandas.DataFrame
+        """
+        if metric not in self.values:
+            raise ValueError(f"Unknown scenario metric '{metric}'. Choose from: {', '.join(SCENARIO_METRICS)}")
+        k = int(np.abs(self.axes['conversion_uplift'] - conversion_uplift).argmin())
+        return pd.DataFrame(
+            self.values[metric][:, :, k],
+            index=pd.Index(self.axes['churn_reduction'], name='churn_reduction'),
+            columns=pd.Index(self.axes['arpu_uplift'], name='arpu_uplift'),
+        )
+
+    def ltv_capped(self):
+        """
+        Churn reductions at which LTV sits at the LTV_CAP_MONTHS cap
+
+        Where churn <= 1 / LTV_CAP_MONTHS the lifetime is capped, so those
+        rows of the LTV surface only change with ARPU.
+
+        Returns:
+            numpy.ndarray: bool per churn_reduction value
+        """
+        churn = self.base['monthly_churn'] * (1 - self.axes['churn_reduction'])
+        return churn * LTV_CAP_MONTHS <= 1
+
+    def frame(self):
+        """Every scenario as one row: the three levers plus SCENARIO_METRICS"""
+        grids = np.meshgrid(*self.axes.values(), indexing='ij')
+        columns = {name: grid.ravel() for name, grid in zip(self.axes, grids)}
+        columns.update({metric: self.values[metric].ravel() for metric in SCENARIO_METRICS})
+        return pd.DataFrame(columns)
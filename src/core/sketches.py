@@ -0,0 +1,345 @@
+"""
+Mergeable per-day sketches: user sets (HyperLogLog, bitsets) and value quantiles
+"""
+import numpy as np
+
+
+def hash64(values):
+    """
+    Hash integer ids to well-mixed 64-bit values (splitmix64 finalizer, vectorized)
+
+    Args:
+        values: Array-like of integers
+
+    Returns:
+        numpy.ndarray: uint64 hashes
+    """
+    x = np.asarray(values).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _register_updates(values, precision):
+    """
+    Split hashed ids into HyperLogLog register index and rank
+
+    Returns:
+        tuple: (register_index, rank) arrays
+    """
+    hashed = hash64(values)
+    index = (hashed >> np.uint64(64 - precision)).astype(np.int64)
+
+    # Rank = position of the first 1-bit in the remaining bits. Only the low
+    # 52 bits are used so the float64 exponent trick below stays exact.
+    bits = min(64 - precision, 52)
+    remainder = (hashed & np.uint64((1 << bits) - 1)).astype(np.float64)
+    _, bit_length = np.frexp(remainder)
+    rank = (bits - bit_length + 1).astype(np.uint8)
+    return index, rank
+
+
+def _estimate(registers):
+    """HyperLogLog cardinality estimate with small-range (linear counting) correction"""
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)
+    return estimate
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch backed by a numpy register array"""
+
+    def __init__(self, precision=12, registers=None):
+        """
+        Args:
+            precision: Number of index bits (4-16); 2**precision registers,
+                relative error ~1.04 / sqrt(2**precision) (1.6% at 12)
+            registers: Optional existing register array to wrap
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.registers = registers
+
+    def add(self, values):
+        """Add integer ids to the sketch"""
+        index, rank = _register_updates(values, self.precision)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Return the union of two sketches (register-wise max)"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def count(self):
+        """Estimated number of distinct ids"""
+        return int(round(_estimate(self.registers)))
+
+
+class DailyUserSketches:
+    """
+    Per-day HyperLogLog sketches of distinct users
+
+    Registers are stored as one (days x 2**precision) uint8 array, so the
+    distinct-user count for any window is a max-reduction over its rows:
+    O(days) merges regardless of how many scans the window contains.
+    """
+
+    def __init__(self, first_day, registers, precision):
+        self.first_day = first_day
+        self.registers = registers
+        self.precision = precision
+
+    @classmethod
+    def build(cls, user_ids, day_numbers, precision=12):
+        """
+        Build sketches in one vectorized pass
+
+        Args:
+            user_ids: Integer user id per event
+            day_numbers: Integer day number per event (e.g. days since epoch)
+            precision: HyperLogLog precision
+
+        Returns:
+            DailyUserSketches
+        """
+        day_numbers = np.asarray(day_numbers, dtype=np.int64)
+        if len(day_numbers) == 0:
+            return cls(0, np.zeros((0, 1 << precision), dtype=np.uint8), precision)
+
+        first_day = int(day_numbers.min())
+        n_days = int(day_numbers.max()) - first_day + 1
+        registers = np.zeros((n_days, 1 << precision), dtype=np.uint8)
+
+        index, rank = _register_updates(user_ids, precision)
+        np.maximum.at(registers, (day_numbers - first_day, index), rank)
+        return cls(first_day, registers, precision)
+
+    @property
+    def last_day(self):
+        """Last day number covered by the sketches"""
+        return self.first_day + len(self.registers) - 1
+
+    def window(self, start_day, end_day):
+        """
+        Merged sketch for an inclusive day-number window
+
+        Returns:
+            HyperLogLog
+        """
+        lo = max(start_day - self.first_day, 0)
+        hi = min(end_day - self.first_day + 1, len(self.registers))
+        if hi <= lo:
+            return HyperLogLog(self.precision)
+        return HyperLogLog(self.precision, self.registers[lo:hi].max(axis=0))
+
+    def count(self, start_day, end_day):
+        """Estimated distinct users active in the inclusive window"""
+        return self.window(start_day, end_day).count()
+
+
+# Number of set bits for every byte value (popcount lookup table)
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class DailyUserBitsets:
+    """
+    Per-day bitsets of active users (exact)
+
+    User ids are mapped to dense positions and each day is a packed bit row,
+    so a window's active count is an OR-reduction plus popcount and
+    "active in window A and window B" is an AND - no nunique() or masks.
+    Memory is days x users / 8 bytes.
+    """
+
+    def __init__(self, first_day, bits, user_ids):
+        self.first_day = first_day
+        self.bits = bits
+        self.user_ids = user_ids
+
+    @classmethod
+    def build(cls, user_ids, day_numbers):
+        """
+        Build bitsets in one vectorized pass
+
+        Args:
+            user_ids: Integer user id per event
+            day_numbers: Integer day number per event (e.g. days since epoch)
+
+        Returns:
+            DailyUserBitsets
+        """
+        day_numbers = np.asarray(day_numbers, dtype=np.int64)
+        ids, positions = np.unique(np.asarray(user_ids), return_inverse=True)
+        if len(day_numbers) == 0:
+            return cls(0, np.zeros((0, 0), dtype=np.uint8), ids)
+
+        first_day = int(day_numbers.min())
+        n_days = int(day_numbers.max()) - first_day + 1
+        bits = np.zeros((n_days, (len(ids) + 7) // 8), dtype=np.uint8)
+
+        # Same bit order as np.packbits (most significant bit first)
+        masks = np.left_shift(1, 7 - (positions & 7)).astype(np.uint8)
+        np.bitwise_or.at(bits, (day_numbers - first_day, positions >> 3), masks)
+        return cls(first_day, bits, ids)
+
+    @property
+    def last_day(self):
+        """Last day number covered by the bitsets"""
+        return self.first_day + len(self.bits) - 1
+
+    def window(self, start_day, end_day):
+        """
+        Packed bitset of users active in an inclusive day-number window
+
+        Returns:
+            numpy.ndarray: uint8 packed bits (OR of the day rows)
+        """
+        lo = max(start_day - self.first_day, 0)
+        hi = min(end_day - self.first_day + 1, len(self.bits))
+        if hi <= lo:
+            return np.zeros(self.bits.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bits[lo:hi], axis=0)
+
+    @staticmethod
+    def popcount(packed):
+        """Number of set bits in a packed bitset"""
+        return int(_POPCOUNT[packed].sum(dtype=np.int64))
+
+    def count(self, start_day, end_day):
+        """Exact distinct users active in the inclusive window"""
+        return self.popcount(self.window(start_day, end_day))
+
+    def count_both(self, window_a, window_b):
+        """
+        Exact users active in both windows
+
+        Args:
+            window_a: (start_day, end_day) inclusive
+            window_b: (start_day, end_day) inclusive
+
+        Returns:
+            int
+        """
+        return self.popcount(self.window(*window_a) & self.window(*window_b))
+
+    def members(self, packed):
+        """Decode a packed bitset back to user ids"""
+        flags = np.unpackbits(packed)[:len(self.user_ids)].astype(bool)
+        return self.user_ids[flags]
+
+
+def linear_buckets(low, high, width):
+    """
+    Equal-width histogram buckets over [low, high]
+
+    Returns:
+        tuple: (edges, representatives) - a value is reported as its bucket
+            midpoint, so the absolute error is at most width / 2
+    """
+    edges = np.arange(low, high + width, width, dtype=np.float64)
+    return edges, (edges[:-1] + edges[1:]) / 2
+
+
+def log_buckets(low, high, relative_accuracy=0.01):
+    """
+    Logarithmic histogram buckets over [low, high] (DDSketch mapping)
+
+    Bucket i spans [gamma^i, gamma^(i+1)) with gamma = (1 + a) / (1 - a);
+    reporting 2 * lo * hi / (lo + hi) keeps the relative error below a.
+
+    Returns:
+        tuple: (edges, representatives)
+    """
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    first = np.floor(np.log(low) / np.log(gamma))
+    last = np.ceil(np.log(high) / np.log(gamma))
+    edges = gamma ** np.arange(first, last + 1)
+    return edges, 2 * edges[:-1] * edges[1:] / (edges[:-1] + edges[1:])
+
+
+class DailyQuantileSketches:
+    """
+    Per-day mergeable quantile sketches (fixed-bucket histograms)
+
+    Each day is a row of bucket counts over shared edges, so merging days is
+    a column sum and any window's p50/p90/p99 is a cumulative sum plus a
+    search over the buckets: O(days x buckets), independent of row counts.
+    Values outside the edges are clamped into the first/last bucket.
+    """
+
+    def __init__(self, first_day, counts, edges, representatives):
+        self.first_day = first_day
+        self.counts = counts
+        self.edges = edges
+        self.representatives = representatives
+
+    @classmethod
+    def build(cls, values, day_numbers, buckets):
+        """
+        Build sketches in one vectorized pass
+
+        Args:
+            values: Numeric value per event (NaN values are skipped)
+            day_numbers: Integer day number per event
+            buckets: (edges, representatives) from linear_buckets/log_buckets
+
+        Returns:
+            DailyQuantileSketches
+        """
+        edges, representatives = buckets
+        values = np.asarray(values, dtype=np.float64)
+        day_numbers = np.asarray(day_numbers, dtype=np.int64)
+        keep = ~np.isnan(values)
+        values, day_numbers = values[keep], day_numbers[keep]
+        n_buckets = len(representatives)
+        if len(day_numbers) == 0:
+            return cls(0, np.zeros((0, n_buckets), dtype=np.int64), edges, representatives)
+
+        first_day = int(day_numbers.min())
+        n_days = int(day_numbers.max()) - first_day + 1
+        bucket = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, n_buckets - 1)
+        counts = np.bincount(
+            (day_numbers - first_day) * n_buckets + bucket, minlength=n_days * n_buckets
+        ).reshape(n_days, n_buckets)
+        return cls(first_day, counts, edges, representatives)
+
+    @property
+    def last_day(self):
+        """Last day number covered by the sketches"""
+        return self.first_day + len(self.counts) - 1
+
+    def window(self, start_day, end_day):
+        """Merged bucket counts for an inclusive day-number window"""
+        lo = max(start_day - self.first_day, 0)
+        hi = min(end_day - self.first_day + 1, len(self.counts))
+        if hi <= lo:
+            return np.zeros(len(self.representatives), dtype=np.int64)
+        return self.counts[lo:hi].sum(axis=0)
+
+    def quantiles(self, start_day, end_day, qs=(0.5, 0.9, 0.99)):
+        """
+        Approximate quantiles for an inclusive window
+
+        Args:
+            qs: Quantiles in [0, 1]
+
+        Returns:
+            numpy.ndarray: one value per quantile (NaN if the window is empty)
+        """
+        cumulative = np.cumsum(self.window(start_day, end_day))
+        total = cumulative[-1] if len(cumulative) else 0
+        if total == 0:
+            return np.full(len(qs), np.nan)
+        # Nearest-rank: the bucket holding the ceil(q * n)-th smallest value
+        ranks = np.maximum(np.ceil(np.asarray(qs, dtype=np.float64) * total), 1)
+        return self.representatives[np.searchsorted(cumulative, ranks)]
@@ -0,0 +1,130 @@
+"""
+Kaplan-Meier subscription survival curves for all groups in one sorted pass
+"""
+import numpy as np
+import pandas as pd
+
+# Days per month used to express lifetimes in months (matches the 30-day churn window)
+DAYS_PER_MONTH = 30
+
+
+class SurvivalCurves:
+    """
+    Kaplan-Meier survival curves for every group of a segmentation
+
+    Subscriptions are sorted once by (group, duration). Each distinct
+    (group, duration) pair becomes one step of its group's curve: at-risk
+    counts are group sizes minus cumulative removals, and survival is a
+    per-group cumulative product of (1 - events / at_risk), done as a
+    cumulative sum of logs reset at group boundaries. O(n log n) for all
+    groups together, regardless of how many groups there are.
+    """
+
+    def __init__(self, labels, group, time, at_risk, events, survival, sizes):
+        self.labels = labels      # group label per group code
+        self.group = group        # group code per step
+        self.time = time          # step time in days
+        self.at_risk = at_risk
+        self.events = events
+        self.survival = survival
+        self.sizes = sizes        # subscriptions per group
+
+    @classmethod
+    def fit(cls, durations, observed, groups=None):
+        """
+        Fit curves for all groups at once
+
+        Args:
+            durations: Days from subscription start to churn or censoring
+            observed: True where the subscription churned (False = still active)
+            groups: Optional group label per subscription (None = one 'all' group)
+
+        Returns:
+            SurvivalCurves
+        """
+        durations = np.asarray(durations, dtype=np.float64)
+        observed = np.asarray(observed, dtype=bool)
+        if groups is None:
+            labels, codes = np.array(['all'], dtype=object), np.zeros(len(durations), dtype=np.int64)
+        else:
+            labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+        n_groups = len(labels)
+        sizes = np.bincount(codes, minlength=n_groups)
+
+        order = np.lexsort((durations, codes))
+        codes, durations, observed = codes[order], durations[order], observed[order]
+
+        # One step per distinct (group, duration) pair
+        step_start = np.ones(len(codes), dtype=bool)
+        step_start[1:] = (codes[1:] != codes[:-1]) | (durations[1:] != durations[:-1])
+        starts = np.flatnonzero(step_start)
+        events = np.add.reduceat(observed.astype(np.int64), starts) if len(starts) else np.zeros(0, np.int64)
+        removed = np.diff(np.append(starts, len(codes)))
+        group = codes[starts]
+        time = durations[starts]
+
+        # Index of each group's first step, to reset the cumulative sums per group
+        first_step = np.ones(len(group), dtype=bool)
+        first_step[1:] = group[1:] != group[:-1]
+        group_start = np.maximum.accumulate(np.where(first_step, np.arange(len(group)), 0))
+
+        removed_before = np.cumsum(removed) - removed
+        at_risk = sizes[group] - (removed_before - removed_before[group_start])
+
+        hazard = events / np.maximum(at_risk, 1)
+        wiped = hazard >= 1
+        log_step = np.log1p(-np.where(wiped, 0.0, hazard))
+        log_cum = np.cumsum(log_step)
+        log_cum -= (log_cum - log_step)[group_start]
+        wiped_cum = np.cumsum(wiped)
+        wiped_cum -= (wiped_cum - wiped)[group_start]
+        survival = np.where(wiped_cum > 0, 0.0, np.exp(log_cum))
+
+        return cls(labels, group, time, at_risk, events, survival, sizes)
+
+    def curve(self, label='all'):
+        """
+        Survival curve for one group
+
+        Returns:
+            pandas.DataFrame: columns time_days, at_risk, events, survival
+        """
+        matches = np.flatnonzero(self.labels == label)
+        if len(matches) == 0:
+            raise ValueError(f"Unknown survival group '{label}'")
+        steps = self.group == matches[0]
+        return pd.DataFrame({
+            'time_days': self.time[steps],
+            'at_risk': self.at_risk[steps],
+            'events': self.events[steps],
+            'survival': self.survival[steps],
+        })
+
+    def median_lifetime(self):
+        """First time (days) each group's survival drops to 50% or below; NaN if never"""
+        below = self.survival <= 0.5
+        median = np.full(len(self.labels), np.nan)
+        # Steps are sorted by (group, time): the first qualifying step per group wins
+        hit_groups, first_hit = np.unique(self.group[below], return_index=True)
+        median[hit_groups] = self.time[below][first_hit]
+        return median
+
+    def restricted_mean(self, horizon_days):
+        """
+        Expected lifetime in days capped at a horizon (area under each curve)
+
+        Survival is 1 until the first step and constant between steps, so the
+        area is a sum of survival x interval length per group.
+        """
+        n_groups = len(self.labels)
+        clipped = np.minimum(self.time, horizon_days)
+        last_step = np.ones(len(self.group), dtype=bool)
+        last_step[:-1] = self.group[1:] != self.group[:-1]
+        next_time = np.where(last_step, horizon_days, np.append(clipped[1:], horizon_days))
+        areas = np.bincount(self.group, weights=self.survival * (next_time - clipped), minlength=n_groups)
+
+        first_step = np.ones(len(self.group), dtype=bool)
+        first_step[1:] = last_step[:-1]
+        lead_in = np.full(n_groups, float(horizon_days))
+        lead_in[self.group[first_step]] = clipped[first_step]
+        return areas + lead_in
@@ -472,6 +472,13 @@ def load_raw_data():
     }
 
 
+@st.cache_data(ttl=3600)  # Same lifetime as the raw data it checks
+def load_revenue_reconciliation():
+    """Rebuild revenue.csv from subscriptions.csv at ingest and return mismatched days"""
+    raw_data = load_raw_data()
+    return SaaSAnalytics.from_dataframes(raw_data).reconcile_revenue()
+
+
 @st.cache_data(ttl=300)  # Cache filtered analytics for 5 minutes
 def load_analytics(time_range_days=None):
     """Load analytics engine with time filtering - now much faster!
@@ -490,9 +497,48 @@ def load_analytics(time_range_days=None):
         importlib.reload(sys.modules['core.analytics'])
         # Re-import after reload
         from core.analytics import SaaSAnalytics as ReloadedAnalytics
-        return ReloadedAnalytics.from_dataframes(raw_data, time_range_days=time_range_days)
+        analytics = ReloadedAnalytics.from_dataframes(raw_data, time_range_days=time_range_days)
+    else:
+        analytics = SaaSAnalytics.from_dataframes(raw_data, time_range_days=time_range_days)
+
+    # Build the monthly cohort cube and the metrics cube at ingest so they are
+    # cached with the snapshot; the user sketches and the user sample are only
+    # worth building where get_active_users() / estimate() actually use them
+    if len(analytics.scans) > config.EXACT_ACTIVE_USERS_MAX_SCANS:
+        analytics.user_sketches()
+    analytics.cohort_cube('month')
+    analytics.metrics_cube()
+    if len(analytics.scans) >= config.SAMPLE_MIN_SCANS:
+        analytics.sample()
+    for metric in analytics.FORECAST_METRICS:
+        try:
+            analytics.forecast_model(metric)
+        except ValueError:
+            pass  # too little history in this time range
+
+    return analytics
+
+
+# load_analytics hands every rerun an unpickled copy of the snapshot, so
+# results computed on it are lost at the end of the run; views built on
+# demand are cached here instead, keyed on the time range and arguments
+
+@st.cache_data(ttl=300)  # Same lifetime as the snapshot it is built from
+def load_scenario_grid(time_range_days=None):
+    """What-if scenario grid for a time range (default levers)"""
+    return load_analytics(time_range_days).get_scenario_grid()
+
 
-    return SaaSAnalytics.from_dataframes(raw_data, time_range_days=time_range_days)
+@st.cache_data(ttl=300)
+def load_job_title_breakdown(time_range_days=None, granularity=None):
+    """Per-job-title scan metrics for a time range and granularity"""
+    return load_analytics(time_range_days).get_job_title_breakdown(granularity)
+
+
+@st.cache_data(ttl=300)
+def load_latency_report(time_range_days=None, granularity='day', by=SaaSAnalytics.LATENCY_DIMENSIONS):
+    """Scan latency SLO report for a time range, granularity and grouping"""
+    return load_analytics(time_range_days).get_latency_report(granularity, by)
 
 
 @st.cache_resource  # Cache AI engine as a resource (not data)
@@ -582,16 +628,23 @@ def get_period_comparison(analytics, periods, time_range_days):
     Returns:
         dict with current and previous period metrics
     """
-    # Current period metrics
+    # Current period metrics (one shared pass over the snapshot)
+    kpis = analytics.compute(
+        ['current_mrr', 'mrr_growth_rate', 'churn_rate', 'ltv_cac_ratio', 'arpu',
+         'active_users', 'total_users', 'conversion_rate'],
+        days=periods['comparison_period'],
+        period_days=periods['comparison_period'],
+        period=periods['active_users_period']
+    )
     current = {
-        'mrr': analytics.get_current_mrr(),
-        'mrr_growth': analytics.get_mrr_growth_rate(periods['comparison_period']),
-        'churn': analytics.get_churn_rate(periods['comparison_period']),
-        'ltv_cac': analytics.get_ltv_cac_ratio(),
-        'arpu': analytics.get_arpu(),
-        'active_users': analytics.get_active_users(periods['active_users_period']),
-        'total_users': len(analytics.users),
-        'conversion_rate': analytics.get_conversion_rate()
+        'mrr': kpis['current_mrr'],
+        'mrr_growth': kpis['mrr_growth_rate'],
+        'churn': kpis['churn_rate'],
+        'ltv_cac': kpis['ltv_cac_ratio'],
+        'arpu': kpis['arpu'],
+        'active_users': kpis['active_users'],
+        'total_users': kpis['total_users'],
+        'conversion_rate': kpis['conversion_rate']
     }
 
     # FIX BUG-009: Load previous period data with proper validation
@@ -777,12 +830,21 @@ def render_overview_tab(analytics, periods, lang='zh'):
     st.markdown(f"## {get_text('revenue_status', lang)}")
 
     # Get key metrics with comparisons (using adaptive periods)
-    mrr = analytics.get_current_mrr()
-    mrr_growth = analytics.get_mrr_growth_rate(periods['comparison_period'])
-    churn = analytics.get_churn_rate(periods['comparison_period'])
-    ltv_cac = analytics.get_ltv_cac_ratio()
-    arpu = analytics.get_arpu()
-    total_users = len(analytics.users)
+    # All overview KPIs come from one batch call so shared masks are built once
+    kpis = analytics.compute(
+        ['current_mrr', 'mrr_growth_rate', 'churn_rate', 'churn_base', 'churned_subscriptions',
+         'ltv_cac_ratio', 'arpu', 'total_users', 'period_total_revenue', 'conversion_rate',
+         'active_users'],
+        days=periods['comparison_period'],
+        period_days=periods['comparison_period'],
+        period=periods['active_users_period']
+    )
+    mrr = kpis['current_mrr']
+    mrr_growth = kpis['mrr_growth_rate']
+    churn = kpis['churn_rate']
+    ltv_cac = kpis['ltv_cac_ratio']
+    arpu = kpis['arpu']
+    total_users = kpis['total_users']
 
     # Calculate previous month for comparison (simulated)
     # FIX BUG-001: Prevent division by zero when growth rate approaches -100%
@@ -831,7 +893,7 @@ def render_overview_tab(analytics, periods, lang='zh'):
         # Period Total Revenue - changes based on time range selection
         st.markdown(f"### {get_text('period_total_revenue', lang)}")
 
-        period_total = analytics.get_period_total_revenue()
+        period_total = kpis['period_total_revenue']
 
         # Show time range context
         time_range_days = st.session_state.get('time_range_days', None)
@@ -919,20 +981,10 @@ def render_overview_tab(analytics, periods, lang='zh'):
             end_date = analytics.revenue['date'].max()
             start_date = end_date - pd.Timedelta(days=period_days)
 
-            # Calculate active subscriptions at start of period
-            active_start = analytics.subscriptions[
-                (analytics.subscriptions['subscription_start'] <= start_date) &
-                ((analytics.subscriptions['subscription_end'].isna()) |
-                 (analytics.subscriptions['subscription_end'] > start_date))
-            ]
-            active_start_count = len(active_start)
-
-            # Calculate churned subscriptions during period
-            churned = analytics.subscriptions[
-                (analytics.subscriptions['subscription_end'] >= start_date) &
-                (analytics.subscriptions['subscription_end'] <= end_date)
-            ]
-            churned_count = len(churned)
+            # Active subscriptions at start of period / churned during period
+            # (same counts churn_rate was derived from - no extra masks)
+            active_start_count = kpis['churn_base']
+            churned_count = kpis['churned_subscriptions']
 
             st.markdown(get_text('churn_calculation', lang).format(
                 churn_status=churn_status,
@@ -1154,8 +1206,7 @@ This isn't just "earning more" - it's "stopping the bleeding"
     st.markdown("---")
 
     # === REVENUE TREND (Conclusion-driven title) ===
-    conversion = analytics.get_conversion_rate()
-    arpu = analytics.get_arpu()
+    conversion = kpis['conversion_rate']
 
     # Determine the narrative based on data
     if mrr_growth > 10:
@@ -1184,6 +1235,35 @@ This isn't just "earning more" - it's "stopping the bleeding"
             fillcolor='rgba(29, 135, 197, 0.3)'
         ))
 
+        # Forecast + 95% band (model fitted at ingest, so this is a cheap projection)
+        forecast_horizon = st.radio(
+            "預測天數" if lang == 'zh' else "Forecast horizon (days)",
+            options=[30, 90],
+            horizontal=True,
+            key='mrr_forecast_horizon'
+        )
+        try:
+            mrr_forecast = analytics.get_forecast('mrr', horizon=forecast_horizon)
+        except ValueError:
+            mrr_forecast = None
+        if mrr_forecast is not None:
+            fig.add_trace(go.Scatter(
+                x=[*mrr_forecast.index, *mrr_forecast.index[::-1]],
+                y=[*mrr_forecast['upper'], *mrr_forecast['lower'][::-1]],
+                fill='toself',
+                fillcolor='rgba(255, 165, 2, 0.2)',
+                line=dict(width=0),
+                hoverinfo='skip',
+                name='95% 預測區間' if lang == 'zh' else '95% band'
+            ))
+            fig.add_trace(go.Scatter(
+                x=mrr_forecast.index,
+                y=mrr_forecast['forecast'],
+                mode='lines',
+                name='預測 MRR' if lang == 'zh' else 'Forecast MRR',
+                line=dict(color='#ffa502', width=2, dash='dash')
+            ))
+
         matrix_layout = get_matrix_layout()
         yaxis_label = "Monthly Recurring Revenue ($)" if lang == 'en' else "月經常性收入 ($)"
         fig.update_layout(
@@ -1197,6 +1277,14 @@ This isn't just "earning more" - it's "stopping the bleeding"
 
         st.plotly_chart(fig, use_container_width=True)
         st.caption(f"📈 {get_text('past_90_days', lang)}")
+        if mrr_forecast is not None:
+            st.caption(
+                f"🔮 {forecast_horizon} 天後預測 MRR：{format_currency(mrr_forecast['forecast'].iloc[-1])}"
+                f"（95% 區間 {format_currency(mrr_forecast['lower'].iloc[-1])} – {format_currency(mrr_forecast['upper'].iloc[-1])}）"
+                if lang == 'zh' else
+                f"🔮 Forecast MRR in {forecast_horizon} days: {format_currency(mrr_forecast['forecast'].iloc[-1])} "
+                f"(95% band {format_currency(mrr_forecast['lower'].iloc[-1])} – {format_currency(mrr_forecast['upper'].iloc[-1])})"
+            )
 
     with col2:
         # Revenue by Plan Pie Chart
@@ -1280,7 +1368,7 @@ This isn't just "earning more" - it's "stopping the bleeding"
         # Already has explanation in period comparison section
 
         # Active users (adaptive period based on date range)
-        mau = analytics.get_active_users(periods['active_users_period'])
+        mau = kpis['active_users']
         st.metric(
             get_text('mau', lang),
             f"{mau:,}",
@@ -1288,6 +1376,59 @@ This isn't just "earning more" - it's "stopping the bleeding"
         )
         # Already has explanation in period comparison section
 
+    # === MRR MOVEMENTS WATERFALL (one event sweep, cached per snapshot) ===
+    st.markdown("---")
+    st.subheader("🌊 " + ("MRR 變動瀑布圖" if lang == 'zh' else "MRR Movements Waterfall"))
+
+    window_options = {30: '30', 90: '90', None: '全部' if lang == 'zh' else 'All'}
+    waterfall_window = st.radio(
+        "期間（天）" if lang == 'zh' else "Window (days)",
+        options=list(window_options),
+        format_func=window_options.get,
+        horizontal=True,
+        key='mrr_waterfall_window'
+    )
+    waterfall_end = analytics.revenue['date'].max()
+    waterfall_start = (
+        waterfall_end - pd.Timedelta(days=waterfall_window - 1)
+        if waterfall_window is not None and len(analytics.revenue) > 0 else None
+    )
+    waterfall = analytics.get_mrr_waterfall(waterfall_start, waterfall_end)
+
+    movement_labels = {
+        'new': '新訂閱' if lang == 'zh' else 'New',
+        'expansion': '升級' if lang == 'zh' else 'Expansion',
+        'reactivation': '回流' if lang == 'zh' else 'Reactivation',
+        'contraction': '降級' if lang == 'zh' else 'Contraction',
+        'churn': '流失' if lang == 'zh' else 'Churn',
+    }
+    fig_waterfall = go.Figure(go.Waterfall(
+        x=['期初 MRR' if lang == 'zh' else 'Starting MRR', *movement_labels.values(),
+           '期末 MRR' if lang == 'zh' else 'Ending MRR'],
+        y=[waterfall['starting_mrr'], *(waterfall[kind] for kind in movement_labels), waterfall['ending_mrr']],
+        measure=['absolute', *(['relative'] * len(movement_labels)), 'total'],
+        text=[format_currency(waterfall['starting_mrr']),
+              *(f"{waterfall[kind]:+,.0f}" for kind in movement_labels),
+              format_currency(waterfall['ending_mrr'])],
+        textposition='outside',
+        increasing={'marker': {'color': '#2ed573'}},
+        decreasing={'marker': {'color': '#ff4757'}},
+        totals={'marker': {'color': '#1d87c5'}}
+    ))
+    fig_waterfall.update_layout(**get_matrix_layout(), height=380, margin=dict(l=0, r=0, t=20, b=0))
+    st.plotly_chart(fig_waterfall, use_container_width=True)
+
+    nrr = analytics.get_net_revenue_retention()
+    if nrr.shape[1] > 1 and nrr.iloc[:, 1].notna().any():
+        latest_nrr = nrr.iloc[:, 1].dropna()
+        st.caption(
+            f"最近同期群的次月淨收入留存率 (NRR)：{latest_nrr.iloc[-1]:.1f}%（{latest_nrr.index[-1]}），"
+            f"所有同期群平均 {latest_nrr.mean():.1f}%；超過 100% 代表升級抵銷了流失"
+            if lang == 'zh' else
+            f"Month-1 net revenue retention (NRR) of the latest cohort: {latest_nrr.iloc[-1]:.1f}% "
+            f"({latest_nrr.index[-1]}), {latest_nrr.mean():.1f}% across cohorts; above 100% means expansion outweighs churn"
+        )
+
     # === DATA DEFINITIONS (Expandable) ===
     with st.expander(get_text('metric_definitions', lang), expanded=False):
         metric_defs_text = f"""
@@ -1489,6 +1630,17 @@ def render_funnel_tab(analytics, periods, lang='zh'):
             with st.expander("📖 怎麼算的？Jerry 怎麼看這個數字？" if lang == 'zh' else "📖 How is it calculated? Jerry's analysis"):
                 st.markdown(get_text('match_rate_calc', lang).format(match_rate=avg_match_rate))
 
+            # Tail view from the per-day quantile sketches (the mean hides the weak tail)
+            match_tail = analytics.get_scan_percentiles('match_rate', days=30, percentiles=(10, 50, 90))
+            latency_tail = analytics.get_scan_percentiles('processing_time_ms', days=30)
+            st.caption(
+                f"近 30 天匹配率 p10 / p50 / p90：{match_tail['p10']:.1f}% / {match_tail['p50']:.1f}% / {match_tail['p90']:.1f}%  \n"
+                f"掃描處理時間 p50 / p90 / p99：{latency_tail['p50']:,.0f} / {latency_tail['p90']:,.0f} / {latency_tail['p99']:,.0f} ms"
+                if lang == 'zh' else
+                f"Last 30 days match rate p10 / p50 / p90: {match_tail['p10']:.1f}% / {match_tail['p50']:.1f}% / {match_tail['p90']:.1f}%  \n"
+                f"Scan processing time p50 / p90 / p99: {latency_tail['p50']:,.0f} / {latency_tail['p90']:,.0f} / {latency_tail['p99']:,.0f} ms"
+            )
+
         with col_b:
             st.metric(
                 get_text('below_avg_users', lang),
@@ -1948,6 +2100,53 @@ def render_funnel_tab(analytics, periods, lang='zh'):
 """
             st.caption(calc_explanation)
 
+    # === FUNNEL STAGE TREND (every signup cohort, one vectorized pass) ===
+    st.markdown("---")
+    st.markdown("### 📈 " + ("漏斗各階段轉換率趨勢" if lang == 'zh' else "Funnel Stage Conversion Over Time"))
+
+    trend_granularity = st.radio(
+        "世代粒度" if lang == 'zh' else "Cohort granularity",
+        options=['week', 'day'],
+        format_func=lambda g: ({'week': '每週', 'day': '每日'} if lang == 'zh' else {'week': 'Weekly', 'day': 'Daily'})[g],
+        horizontal=True,
+        key='funnel_trend_granularity'
+    )
+    # Pool cohorts into ~4-week rolling windows so small cohorts don't dominate the chart
+    funnel_series = analytics.get_conversion_funnel_series(
+        granularity=trend_granularity,
+        window=4 if trend_granularity == 'week' else 28
+    )
+
+    if len(funnel_series) > 0:
+        stage_labels = {
+            'signup_to_first_scan': '註冊 → 首次掃描' if lang == 'zh' else 'Signup → First Scan',
+            'first_to_second_scan': '首次 → 第二次掃描' if lang == 'zh' else 'First → Second Scan',
+            'second_scan_to_paid': '第二次掃描 → 付費' if lang == 'zh' else 'Second Scan → Paid',
+            'overall_conversion': '整體轉換率' if lang == 'zh' else 'Overall Conversion',
+        }
+        trend_long = funnel_series.assign(cohort=funnel_series['cohort'].dt.start_time).melt(
+            id_vars='cohort', value_vars=list(stage_labels), var_name='stage', value_name='rate'
+        )
+        trend_long['stage'] = trend_long['stage'].map(stage_labels)
+
+        fig = px.line(
+            trend_long,
+            x='cohort',
+            y='rate',
+            color='stage',
+            labels={'cohort': '註冊世代' if lang == 'zh' else 'Signup cohort',
+                    'rate': '轉換率 (%)' if lang == 'zh' else 'Conversion rate (%)',
+                    'stage': ''}
+        )
+        matrix_layout = get_matrix_layout()
+        fig.update_layout(**matrix_layout, height=350, margin=dict(l=0, r=0, t=20, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "每個點 = 該世代及之前共約 4 週註冊用戶的合併轉換率"
+            if lang == 'zh' else
+            "Each point pools the signups of the trailing ~4 weeks of cohorts"
+        )
+
     # === USER SEGMENT INSIGHT (Decision-focused) ===
     st.markdown("---")
 
@@ -1981,6 +2180,19 @@ def render_funnel_tab(analytics, periods, lang='zh'):
         caption_text = "🟢 Green = High conversion | 🔴 Red = Low conversion" if lang == 'en' else "🟢 綠色 = 高轉換 | 🔴 紅色 = 低轉換"
         st.caption(caption_text)
 
+        # Is each segment really different from the rest, or is it noise? (batched bootstrap)
+        segment_significance = analytics.get_conversion_significance('user_segment')
+        significance_lines = [
+            f"{'✅' if row.is_significant else '➖'} {row.user_segment}: "
+            f"{row.difference:+.1f}% (95% CI {row.ci_low:+.1f}% ~ {row.ci_high:+.1f}%, p={row.p_value:.3f})"
+            for row in segment_significance.itertuples(index=False)
+        ]
+        st.caption(
+            ("與其他區隔相比的轉換率差異（✅ = 統計顯著）：" if lang == 'zh'
+             else "Conversion vs. all other segments (✅ = statistically significant):")
+            + "  \n" + "  \n".join(significance_lines)
+        )
+
     with col2:
         # Clear action items
         st.markdown(f"### {get_text('channel_budget', lang)}")
@@ -2251,6 +2463,37 @@ def render_funnel_tab(analytics, periods, lang='zh'):
         use_container_width=True
     )
 
+    # Multi-dimension ROI slice (one grouped pass per dimension combination)
+    with st.expander("🔍 " + ("渠道 × 區隔 × 國家 × 方案 交叉分析" if lang == 'zh' else "Channel × Segment × Country × Plan Breakdown")):
+        dimension_labels = {
+            'acquisition_channel': '獲客渠道' if lang == 'zh' else 'Channel',
+            'user_segment': '用戶區隔' if lang == 'zh' else 'Segment',
+            'country': '國家' if lang == 'zh' else 'Country',
+            'plan_type': '方案' if lang == 'zh' else 'Plan',
+        }
+        breakdown_dims = st.multiselect(
+            "分析維度" if lang == 'zh' else "Dimensions",
+            options=list(analytics.BREAKDOWN_DIMENSIONS),
+            default=['acquisition_channel', 'user_segment'],
+            format_func=lambda dim: dimension_labels[dim],
+            key='channel_breakdown_dims'
+        )
+        if breakdown_dims:
+            breakdown = analytics.get_channel_breakdown(breakdown_dims)
+            st.dataframe(
+                breakdown.sort_values('roi', ascending=False).style.format({
+                    'total_users': '{:,}',
+                    'conversions': '{:,.0f}',
+                    'conversion_rate': '{:.2f}%',
+                    'avg_cac': '${:.2f}',
+                    'avg_ltv': '${:.2f}',
+                    'ltv_cac_ratio': '{:.2f}x',
+                    'roi': '{:.2f}%',
+                    'total_mrr': '${:.2f}'
+                }),
+                use_container_width=True
+            )
+
     # Channel insights
     st.markdown("---")
     channel_insights = f"""
@@ -2298,23 +2541,75 @@ def render_cohort_tab(analytics, periods, lang='zh'):
     st.subheader(get_text('cohort_heatmap', lang))
     st.caption(get_text('cohort_axis', lang))
 
-    retention = analytics.get_cohort_analysis()
+    # Cohort cube slicing: granularity + optional channel/segment/country/plan filters
+    # Every combination is a roll-up of the cached cube, not a rescan of scans
+    granularity_options = {
+        'month': '每月' if lang == 'zh' else 'Monthly',
+        'week': '每週' if lang == 'zh' else 'Weekly',
+        'day': '每日' if lang == 'zh' else 'Daily',
+    }
+    dimension_labels = {
+        'acquisition_channel': '獲客渠道' if lang == 'zh' else 'Channel',
+        'user_segment': '用戶區隔' if lang == 'zh' else 'Segment',
+        'country': '國家' if lang == 'zh' else 'Country',
+        'plan_type': '訂閱方案' if lang == 'zh' else 'Plan',
+    }
+    all_label = '全部' if lang == 'zh' else 'All'
+
+    control_cols = st.columns(len(dimension_labels) + 1)
+    with control_cols[0]:
+        granularity = st.selectbox(
+            '同期群粒度' if lang == 'zh' else 'Cohort Granularity',
+            options=list(granularity_options),
+            format_func=granularity_options.get,
+            key='cohort_granularity'
+        )
+
+    monthly_cube = analytics.cohort_cube('month')
+    cohort_filters = {}
+    for col, (dim, label) in zip(control_cols[1:], dimension_labels.items()):
+        with col:
+            choice = st.selectbox(
+                label,
+                options=[all_label] + monthly_cube.values(dim),
+                key=f'cohort_filter_{dim}'
+            )
+        if choice != all_label:
+            cohort_filters[dim] = choice
+
+    # Key retention metrics below are defined per month, so keep a monthly matrix
+    # for them; every view divides by cohort signups so slices stay comparable
+    retention = monthly_cube.retention(**cohort_filters)
+    cohort_sizes = monthly_cube.cohort_sizes(**cohort_filters)
+
+    if granularity == 'month':
+        heatmap_retention = retention
+    else:
+        heatmap_retention = analytics.cohort_cube(granularity).retention(**cohort_filters)
 
     # Convert period index to string for display
     retention_display = retention.copy()
     retention_display.index = retention_display.index.astype(str)
+    heatmap_display = heatmap_retention.copy()
+    heatmap_display.index = heatmap_display.index.astype(str)
 
     # Create heatmap with enhanced contrast
-    month_labels = [f"{get_text('month_n', lang)} {i} {get_text('month_unit', lang)}" for i in retention_display.columns]
+    if granularity == 'month':
+        month_labels = [f"{get_text('month_n', lang)} {i} {get_text('month_unit', lang)}" for i in heatmap_display.columns]
+    elif granularity == 'week':
+        month_labels = [f"第 {i} 週" if lang == 'zh' else f"Week {i}" for i in heatmap_display.columns]
+    else:
+        month_labels = [f"第 {i} 天" if lang == 'zh' else f"Day {i}" for i in heatmap_display.columns]
     colorbar_title = get_text('retention_pct', lang)
 
     fig = go.Figure(data=go.Heatmap(
-        z=retention_display.values,
+        z=heatmap_display.values,
         x=month_labels,
-        y=retention_display.index,
+        y=heatmap_display.index,
         colorscale=[[0, '#021424'], [0.3, '#0a3d5f'], [0.6, '#1d87c5'], [1, '#90e0ff']],
-        text=retention_display.values.round(1),
-        texttemplate='%{text}%',
+        text=heatmap_display.values.round(1),
+        # Daily cubes have hundreds of cells per row - hover instead of labels
+        texttemplate='%{text}%' if granularity != 'day' else '',
         textfont={"size": 10, "color": "#ffffff", "family": "Inter, Segoe UI"},
         colorbar=dict(
             title=dict(text=colorbar_title, font=dict(color='#70d6ff', family='Inter, Segoe UI')),
@@ -2324,8 +2619,13 @@ def render_cohort_tab(analytics, periods, lang='zh'):
 
     matrix_layout = get_matrix_layout()
     chart_title = get_text('cohort_chart_title', lang)
-    xaxis_label = get_text('months_after', lang)
-    yaxis_label = get_text('cohort_month', lang)
+    if granularity == 'month':
+        xaxis_label = get_text('months_after', lang)
+        yaxis_label = get_text('cohort_month', lang)
+    else:
+        unit = granularity_options[granularity]
+        xaxis_label = f"註冊後經過幾{'週' if granularity == 'week' else '天'}" if lang == 'zh' else f"{unit} periods after signup"
+        yaxis_label = f"註冊{'週' if granularity == 'week' else '日'}（同期群）" if lang == 'zh' else f"Signup {granularity} (cohort)"
 
     fig.update_layout(
         **matrix_layout,
@@ -2399,13 +2699,192 @@ def render_cohort_tab(analytics, periods, lang='zh'):
 
     with col3:
         # Latest cohort size
-        if len(retention_display) > 0 and len(retention_display.columns) > 0:
-            latest_cohort_size = retention_display.iloc[-1, 0]
+        if len(cohort_sizes) > 0:
+            latest_cohort_size = cohort_sizes.iloc[-1]
             st.metric(get_text('latest_cohort', lang), f"{latest_cohort_size:.0f}")
             st.caption(get_text('new_users_month', lang))
         else:
             st.info("需要更多數據" if lang == 'zh' else "Need more data")
 
+    # === SUBSCRIPTION SURVIVAL (Kaplan-Meier, cached per dimension) ===
+    st.markdown("---")
+    st.subheader("📉 " + ("訂閱存活曲線與存活 LTV" if lang == 'zh' else "Subscription Survival & Survival-Based LTV"))
+
+    survival_labels = {
+        None: '全部訂閱' if lang == 'zh' else 'All subscriptions',
+        'plan_type': '方案' if lang == 'zh' else 'Plan',
+        'acquisition_channel': '獲客渠道' if lang == 'zh' else 'Channel',
+        'user_segment': '用戶區隔' if lang == 'zh' else 'Segment',
+        'country': '國家' if lang == 'zh' else 'Country',
+    }
+    survival_by = st.selectbox(
+        "分組方式" if lang == 'zh' else "Group by",
+        options=list(survival_labels),
+        format_func=lambda dim: survival_labels[dim],
+        key='survival_dimension'
+    )
+
+    if len(analytics.subscriptions) > 0:
+        curves = analytics.survival_curves(survival_by)
+        survival_fig = go.Figure()
+        for label in curves.labels:
+            curve = curves.curve(label)
+            survival_fig.add_trace(go.Scatter(
+                x=[0, *(curve['time_days'] / 30)],
+                y=[100, *(curve['survival'] * 100)],
+                mode='lines',
+                line_shape='hv',
+                name=str(label)
+            ))
+        matrix_layout = get_matrix_layout()
+        survival_fig.update_layout(
+            **matrix_layout, height=350, margin=dict(l=0, r=0, t=20, b=0),
+            xaxis_title='訂閱月數' if lang == 'zh' else 'Months since subscription start',
+            yaxis_title='仍在訂閱 (%)' if lang == 'zh' else 'Still subscribed (%)'
+        )
+        st.plotly_chart(survival_fig, use_container_width=True)
+
+        survival_ltv = analytics.get_survival_ltv(survival_by)
+        st.dataframe(
+            survival_ltv.style.format({
+                'subscriptions': '{:,.0f}',
+                'churned': '{:,.0f}',
+                'avg_mrr': '${:.2f}',
+                'median_lifetime_months': '{:.1f}',
+                'expected_lifetime_months': '{:.1f}',
+                'ltv': '${:,.2f}'
+            }, na_rep='—'),
+            use_container_width=True
+        )
+        st.caption(
+            "LTV = 平均 MRR × 預期訂閱月數（Kaplan-Meier 曲線下面積，上限 36 個月）；仍在訂閱者視為設限資料"
+            if lang == 'zh' else
+            "LTV = avg MRR × expected lifetime (area under the Kaplan-Meier curve, capped at 36 months); active subscriptions are censored"
+        )
+    else:
+        st.info("需要更多數據" if lang == 'zh' else "Need more data")
+
+    # === CHURN-RISK SCORING (cached model, one batch over active subscribers) ===
+    st.markdown("---")
+    st.subheader("🎯 " + ("流失風險名單" if lang == 'zh' else "Churn-Risk Subscribers"))
+
+    # The model is trained offline (scripts/train_churn_model.py); the page only
+    # loads it and scores the current snapshot
+    try:
+        churn_model = analytics.churn_model(train=False)
+        churn_risk = analytics.get_churn_risk(train=False)
+    except FileNotFoundError:
+        churn_risk = None
+        st.info("尚未訓練流失模型，請先執行 python scripts/train_churn_model.py"
+                if lang == 'zh' else
+                "No churn model trained yet. Run python scripts/train_churn_model.py first")
+
+    if churn_risk is not None:
+        at_risk = churn_risk[churn_risk['risk_tier'] == 'high']
+        risk_cols = st.columns(3)
+        risk_cols[0].metric("高風險訂閱者" if lang == 'zh' else "High-risk subscribers", f"{len(at_risk):,}")
+        risk_cols[1].metric("高風險 MRR" if lang == 'zh' else "High-risk MRR", format_currency(at_risk['mrr'].sum()))
+        risk_cols[2].metric(
+            "預期 30 天流失 MRR" if lang == 'zh' else "Expected 30-day churned MRR",
+            format_currency((churn_risk['churn_probability'] * churn_risk['mrr']).sum())
+        )
+        st.dataframe(
+            churn_risk.head(20).style.format({
+                'mrr': '${:.2f}',
+                'tenure_days': '{:.0f}',
+                'days_since_last_scan': '{:.0f}',
+                'match_rate_trend': '{:+.1f}',
+                'churn_probability': '{:.1%}'
+            }),
+            use_container_width=True
+        )
+        st.caption(
+            f"模型：邏輯迴歸，{churn_model.n_rows:,} 筆訓練樣本（{churn_model.n_churned:,} 筆 30 天內流失），"
+            f"時間外驗證 AUC {churn_model.holdout_auc:.2f}；風險等級以基準流失率 {churn_model.base_rate:.1%} 的倍數劃分"
+            if lang == 'zh' else
+            f"Model: logistic regression on {churn_model.n_rows:,} training rows ({churn_model.n_churned:,} churned within 30 days), "
+            f"out-of-time AUC {churn_model.holdout_auc:.2f}; tiers are multiples of the {churn_model.base_rate:.1%} base churn rate"
+        )
+
+    # === WHAT-IF SCENARIOS (whole grid computed once; controls only pick a slice) ===
+    st.markdown("---")
+    st.subheader("🧮 " + ("情境模擬：流失 × ARPU × 轉換" if lang == 'zh' else "What-If: Churn × ARPU × Conversion"))
+
+    scenario_grid = load_scenario_grid(analytics.time_range_days)
+    scenario_metrics = {
+        'ltv': "LTV（每用戶）" if lang == 'zh' else "LTV (per user)",
+        'mrr': f"{scenario_grid.base['horizon_months']} 個月後 MRR" if lang == 'zh' else f"MRR in {scenario_grid.base['horizon_months']} months",
+        'revenue': f"未來 {scenario_grid.base['horizon_months']} 個月營收" if lang == 'zh' else f"Revenue over next {scenario_grid.base['horizon_months']} months",
+    }
+    scenario_cols = st.columns([1, 2])
+    with scenario_cols[0]:
+        scenario_metric = st.radio(
+            "指標" if lang == 'zh' else "Metric",
+            list(scenario_metrics),
+            format_func=scenario_metrics.get,
+            key='scenario_metric'
+        )
+    with scenario_cols[1]:
+        conversion_uplift = st.select_slider(
+            "轉換率提升" if lang == 'zh' else "Conversion uplift",
+            options=list(scenario_grid.axes['conversion_uplift']),
+            format_func=lambda v: f"+{v:.0%}",
+            key='scenario_conversion_uplift'
+        )
+
+    surface = scenario_grid.surface(scenario_metric, conversion_uplift)
+    baseline = scenario_grid.surface(scenario_metric, 0.0).iloc[0, 0]
+    fig = go.Figure(data=go.Heatmap(
+        z=surface.values,
+        x=[f"+{v:.1%}" for v in surface.columns],
+        y=[f"-{v:.0%}" for v in surface.index],
+        colorscale=[[0, '#021424'], [0.3, '#0a3d5f'], [0.6, '#1d87c5'], [1, '#90e0ff']],
+        customdata=(surface.values / baseline - 1) * 100 if baseline else surface.values * 0,
+        hovertemplate=(
+            "ARPU %{x}<br>" + ("流失" if lang == 'zh' else "Churn") + " %{y}<br>"
+            "$%{z:,.0f} (%{customdata:+.1f}%)<extra></extra>"
+        ),
+        colorbar=dict(tickfont=dict(color='#70d6ff', family='Inter, Segoe UI'))
+    ))
+    fig.update_layout(
+        **get_matrix_layout(),
+        xaxis_title="ARPU 提升" if lang == 'zh' else "ARPU uplift",
+        yaxis_title="流失率降低" if lang == 'zh' else "Churn reduction",
+        height=450
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Low churn puts the expected lifetime past the LTV cap; say so instead of
+    # leaving an unexplained flat heatmap
+    ltv_capped = scenario_grid.ltv_capped()
+    if scenario_metric == 'ltv' and ltv_capped.any():
+        if ltv_capped.all():
+            st.info(
+                f"目前月流失率 {scenario_grid.base['monthly_churn']:.1%} 對應的預期訂閱月數已超過 LTV 上限 36 個月，"
+                "因此 LTV 只隨 ARPU 變化、不隨流失率降低而變化"
+                if lang == 'zh' else
+                f"At the current {scenario_grid.base['monthly_churn']:.1%} monthly churn the expected lifetime is "
+                "already past the 36-month LTV cap, so LTV only changes with ARPU, not with churn reduction"
+            )
+        else:
+            first_capped = scenario_grid.axes['churn_reduction'][ltv_capped.argmax()]
+            st.info(
+                f"流失率降低 {first_capped:.0%} 以上時 LTV 達到 36 個月上限，這些列只隨 ARPU 變化"
+                if lang == 'zh' else
+                f"From a {first_capped:.0%} churn reduction on, LTV hits the 36-month cap, so those rows only change with ARPU"
+            )
+
+    base = scenario_grid.base
+    st.caption(
+        f"基準：ARPU {format_currency(base['arpu'])}、月流失率 {base['monthly_churn']:.1%}、轉換率 {base['conversion_rate']:.1%}、"
+        f"{base['paid_subscribers']:,} 個付費用戶、每月 {base['monthly_signups']:,} 個新註冊；"
+        f"共 {len(scenario_grid):,} 個情境一次計算，LTV 上限 36 個月"
+        if lang == 'zh' else
+        f"Baseline: ARPU {format_currency(base['arpu'])}, monthly churn {base['monthly_churn']:.1%}, conversion {base['conversion_rate']:.1%}, "
+        f"{base['paid_subscribers']:,} paying subscribers, {base['monthly_signups']:,} signups/month; "
+        f"{len(scenario_grid):,} scenarios computed in one pass, LTV capped at 36 months"
+    )
+
     # Action recommendations - only show if we have retention data
     st.markdown("---")
     if month_1_retention is not None:
@@ -2451,6 +2930,160 @@ def render_cohort_tab(analytics, periods, lang='zh'):
         st.info("需要更多數據來顯示行動建議" if lang == 'zh' else "Need more data to show action recommendations")
 
 
+def render_job_title_tab(analytics, periods, lang='zh'):
+    """Render the Job Titles tab"""
+    st.header("💼 " + ("職缺類別分析" if lang == 'zh' else "Job Title Analysis"))
+    st.caption(
+        "每次履歷掃描都針對一個職缺類別；這裡比較各類別的掃描量、用戶、匹配率、處理時間與付費佔比"
+        if lang == 'zh' else
+        "Every resume scan targets a job title; compare scan volume, users, match rate, processing time and paid share per title"
+    )
+
+    # One grouped pass per (time range, granularity); switching back is a cache hit
+    granularity_options = {
+        None: "整個期間" if lang == 'zh' else "Whole period",
+        'week': "每週" if lang == 'zh' else "Weekly",
+        'month': "每月" if lang == 'zh' else "Monthly",
+    }
+    granularity = st.radio(
+        "時間粒度" if lang == 'zh' else "Time buckets",
+        list(granularity_options),
+        format_func=granularity_options.get,
+        horizontal=True,
+        key='job_title_granularity'
+    )
+    title_stats = load_job_title_breakdown(analytics.time_range_days)
+
+    if len(title_stats) == 0:
+        st.info("需要更多數據" if lang == 'zh' else "Need more data")
+        return
+
+    top = title_stats.iloc[0]
+    best_match = title_stats.loc[title_stats['avg_match_rate'].idxmax()]
+    slowest = title_stats.loc[title_stats['processing_time_p90'].idxmax()]
+    stat_cols = st.columns(3)
+    stat_cols[0].metric("最多掃描" if lang == 'zh' else "Most scanned", top['job_title'], f"{top['scans']:,}")
+    stat_cols[1].metric(
+        "最高平均匹配率" if lang == 'zh' else "Highest avg match rate",
+        best_match['job_title'], f"{best_match['avg_match_rate']:.1f}%"
+    )
+    stat_cols[2].metric(
+        "最慢 (p90)" if lang == 'zh' else "Slowest (p90)",
+        slowest['job_title'], f"{slowest['processing_time_p90']:,.0f} ms", delta_color="off"
+    )
+
+    if granularity is None:
+        fig = px.bar(
+            title_stats,
+            x='job_title',
+            y='scans',
+            labels={'scans': "掃描數" if lang == 'zh' else "Scans", 'job_title': ''},
+            color='avg_match_rate',
+            color_continuous_scale=[[0, '#ff4757'], [0.5, '#ffa502'], [1, '#2ed573']]
+        )
+        fig.update_layout(**get_matrix_layout(), height=400, margin=dict(l=0, r=0, t=20, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("顏色 = 平均匹配率" if lang == 'zh' else "Color = average match rate")
+        table = title_stats
+    else:
+        trend_metrics = {
+            'scans': "掃描數" if lang == 'zh' else "Scans",
+            'users': "不重複用戶" if lang == 'zh' else "Distinct users",
+            'avg_match_rate': "平均匹配率 (%)" if lang == 'zh' else "Avg match rate (%)",
+            'processing_time_p90': "處理時間 p90 (ms)" if lang == 'zh' else "Processing time p90 (ms)",
+            'paid_share': "付費用戶掃描佔比 (%)" if lang == 'zh' else "Paid share of scans (%)",
+        }
+        trend_metric = st.selectbox(
+            "趨勢指標" if lang == 'zh' else "Trend metric",
+            list(trend_metrics),
+            format_func=trend_metrics.get,
+            key='job_title_trend_metric'
+        )
+        table = load_job_title_breakdown(analytics.time_range_days, granularity)
+        trend = table.assign(period=table['period'].dt.start_time)
+        fig = px.line(
+            trend,
+            x='period',
+            y=trend_metric,
+            color='job_title',
+            labels={trend_metric: trend_metrics[trend_metric], 'period': '', 'job_title': ''}
+        )
+        fig.update_layout(**get_matrix_layout(), height=400, margin=dict(l=0, r=0, t=20, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        table = table.assign(period=table['period'].astype(str))
+
+    st.dataframe(
+        table.style.format({
+            'scans': '{:,.0f}',
+            'users': '{:,.0f}',
+            'paid_share': '{:.1f}%',
+            'avg_match_rate': '{:.1f}',
+            'match_rate_p50': '{:.1f}',
+            'match_rate_p90': '{:.1f}',
+            'avg_processing_time_ms': '{:,.0f}',
+            'processing_time_p50': '{:,.0f}',
+            'processing_time_p90': '{:,.0f}'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # === SCAN LATENCY SLO (processing_time_ms; same cached scan codes) ===
+    st.markdown("---")
+    st.subheader("⏱️ " + ("掃描延遲 SLO" if lang == 'zh' else "Scan Latency SLO"))
+
+    slo_ms = config.LATENCY_SLO_MS
+    daily_latency = load_latency_report(analytics.time_range_days, by=())
+    window_latency = load_latency_report(analytics.time_range_days, granularity=None, by=()).iloc[0]
+    latency_cols = st.columns(4)
+    latency_cols[0].metric("p95", f"{window_latency['p95_ms']:,.0f} ms")
+    latency_cols[1].metric("p99", f"{window_latency['p99_ms']:,.0f} ms")
+    latency_cols[2].metric(
+        "超過 SLO 的掃描" if lang == 'zh' else "Scans over SLO",
+        f"{window_latency['breaches']:,.0f}", f"{window_latency['breach_rate']:.2f}%", delta_color="off"
+    )
+    latency_cols[3].metric("違反分鐘數" if lang == 'zh' else "Breach minutes", f"{window_latency['breach_minutes']:,.0f}")
+
+    latency_trend = daily_latency.assign(period=daily_latency['period'].dt.start_time).melt(
+        id_vars='period', value_vars=['p50_ms', 'p95_ms', 'p99_ms'], var_name='percentile', value_name='ms'
+    )
+    fig = px.line(
+        latency_trend,
+        x='period',
+        y='ms',
+        color='percentile',
+        labels={'period': '', 'ms': "處理時間 (ms)" if lang == 'zh' else "Processing time (ms)", 'percentile': ''}
+    )
+    fig.add_hline(y=slo_ms, line_dash="dash", line_color="#ff4757", line_width=2,
+                  annotation_text=f"SLO {slo_ms:,} ms", annotation_position="top left")
+    fig.update_layout(**get_matrix_layout(), height=350, margin=dict(l=0, r=0, t=20, b=0))
+    st.plotly_chart(fig, use_container_width=True)
+
+    latency_by_title = load_latency_report(analytics.time_range_days, granularity=None).sort_values(
+        'breach_rate', ascending=False
+    )
+    st.dataframe(
+        latency_by_title.style.format({
+            'scans': '{:,.0f}',
+            'p50_ms': '{:,.0f}',
+            'p95_ms': '{:,.0f}',
+            'p99_ms': '{:,.0f}',
+            'breaches': '{:,.0f}',
+            'breach_rate': '{:.2f}%',
+            'breach_minutes': '{:,.0f}'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(
+        f"SLO：每次掃描處理時間 ≤ {slo_ms:,} ms；違反分鐘數 = 至少有一次掃描超過 SLO 的分鐘數。"
+        f"近 7 天的 p95 與違反比例也會進入異常檢測"
+        if lang == 'zh' else
+        f"SLO: each scan processed within {slo_ms:,} ms; breach minutes = clock minutes with at least one scan over the SLO. "
+        f"The 7-day p95 and breach rate also feed anomaly detection"
+    )
+
+
 def render_ai_query_tab(ai_engine, lang='zh'):
     """Render the AI Query tab"""
     st.header(get_text('ai_title', lang))
@@ -2691,6 +3324,19 @@ def main():
 
     # Sidebar
     lang = st.session_state.language  # Get current language
+
+    # revenue.csv is derived from subscriptions.csv; flag days where they disagree
+    revenue_mismatches = load_revenue_reconciliation()
+    if len(revenue_mismatches) > 0:
+        mismatched_days = revenue_mismatches['date'].nunique()
+        st.warning(
+            f"⚠️ 收入表有 {mismatched_days} 天與訂閱資料不一致，MRR 相關指標可能不準確"
+            if lang == 'zh' else
+            f"⚠️ The revenue table disagrees with subscriptions on {mismatched_days} day(s); MRR metrics may be off"
+        )
+        with st.expander("不一致明細" if lang == 'zh' else "Mismatch details", expanded=False):
+            st.dataframe(revenue_mismatches, use_container_width=True)
+
     with st.sidebar:
         st.header(get_text('control_panel', lang))
 
@@ -2857,17 +3503,37 @@ def main():
             tip_text = "💡 提示：選擇篩選條件以深入分析特定數據" if lang == 'zh' else "💡 Tip: Select filters to analyze specific data"
             st.caption(tip_text)
 
+        # Exploration mode: approximate sidebar stats from a stable user sample,
+        # offered only where sampling beats the exact batch (config.SAMPLE_MIN_SCANS)
+        fast_mode = False
+        if len(analytics.scans) >= config.SAMPLE_MIN_SCANS:
+            fast_mode = st.toggle(
+                f"⚡ {'快速探索模式（抽樣 ≈）' if lang == 'zh' else 'Fast exploration (sampled ≈)'}",
+                value=st.session_state.get('fast_mode', False),
+                help=(f"以 {config.SAMPLE_RATE:.0%} 的固定用戶樣本估算指標並顯示 95% 信賴區間；報表請關閉以取得精確值"
+                      if lang == 'zh' else
+                      f"Estimate metrics on a fixed {config.SAMPLE_RATE:.0%} user sample with 95% confidence intervals; "
+                      f"turn off for exact report values")
+            )
+            st.session_state.fast_mode = fast_mode
+
         st.markdown("---")
 
         # Quick Health Check
         st.subheader(get_text('health_quick', lang))
-        total_users = len(analytics.users)
-        active_subs = len(analytics.subscriptions[analytics.subscriptions['status'] == 'active'])
-        total_scans = len(analytics.scans)
-
-        # Calculate health scores (using adaptive periods)
-        mrr_growth = analytics.get_mrr_growth_rate(periods['comparison_period'])
-        churn = analytics.get_churn_rate(periods['comparison_period'])
+        # Calculate health scores (using adaptive periods) in one batch call
+        health_metrics = ['total_users', 'active_subscriptions', 'total_scans', 'mrr_growth_rate', 'churn_rate']
+        health_params = {'days': periods['comparison_period'], 'period_days': periods['comparison_period']}
+        if fast_mode:
+            estimates = analytics.estimate(health_metrics, **health_params)
+            health = {name: estimate['value'] for name, estimate in estimates.items()}
+        else:
+            health = analytics.compute(health_metrics, **health_params)
+        total_users = health['total_users']
+        active_subs = health['active_subscriptions']
+        total_scans = health['total_scans']
+        mrr_growth = health['mrr_growth_rate']
+        churn = health['churn_rate']
 
         # Display with color coding
         if mrr_growth > 10:
@@ -2888,9 +3554,20 @@ def main():
 
         # Quick Stats
         st.subheader(get_text('basic_stats', lang))
-        st.metric(get_text('total_users', lang), f"{total_users:,}", help=get_text('total_users_help', lang))
-        st.metric(get_text('active_subs', lang), f"{active_subs:,}", help=get_text('active_subs_help', lang))
-        st.metric(get_text('total_scans', lang), f"{total_scans:,}", help=get_text('total_scans_help', lang))
+        if fast_mode:
+            def approximate(name):
+                estimate = estimates[name]
+                half_width = (estimate['ci_high'] - estimate['ci_low']) / 2
+                return f"≈{estimate['value']:,.0f} ±{half_width:,.0f}"
+
+            st.metric(get_text('total_users', lang), approximate('total_users'), help=get_text('total_users_help', lang))
+            st.metric(get_text('active_subs', lang), approximate('active_subscriptions'), help=get_text('active_subs_help', lang))
+            st.metric(get_text('total_scans', lang), approximate('total_scans'), help=get_text('total_scans_help', lang))
+            st.caption("≈ 抽樣估計（± = 95% 信賴區間）" if lang == 'zh' else "≈ sampled estimate (± = 95% confidence interval)")
+        else:
+            st.metric(get_text('total_users', lang), f"{total_users:,}", help=get_text('total_users_help', lang))
+            st.metric(get_text('active_subs', lang), f"{active_subs:,}", help=get_text('active_subs_help', lang))
+            st.metric(get_text('total_scans', lang), f"{total_scans:,}", help=get_text('total_scans_help', lang))
 
         st.markdown("---")
 
@@ -2911,10 +3588,11 @@ def main():
         st.info(get_text('tip', lang))
 
     # Main tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         get_text('tab_overview', lang),
         get_text('tab_funnel', lang),
         get_text('tab_cohort', lang),
+        get_text('tab_job_titles', lang),
         get_text('tab_ai', lang)
     ])
 
@@ -2928,6 +3606,9 @@ def main():
         render_cohort_tab(analytics, periods, lang)
 
     with tab4:
+        render_job_title_tab(analytics, periods, lang)
+
+    with tab5:
         render_ai_query_tab(ai_engine, lang)
 
 
@@ -201,6 +201,7 @@ LANGUAGES = {
         'tab_overview': '📊 Overview',
         'tab_funnel': '🎯 Conversion Funnel',
         'tab_cohort': '👥 Cohort Analysis',
+        'tab_job_titles': '💼 Job Titles',
         'tab_ai': '🤖 AI Assistant',
 
         # Overview Tab
@@ -1124,6 +1125,7 @@ MAU = 過去 30 天內至少登入過一次的用戶數
         'tab_overview': '📊 Overview',
         'tab_funnel': '🎯 Conversion Funnel',
         'tab_cohort': '👥 Cohort Analysis',
+        'tab_job_titles': '💼 Job Titles',
         'tab_ai': '🤖 AI Assistant',
 
         # Overview Tab
@@ -0,0 +1,126 @@
+"""
+Shared synthetic snapshot for unit tests
+
+Builds small users / subscriptions / scans / revenue tables with the same
+columns and definitions as scripts/data_generator.py, so analytics tests run
+without the generated CSV files. Some churned subscribers come back on a
+different plan, so users with several subscriptions are covered too.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.core.analytics import SaaSAnalytics
+
+START_DATE = pd.Timestamp('2024-01-01')
+DATE_RANGE_DAYS = 180
+PLAN_PRICES = {'basic': 29.99, 'professional': 49.99, 'premium': 99.99}
+JOB_TITLES = ['Software Engineer', 'Data Analyst', 'Product Manager', 'Designer', 'Accountant']
+
+
+def build_revenue(subscriptions, dates):
+    """Daily revenue table, one mask per day (reference definition from data_generator.py)"""
+    rows = []
+    for date in dates:
+        active = subscriptions[
+            (subscriptions['subscription_start'] <= date) &
+            (subscriptions['subscription_end'].isna() | (subscriptions['subscription_end'] > date))
+        ]
+        rows.append({
+            'date': date,
+            'daily_revenue': active['mrr'].sum() / 30,
+            'mrr': active['mrr'].sum(),
+            'active_subscriptions': len(active),
+            'new_subscriptions': int((subscriptions['subscription_start'].dt.date == date.date()).sum()),
+            'churned_subscriptions': int((subscriptions['subscription_end'].dt.date == date.date()).sum()),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_raw_data(n_users=600, seed=7):
+    """
+    Generate a deterministic snapshot
+
+    Returns:
+        dict: users, subscriptions, scans, revenue DataFrames
+    """
+    rng = np.random.default_rng(seed)
+    end_date = START_DATE + pd.Timedelta(days=DATE_RANGE_DAYS)
+
+    signup = START_DATE + pd.to_timedelta(np.sort(rng.uniform(0, DATE_RANGE_DAYS, n_users)), unit='D')
+    channels = rng.choice(['organic', 'paid_search', 'social', 'referral'], n_users, p=[0.4, 0.3, 0.2, 0.1])
+    users = pd.DataFrame({
+        'user_id': np.arange(1, n_users + 1),
+        'signup_date': signup,
+        'acquisition_channel': channels,
+        'user_segment': rng.choice(['job_seeker', 'career_changer', 'recent_grad'], n_users),
+        'country': rng.choice(['US', 'UK', 'CA'], n_users, p=[0.6, 0.25, 0.15]),
+        'cac': np.where(channels == 'organic', 0.0, rng.uniform(10, 80, n_users)),
+    })
+
+    subscriptions = []
+    for user_id, signup_date in zip(users['user_id'], users['signup_date']):
+        if rng.random() >= 0.3:
+            continue
+        start = signup_date + pd.Timedelta(days=float(rng.exponential(7)))
+        plan = rng.choice(list(PLAN_PRICES))
+        while start < end_date:
+            billing = rng.choice(['monthly', 'annual'], p=[0.7, 0.3])
+            mrr = PLAN_PRICES[plan] * (0.85 if billing == 'annual' else 1.0)
+            churn_days = float(rng.exponential(150))
+            end = start + pd.Timedelta(days=churn_days)
+            churned = end < end_date
+            subscriptions.append({
+                'user_id': user_id,
+                'subscription_start': start,
+                'subscription_end': end if churned else pd.NaT,
+                'plan_type': plan,
+                'billing_cycle': billing,
+                'mrr': round(mrr, 4),
+                'status': 'churned' if churned else 'active',
+            })
+            # Half of the churned subscribers come back later on another plan
+            if not churned or rng.random() >= 0.5:
+                break
+            start = end + pd.Timedelta(days=float(rng.uniform(5, 40)))
+            plan = rng.choice([p for p in PLAN_PRICES if p != plan])
+    subscriptions = pd.DataFrame(subscriptions)
+    subscriptions['subscription_end'] = pd.to_datetime(subscriptions['subscription_end'])
+
+    is_paid = users['user_id'].isin(subscriptions['user_id']).to_numpy()
+    n_scans = rng.poisson(np.where(is_paid, 8, 3))
+    owner = np.repeat(np.arange(n_users), n_scans)
+    span = (end_date - users['signup_date']).dt.total_seconds().to_numpy()
+    offsets = pd.to_timedelta(rng.uniform(0, 1, len(owner)) * span[owner], unit='s')
+    scans = pd.DataFrame({
+        'user_id': users['user_id'].to_numpy()[owner],
+        'scan_date': users['signup_date'].to_numpy()[owner] + offsets,
+        'match_rate': np.clip(rng.normal(75, 12, len(owner)), 0, 100),
+        'processing_time_ms': rng.gamma(2, 500, len(owner)),
+        'keywords_extracted': rng.poisson(15, len(owner)),
+        'job_title': rng.choice(JOB_TITLES, len(owner)),
+        'is_paid_user': is_paid[owner],
+    }).sort_values(['user_id', 'scan_date'], kind='stable').reset_index(drop=True)
+
+    revenue = build_revenue(subscriptions, pd.date_range(START_DATE, end_date, freq='D'))
+    return {'users': users, 'subscriptions': subscriptions, 'scans': scans, 'revenue': revenue}
+
+
+@pytest.fixture(scope="session")
+def raw_data():
+    """Synthetic snapshot shared by the whole test session (treat as read-only)"""
+    return make_raw_data()
+
+
+@pytest.fixture
+def make_analytics(raw_data):
+    """Factory for fresh SaaSAnalytics snapshots over the synthetic data"""
+    def make(time_range_days=None, data=None):
+        return SaaSAnalytics.from_dataframes(data or raw_data, time_range_days=time_range_days)
+    return make
@@ -0,0 +1,67 @@
+"""
+Unit tests for the sparse activity matrix and retention metrics
+
+Run with: pytest tests/unit/test_activity.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def reference_retention(users, scans, max_days):
+    """N-day retention by brute force over every signed-up user"""
+    last = scans['scan_date'].dt.normalize().max()
+    signup = users.set_index('user_id')['signup_date'].dt.normalize()
+    offsets = (scans['scan_date'].dt.normalize() - scans['user_id'].map(signup)).dt.days
+    rows = []
+    for n in range(max_days + 1):
+        eligible = (signup + pd.Timedelta(days=n) <= last).sum()
+        retained = scans.loc[(offsets == n).to_numpy(), 'user_id'].nunique()
+        rows.append((n, eligible, retained))
+    return pd.DataFrame(rows, columns=['offset', 'eligible_users', 'retained_users'])
+
+
+class TestRetentionCurve:
+    """Retention denominators cover every user, not only users who scanned"""
+
+    def test_matches_reference(self, make_analytics):
+        """Eligible and retained counts match the brute-force definition"""
+        analytics = make_analytics()
+        curve = analytics.get_retention_curve(30)
+        expected = reference_retention(analytics.users, analytics.scans, 30)
+        np.testing.assert_array_equal(curve['eligible_users'], expected['eligible_users'])
+        np.testing.assert_array_equal(curve['retained_users'], expected['retained_users'])
+
+    def test_non_scanners_are_eligible(self, make_analytics):
+        """Day-0 denominator counts users who never scanned"""
+        analytics = make_analytics()
+        never_scanned = ~analytics.users['user_id'].isin(analytics.scans['user_id'])
+        assert never_scanned.any()
+        curve = analytics.get_retention_curve(0)
+        last = analytics.scans['scan_date'].max().normalize()
+        in_range = analytics.users['signup_date'].dt.normalize() <= last
+        assert curve['eligible_users'].iloc[0] == in_range.sum()
+
+    def test_n_day_retention(self, make_analytics):
+        """get_n_day_retention is the last row of the curve"""
+        analytics = make_analytics()
+        curve = analytics.get_retention_curve(7)
+        assert analytics.get_n_day_retention(7) == pytest.approx(curve['retention_rate'].iloc[-1])
+
+
+class TestActivityMatrix:
+    """Other reductions are unaffected by empty rows"""
+
+    def test_scans_per_user_only_scanners(self, make_analytics):
+        """Scans per user lists users with scans, matching a groupby"""
+        analytics = make_analytics()
+        expected = analytics.scans.groupby('user_id').size()
+        pd.testing.assert_series_equal(analytics._scans_per_user(), expected,
+                                       check_names=False, check_dtype=False)
+
+    def test_growth_accounting_active(self, make_analytics):
+        """Active users per month equals distinct scanners per month"""
+        analytics = make_analytics()
+        accounting = analytics.get_growth_accounting('month')
+        expected = analytics.scans.groupby(analytics.scans['scan_date'].dt.to_period('M'))['user_id'].nunique()
+        np.testing.assert_array_equal(accounting['active'], expected.to_numpy())
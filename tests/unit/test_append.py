@@ -0,0 +1,104 @@
+"""
+Unit tests for append_scans()
+
+Run with: pytest tests/unit/test_append.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+CUTOFF = pd.Timestamp('2024-05-01')
+
+# Every cached getter that reads users or scans
+GETTERS = {
+    'cohort_analysis': lambda a: a.get_cohort_analysis(),
+    'user_match_stats': lambda a: a.get_user_match_stats(),
+    'conversion_funnel': lambda a: a.get_conversion_funnel(),
+    'conversion_funnel_trend': lambda a: a.get_conversion_funnel_trend(),
+    'conversion_funnel_series': lambda a: a.get_conversion_funnel_series(),
+    'active_users': lambda a: [a.get_active_users(days=d) for d in (1, 7, 30)],
+    'active_users_sketch': lambda a: a.get_active_users(days=30, exact=False),
+    'active_users_exact': lambda a: a.get_active_users_exact(7),
+    'stickiness': lambda a: a.get_stickiness(),
+    'retention_curve': lambda a: a.get_retention_curve(30),
+    'growth_accounting': lambda a: a.get_growth_accounting(),
+    'avg_match_rate': lambda a: a.get_avg_match_rate(),
+    'avg_scans_per_user': lambda a: a.get_avg_scans_per_user(),
+    'scan_percentiles': lambda a: a.get_scan_percentiles('match_rate', days=30),
+    'job_title_breakdown': lambda a: a.get_job_title_breakdown('month'),
+    'latency_report': lambda a: a.get_latency_report('week'),
+    'active_users_series': lambda a: a.series('active_users', 7),
+    'channel_performance': lambda a: a.get_channel_performance(),
+    'segment_performance': lambda a: a.get_user_segment_performance(),
+    'cohort_cube': lambda a: a.cohort_cube('week').retention(),
+}
+
+
+def assert_same(left, right):
+    """Compare getter results of any of the shapes the getters return"""
+    if isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right)
+    elif isinstance(left, pd.Series):
+        pd.testing.assert_series_equal(left, right)
+    elif isinstance(left, dict):
+        assert left.keys() == right.keys()
+        for key in left:
+            assert_same(left[key], right[key])
+    elif isinstance(left, str):
+        assert left == right
+    else:
+        np.testing.assert_allclose(left, right)
+
+
+@pytest.fixture
+def split(raw_data):
+    """Snapshot data before CUTOFF plus the users and scans that arrive after it"""
+    users, scans = raw_data['users'], raw_data['scans']
+    base = dict(raw_data,
+                users=users[users['signup_date'] < CUTOFF],
+                scans=scans[scans['scan_date'] < CUTOFF])
+    new_users = users[users['signup_date'] >= CUTOFF]
+    new_scans = scans[scans['scan_date'] >= CUTOFF]
+    return base, new_users, new_scans
+
+
+class TestAppendScans:
+    """Appending must give the same answers as building the snapshot from scratch"""
+
+    @pytest.mark.parametrize('name', list(GETTERS))
+    def test_matches_full_rebuild(self, make_analytics, split, name):
+        """Each cached getter equals the rebuilt snapshot after an append"""
+        base, new_users, new_scans = split
+        analytics = make_analytics(data=base)
+        for getter in GETTERS.values():  # warm every cache before appending
+            getter(analytics)
+
+        appended = analytics.append_scans(new_scans, users=new_users)
+        rebuilt = make_analytics(data=dict(
+            base,
+            users=pd.concat([base['users'], new_users], ignore_index=True),
+            scans=pd.concat([base['scans'], new_scans], ignore_index=True),
+        ))
+        assert_same(GETTERS[name](appended), GETTERS[name](rebuilt))
+
+    def test_original_snapshot_unchanged(self, make_analytics, split):
+        """The snapshot appended to keeps its data and cached results"""
+        base, new_users, new_scans = split
+        analytics = make_analytics(data=base)
+        before = {name: getter(analytics) for name, getter in GETTERS.items()}
+
+        analytics.append_scans(new_scans, users=new_users)
+
+        assert len(analytics.scans) == len(base['scans'])
+        assert len(analytics.users) == len(base['users'])
+        for name, getter in GETTERS.items():
+            assert_same(getter(analytics), before[name])
+
+    def test_cohort_matrix_is_incremental(self, make_analytics, split):
+        """The appended snapshot reuses a copy of the cohort matrix, not a rebuild"""
+        base, new_users, new_scans = split
+        analytics = make_analytics(data=base)
+        matrix = analytics.cohort_matrix()
+        appended = analytics.append_scans(new_scans, users=new_users)
+        assert appended.cohort_matrix() is not matrix
+        assert appended.cohort_matrix()._counts != matrix._counts
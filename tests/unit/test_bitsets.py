@@ -0,0 +1,65 @@
+"""
+Unit tests for exact per-day user bitsets
+
+Run with: pytest tests/unit/test_bitsets.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.sketches import DailyUserBitsets
+
+
+def active_set(analytics, start, end):
+    """Users with a scan on a calendar day in [start, end]"""
+    days = analytics.scans['scan_date'].dt.normalize()
+    return set(analytics.scans.loc[(days >= start) & (days <= end), 'user_id'])
+
+
+class TestDailyUserBitsets:
+    """Bitset counts are exact set operations"""
+
+    def test_members_round_trip(self):
+        """window() decodes back to exactly the active ids"""
+        bitsets = DailyUserBitsets.build([5, 9, 5, 13, 2], [0, 0, 1, 2, 2])
+        assert list(bitsets.members(bitsets.window(0, 0))) == [5, 9]
+        assert list(bitsets.members(bitsets.window(1, 2))) == [2, 5, 13]
+        assert bitsets.count(0, 2) == 4
+
+    def test_window_outside_range_is_empty(self):
+        """Windows that miss the covered days count zero"""
+        bitsets = DailyUserBitsets.build([1, 2], [10, 11])
+        assert bitsets.count(0, 9) == 0
+        assert bitsets.count(12, 20) == 0
+
+    def test_empty(self):
+        """No events builds an empty bitset"""
+        bitsets = DailyUserBitsets.build(np.array([], dtype='int64'), np.array([], dtype='int64'))
+        assert len(bitsets.bits) == 0
+
+
+class TestBitsetMetrics:
+    """Analytics getters backed by bitsets match set arithmetic over scans"""
+
+    @pytest.mark.parametrize('days', [1, 7, 30])
+    def test_active_users_exact(self, make_analytics, days):
+        """Window counts equal distinct users over the same calendar days"""
+        analytics = make_analytics()
+        last = analytics.scans['scan_date'].max().normalize()
+        expected = active_set(analytics, last - pd.Timedelta(days=days - 1), last)
+        assert analytics.get_active_users_exact(days) == len(expected)
+
+    def test_active_users_exact_end_date(self, make_analytics):
+        """end_date moves the window back in time"""
+        analytics = make_analytics()
+        end = pd.Timestamp('2024-03-15')
+        expected = active_set(analytics, end - pd.Timedelta(days=6), end)
+        assert analytics.get_active_users_exact(7, end_date=end) == len(expected)
+
+    def test_retained_users(self, make_analytics):
+        """Users active in both windows equals the set intersection"""
+        analytics = make_analytics()
+        a, b = pd.Timestamp('2024-03-07'), pd.Timestamp('2024-04-07')
+        expected = (active_set(analytics, a - pd.Timedelta(days=6), a) &
+                    active_set(analytics, b - pd.Timedelta(days=6), b))
+        assert analytics.get_retained_users(a, b, days=7) == len(expected)
@@ -0,0 +1,178 @@
+"""
+Unit tests for channel, segment and multi-dimension breakdowns
+
+Run with: pytest tests/unit/test_breakdown.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def reference_breakdown(analytics, by):
+    """Users, conversions, active subscriptions and MRR per group via a users x subscriptions merge"""
+    users, subs = analytics.users, analytics.subscriptions
+    merged = users.merge(subs[['user_id', 'mrr', 'status']], on='user_id', how='left')
+    active = merged[merged['status'] == 'active']
+    return pd.DataFrame({
+        'total_users': users.groupby(by).size(),
+        'avg_cac': users.groupby(by)['cac'].mean(),
+        'conversions': merged.groupby(by)['mrr'].apply(lambda x: x.notna().sum()),
+        'active_subs': active.groupby(by).size(),
+        'total_mrr': active.groupby(by)['mrr'].sum(),
+    }).fillna({'active_subs': 0, 'total_mrr': 0.0})
+
+
+class TestChannelPerformance:
+    """Vectorized channel views match the merge-based reference"""
+
+    def test_channel_performance(self, make_analytics):
+        """Per-channel users, conversions, CAC, MRR and derived ratios"""
+        analytics = make_analytics()
+        result = analytics.get_channel_performance().set_index('channel')
+        expected = reference_breakdown(analytics, 'acquisition_channel')
+
+        np.testing.assert_array_equal(result['total_users'], expected['total_users'])
+        np.testing.assert_array_equal(result['conversions'], expected['conversions'])
+        np.testing.assert_allclose(result['avg_cac'], expected['avg_cac'])
+        np.testing.assert_allclose(result['total_mrr'], expected['total_mrr'])
+        np.testing.assert_allclose(result['conversion_rate'],
+                                   expected['conversions'] / expected['total_users'] * 100)
+
+        monthly_churn = analytics.get_churn_rate(30) / 100
+        ltv = (expected['total_mrr'] / expected['active_subs']).fillna(0) / monthly_churn
+        np.testing.assert_allclose(result['avg_ltv'], ltv)
+        paid = expected['avg_cac'] > 0
+        np.testing.assert_allclose(result['roi'][paid], ((ltv - expected['avg_cac']) / expected['avg_cac'] * 100)[paid])
+        assert (result['roi'][~paid] == 999999).all()
+
+    def test_channel_breakdown_two_dimensions(self, make_analytics):
+        """Any dimension combination comes from one grouped pass"""
+        analytics = make_analytics()
+        by = ['acquisition_channel', 'country']
+        result = analytics.get_channel_breakdown(by).set_index(by)
+        expected = reference_breakdown(analytics, by)
+        np.testing.assert_array_equal(result['total_users'], expected['total_users'])
+        np.testing.assert_array_equal(result['conversions'], expected['conversions'])
+        np.testing.assert_allclose(result['total_mrr'], expected['total_mrr'])
+
+    def test_segment_performance(self, make_analytics):
+        """Segment conversions count every subscription, as the original merge did"""
+        analytics = make_analytics()
+        result = analytics.get_user_segment_performance().set_index('segment')
+        expected = reference_breakdown(analytics, 'user_segment')
+        np.testing.assert_array_equal(result['total_users'], expected['total_users'])
+        np.testing.assert_array_equal(result['conversions'], expected['conversions'])
+
+    def test_signup_window(self, make_analytics):
+        """start/end restrict the breakdown to users who signed up in the window"""
+        analytics = make_analytics()
+        result = analytics.breakdown('acquisition_channel', metrics=['total_users'],
+                                     start='2024-02-01', end='2024-02-29')
+        users = analytics.users
+        in_window = users[(users['signup_date'] >= '2024-02-01') & (users['signup_date'] < '2024-03-01')]
+        expected = in_window.groupby('acquisition_channel').size()
+        np.testing.assert_array_equal(result['total_users'], expected)
+
+    def test_unknown_metric(self, make_analytics):
+        """Unknown metrics are rejected"""
+        with pytest.raises(ValueError):
+            make_analytics().breakdown('country', metrics=['not_a_metric'])
+
+
+class TestMetricsCube:
+    """Plan breakdowns count each subscription under its own plan"""
+
+    def test_revenue_by_plan_matches_groupby(self, make_analytics):
+        """Revenue by plan equals grouping active subscriptions by plan_type"""
+        analytics = make_analytics()
+        subs = analytics.subscriptions
+        assert subs.groupby('user_id')['plan_type'].nunique().max() > 1  # users who switched plans
+        active = subs[subs['status'] == 'active']
+        expected = active.groupby('plan_type').agg(mrr=('mrr', 'sum'), subscribers=('user_id', 'count'))
+
+        result = analytics.get_revenue_by_plan().set_index('plan_type')
+        np.testing.assert_array_equal(result.index, expected.index)
+        np.testing.assert_allclose(result['mrr'], expected['mrr'])
+        np.testing.assert_array_equal(result['subscribers'], expected['subscribers'])
+
+    def test_multi_plan_user(self, make_analytics, raw_data):
+        """A user who reactivated on another plan adds revenue to the new plan only"""
+        subs = raw_data['subscriptions']
+        switchers = subs.groupby('user_id')['plan_type'].nunique()
+        user_id = switchers[switchers > 1].index[0]
+        data = dict(raw_data,
+                    users=raw_data['users'][raw_data['users']['user_id'] == user_id],
+                    subscriptions=subs[subs['user_id'] == user_id])
+        analytics = make_analytics(data=data)
+        user_subs = analytics.subscriptions.sort_values('subscription_start')
+
+        by_plan = analytics.breakdown('plan_type', metrics=['total_users', 'conversions', 'total_mrr']).set_index('plan_type')
+        assert by_plan['total_users'].sum() == 1
+        assert by_plan.loc[user_subs['plan_type'].iloc[-1], 'total_users'] == 1
+        np.testing.assert_array_equal(by_plan['conversions'], user_subs.groupby('plan_type').size())
+        active = user_subs[user_subs['status'] == 'active']
+        assert by_plan['total_mrr'].sum() == pytest.approx(active['mrr'].sum())
+
+    def test_plan_totals_are_additive(self, make_analytics):
+        """Summing the plan rows gives the grand totals"""
+        analytics = make_analytics()
+        by_plan = analytics.breakdown('plan_type', metrics=['total_users', 'conversions', 'active_subs', 'scans'])
+        assert by_plan['total_users'].sum() == len(analytics.users)
+        assert by_plan['conversions'].sum() == len(analytics.subscriptions)
+        assert by_plan['active_subs'].sum() == (analytics.subscriptions['status'] == 'active').sum()
+        assert by_plan['scans'].sum() == len(analytics.scans)
+
+    def test_non_cube_column_matches_cube(self, make_analytics):
+        """A plan breakdown through the frame fallback equals the cube roll-up"""
+        analytics = make_analytics()
+        cube = analytics.breakdown(['plan_type'])
+        fallback = analytics.breakdown(['plan_type', 'user_id']).groupby('plan_type')[
+            ['total_users', 'conversions', 'active_subs', 'total_mrr', 'scans']].sum()
+        np.testing.assert_array_equal(cube['total_users'], fallback['total_users'])
+        np.testing.assert_array_equal(cube['conversions'], fallback['conversions'])
+        np.testing.assert_allclose(cube['total_mrr'], fallback['total_mrr'])
+        np.testing.assert_array_equal(cube['scans'], fallback['scans'])
+
+
+class TestBreakdownEngine:
+    """Generic breakdown() over cube and non-cube columns"""
+
+    def test_segment_ltv_analysis(self, make_analytics):
+        """12-month LTV per segment from active subscriptions' average MRR"""
+        analytics = make_analytics()
+        result = analytics.get_user_segment_ltv_analysis().set_index('segment')
+        merged = analytics.users.merge(analytics.subscriptions[['user_id', 'mrr', 'status']], on='user_id', how='left')
+        active = merged[merged['status'] == 'active'].groupby('user_segment')['mrr']
+        np.testing.assert_allclose(result['avg_mrr'], active.mean())
+        np.testing.assert_allclose(result['avg_ltv'], active.mean() * 12)
+        np.testing.assert_array_equal(result['active_subs'], active.count())
+
+    def test_non_cube_column(self, make_analytics, raw_data):
+        """Columns outside the cube are grouped from the breakdown frame"""
+        users = raw_data['users']
+        users = users.assign(cohort_half=np.where(users['signup_date'] < '2024-04-01', 'H1', 'H2'))
+        analytics = make_analytics(data=dict(raw_data, users=users))
+        result = analytics.breakdown(['cohort_half', 'country']).set_index(['cohort_half', 'country'])
+        expected = reference_breakdown(analytics, ['cohort_half', 'country'])
+        np.testing.assert_array_equal(result['total_users'], expected['total_users'])
+        np.testing.assert_array_equal(result['conversions'], expected['conversions'])
+        np.testing.assert_array_equal(result['active_subs'], expected['active_subs'])
+        np.testing.assert_allclose(result['total_mrr'], expected['total_mrr'])
+        np.testing.assert_allclose(result['avg_cac'], expected['avg_cac'])
+
+    def test_filters(self, make_analytics):
+        """dimension=value filters equal breaking down the filtered users"""
+        analytics = make_analytics()
+        result = analytics.breakdown('user_segment', country=['US', 'CA']).set_index('user_segment')
+        users = analytics.users[analytics.users['country'].isin(['US', 'CA'])]
+        np.testing.assert_array_equal(result['total_users'], users.groupby('user_segment').size())
+
+    def test_metric_order(self, make_analytics):
+        """Requested metrics come back in order after the by columns"""
+        result = make_analytics().breakdown(['country'], metrics=['roi', 'total_users', 'roi'])
+        assert list(result.columns) == ['country', 'roi', 'total_users']
+
+    def test_unknown_column(self, make_analytics):
+        """Unknown grouping columns are rejected"""
+        with pytest.raises(ValueError):
+            make_analytics().breakdown('not_a_column')
@@ -0,0 +1,102 @@
+"""
+Unit tests for churn features, the cached churn model and batch scoring
+
+Run with: pytest tests/unit/test_churn.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import config
+from src.core.churn import ChurnModel, build_churn_features
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    """Cache models in a per-test directory"""
+    monkeypatch.setattr(config, 'MODEL_DIR', tmp_path)
+    return tmp_path
+
+
+class TestChurnFeatures:
+    """Binary-search windows equal per-row scan filters"""
+
+    def test_matches_per_row_filters(self, make_analytics):
+        """Scan counts, recency and match rate per subscriber"""
+        analytics = make_analytics()
+        rows = analytics.subscriptions.head(80).assign(reference=pd.Timestamp('2024-05-15'))
+        features = build_churn_features(rows, analytics.scans)
+        scans = analytics.scans
+
+        for index, row in rows.iterrows():
+            user_scans = scans[(scans['user_id'] == row['user_id']) & (scans['scan_date'] < row['reference'])]
+            last_30 = user_scans[user_scans['scan_date'] >= row['reference'] - pd.Timedelta(days=30)]
+            last_90 = user_scans[user_scans['scan_date'] >= row['reference'] - pd.Timedelta(days=90)]
+            got = features.loc[index]
+            assert got['scans_30d'] == len(last_30)
+            assert got['scans_90d'] == len(last_90)
+            if len(user_scans):
+                recency = (row['reference'] - user_scans['scan_date'].max()).total_seconds() / 86400
+                assert got['days_since_last_scan'] == pytest.approx(min(recency, 365), abs=1 / 86400)  # second resolution
+            else:
+                assert got['days_since_last_scan'] == 365
+            if len(last_30):
+                assert got['match_rate_30d'] == pytest.approx(last_30['match_rate'].mean())
+            assert got['tenure_days'] == pytest.approx(
+                max((row['reference'] - row['subscription_start']).total_seconds(), 0) / 86400, abs=1 / 86400)
+
+
+class TestChurnModel:
+    """Training is cached on disk and never happens with train=False"""
+
+    def test_missing_model_without_training(self, make_analytics, model_dir):
+        """train=False on an empty model directory points at the training script"""
+        with pytest.raises(FileNotFoundError, match='train_churn_model.py'):
+            make_analytics().get_churn_risk(train=False)
+        assert not list(model_dir.iterdir())
+
+    def test_trained_model_is_reused(self, make_analytics, model_dir, monkeypatch):
+        """A second process loads the cached model instead of fitting"""
+        model = make_analytics().churn_model()
+        assert len(list(model_dir.glob('churn_model_*.joblib'))) == 1
+
+        monkeypatch.setattr(ChurnModel, 'train', classmethod(lambda *args, **kwargs: pytest.fail('retrained')))
+        assert make_analytics().churn_model().fingerprint == model.fingerprint
+        assert make_analytics(90).churn_model(train=False).fingerprint == model.fingerprint
+
+    def test_offline_model_scores_any_range(self, make_analytics, model_dir):
+        """Scores with train=False equal the trained path on the same snapshot"""
+        make_analytics().churn_model()
+        trained = make_analytics().get_churn_risk()
+        loaded = make_analytics().get_churn_risk(train=False)
+        pd.testing.assert_frame_equal(trained, loaded)
+
+        filtered = make_analytics(60)
+        risk = filtered.get_churn_risk(train=False)
+        assert set(risk['user_id']) == set(filtered._active_subscriptions()['user_id'])
+        assert risk['churn_probability'].is_monotonic_decreasing
+
+
+class TestChurnScoring:
+    """All active subscribers are scored in one model call"""
+
+    def test_batch_equals_model(self, make_analytics, model_dir):
+        """Probabilities are the model's predictions on the snapshot features"""
+        analytics = make_analytics()
+        model = analytics.churn_model()
+        subs = analytics._active_subscriptions()
+        features = build_churn_features(subs.assign(reference=analytics._churn_reference()), analytics.scans)
+        expected = pd.Series(model.predict(features), index=subs['user_id'].to_numpy())
+
+        risk = analytics.get_churn_risk().set_index('user_id')
+        np.testing.assert_allclose(risk['churn_probability'], expected.loc[risk.index])
+
+    def test_next_day_rescores_everyone(self, make_analytics):
+        """A day later every subscriber's tenure moved, so no feature row can be reused"""
+        analytics = make_analytics()
+        subs = analytics._active_subscriptions()
+        today = build_churn_features(subs.assign(reference=analytics._churn_reference()), analytics.scans)
+        tomorrow = build_churn_features(
+            subs.assign(reference=analytics._churn_reference() + pd.Timedelta(days=1)), analytics.scans)
+        changed = (today != tomorrow).any(axis=1)
+        assert changed.all()
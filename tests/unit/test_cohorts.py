@@ -0,0 +1,122 @@
+"""
+Unit tests for cohort retention
+
+Run with: pytest tests/unit/test_cohorts.py
+"""
+import pandas as pd
+import pytest
+
+from src.core.cohorts import CohortCube
+
+
+def reference_cohort_analysis(users, scans):
+    """The original merge + Period-subtraction implementation"""
+    users = users.assign(cohort=users['signup_date'].dt.to_period('M'))
+    user_scans = scans.merge(users[['user_id', 'cohort']], on='user_id')
+    user_scans['scan_month'] = user_scans['scan_date'].dt.to_period('M')
+    user_scans['months_since_signup'] = (
+        (user_scans['scan_month'] - user_scans['cohort']).apply(lambda x: x.n)
+    )
+    cohort_data = user_scans.groupby(['cohort', 'months_since_signup'])['user_id'].nunique().reset_index()
+    cohort_pivot = cohort_data.pivot(index='cohort', columns='months_since_signup', values='user_id')
+    return cohort_pivot.divide(cohort_pivot.iloc[:, 0], axis=0) * 100
+
+
+class TestCohortAnalysis:
+    """Vectorized cohort retention matches the merge-based reference"""
+
+    def test_matches_reference(self, make_analytics):
+        """Same cohorts, offsets and retention percentages"""
+        analytics = make_analytics()
+        expected = reference_cohort_analysis(analytics.users, analytics.scans)
+        pd.testing.assert_frame_equal(
+            analytics.get_cohort_analysis(), expected,
+            check_names=False, check_dtype=False, check_index_type=False, check_column_type=False
+        )
+
+    def test_filtered_snapshot(self, make_analytics):
+        """Also matches on a time-filtered snapshot"""
+        analytics = make_analytics(60)
+        expected = reference_cohort_analysis(analytics.users, analytics.scans)
+        pd.testing.assert_frame_equal(
+            analytics.get_cohort_analysis(), expected,
+            check_names=False, check_dtype=False, check_index_type=False, check_column_type=False
+        )
+
+    def test_does_not_mutate_users(self, make_analytics):
+        """Computing cohorts leaves the users table untouched"""
+        analytics = make_analytics()
+        columns = list(analytics.users.columns)
+        analytics.get_cohort_analysis()
+        assert list(analytics.users.columns) == columns
+
+
+def reference_plan(subscriptions, user_id):
+    """Plan of the user's earliest subscription, 'free' if none"""
+    subs = subscriptions[subscriptions['user_id'] == user_id]
+    if len(subs) == 0:
+        return 'free'
+    return subs.sort_values('subscription_start').iloc[0]['plan_type']
+
+
+class TestCohortCube:
+    """Cube slices roll up to the plain cohort matrix; plan is the one each user first converted to"""
+
+    def test_rollup_counts_match_cohort_matrix(self, make_analytics):
+        """The unfiltered monthly cube counts the same users per cell as get_cohort_analysis()"""
+        analytics = make_analytics()
+        cohorts, offsets, counts = analytics.cohort_matrix().cells()
+        expected = pd.Series(counts, index=pd.MultiIndex.from_arrays([cohorts, offsets]))
+        actual = analytics.cohort_cube('month').slice().set_index(['cohort', 'offset'])['users']
+        pd.testing.assert_series_equal(actual.sort_index(), expected.sort_index(),
+                                       check_names=False, check_dtype=False)
+
+    def test_plan_slices_are_additive(self, make_analytics):
+        """Users per cell summed over plans equals the unfiltered count"""
+        cube = make_analytics().cohort_cube('week')
+        total = cube.slice().set_index(['cohort', 'offset'])['users']
+        by_plan = sum(
+            cube.slice(plan_type=plan).set_index(['cohort', 'offset'])['users'].reindex(total.index, fill_value=0)
+            for plan in cube.values('plan_type')
+        )
+        pd.testing.assert_series_equal(by_plan, total, check_names=False)
+
+    def test_plan_is_first_conversion(self, make_analytics):
+        """Each (user, month) is counted under the plan the user first converted to"""
+        analytics = make_analytics()
+        scans, users, subs = analytics.scans, analytics.users, analytics.subscriptions
+        signup = users.set_index('user_id')['signup_date'].dt.to_period('M')
+        active = scans.assign(month=scans['scan_date'].dt.to_period('M'))[['user_id', 'month']].drop_duplicates()
+        active['cohort'] = active['user_id'].map(signup)
+        active['offset'] = [(m - c).n for m, c in zip(active['month'], active['cohort'])]
+        plans = {u: reference_plan(subs, u) for u in active['user_id'].unique()}
+        active['plan_type'] = active['user_id'].map(plans)
+        expected = active.groupby(['offset', 'plan_type']).size()
+
+        cells = analytics.cohort_cube('month').cells
+        actual = cells.groupby(['offset', cells['plan_type'].astype(str)])['users'].sum()
+        pd.testing.assert_series_equal(actual, expected, check_names=False, check_index_type=False)
+
+    def test_plan_change_keeps_first_plan(self, make_analytics):
+        """A user who switches plans stays in the slice of their first plan"""
+        analytics = make_analytics()
+        subs = analytics.subscriptions
+        switchers = subs.groupby('user_id')['plan_type'].nunique()
+        user_id = switchers[switchers > 1].index[0]
+        user_subs = subs[subs['user_id'] == user_id].sort_values('subscription_start')
+        scans = pd.DataFrame({
+            'user_id': user_id,
+            'scan_date': user_subs['subscription_start'] + pd.Timedelta(hours=1),
+        })
+        users = analytics.users[analytics.users['user_id'] == user_id]
+        cube = CohortCube.build(users, scans, subs, granularity='day', dimensions=('plan_type',))
+        assert set(cube.cells['plan_type'].astype(str)) == {user_subs['plan_type'].iloc[0]}
+
+    @pytest.mark.parametrize('granularity', ['day', 'week', 'month'])
+    def test_slices_within_cohort(self, make_analytics, granularity):
+        """Every slice stays at or below 100% and has no all-NaN cohort rows"""
+        cube = make_analytics().cohort_cube(granularity)
+        for plan in [None] + cube.values('plan_type'):
+            retention = cube.retention(plan_type=plan)
+            assert (retention.fillna(0) <= 100 + 1e-9).all().all(), plan
+            assert not retention.isna().all(axis=1).any(), plan
@@ -0,0 +1,45 @@
+"""
+Unit tests for the batch compute() API
+
+Run with: pytest tests/unit/test_compute.py
+"""
+import pytest
+
+from src.core.analytics import SaaSAnalytics
+
+
+class TestCompute:
+    """compute() must return exactly what the individual getters return"""
+
+    def test_matches_individual_getters(self, make_analytics):
+        """Every registered metric equals a fresh snapshot's getter"""
+        batch = make_analytics().compute(list(SaaSAnalytics.METRICS), period_days=14, days=7)
+        reference = make_analytics()
+        expected = {
+            'current_mrr': reference.get_current_mrr(),
+            'period_total_revenue': reference.get_period_total_revenue(),
+            'mrr_growth_rate': reference.get_mrr_growth_rate(7),
+            'arpu': reference.get_arpu(),
+            'churn_rate': reference.get_churn_rate(14),
+            'conversion_rate': reference.get_conversion_rate(),
+            'cac': reference.get_cac(),
+            'ltv': reference.get_ltv(),
+            'ltv_cac_ratio': reference.get_ltv_cac_ratio(),
+            'active_users': reference.get_active_users('daily'),
+            'avg_match_rate': reference.get_avg_match_rate(),
+            'avg_scans_per_user': reference.get_avg_scans_per_user(),
+            'total_users': len(reference.users),
+            'total_scans': len(reference.scans),
+        }
+        for name, value in expected.items():
+            assert batch[name] == pytest.approx(value), name
+
+    def test_order_and_duplicates(self, make_analytics):
+        """Requested order is kept and duplicate names are computed once"""
+        result = make_analytics().compute(['arpu', 'cac', 'arpu'])
+        assert list(result) == ['arpu', 'cac']
+
+    def test_unknown_metric(self, make_analytics):
+        """Unknown names are rejected before any work is done"""
+        with pytest.raises(ValueError):
+            make_analytics().compute(['arpu', 'not_a_metric'])
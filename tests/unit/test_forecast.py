@@ -0,0 +1,152 @@
+"""
+Unit tests for the vectorized exponential-smoothing forecasts
+
+Run with: pytest tests/unit/test_forecast.py
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import forecast
+from src.core.forecast import ExponentialSmoothing, fitted_model
+
+
+def reference_run(values, params, m):
+    """Scalar Holt-Winters recursion for one parameter set"""
+    alpha, beta, gamma, phi = params
+    level, trend, seasonal = ExponentialSmoothing._initial_state(values, m)
+    seasonal = np.array(seasonal, dtype=float)
+    sse = 0.0
+    for t, value in enumerate(values):
+        season = seasonal[t % m]
+        error = value - (level + phi * trend + season)
+        sse += error ** 2
+        level, trend = level + phi * trend + alpha * error, phi * trend + alpha * beta * error
+        seasonal[t % m] = season + gamma * error
+    return level, trend, seasonal, sse
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(11)
+    days = np.arange(70)
+    return 100 + 0.8 * days + 6 * np.sin(2 * np.pi * days / 7) + rng.normal(0, 1.5, len(days))
+
+
+@pytest.fixture(autouse=True)
+def empty_model_store(monkeypatch):
+    """Each test starts without models shared from other tests"""
+    monkeypatch.setattr(forecast, '_FITTED', OrderedDict())
+
+
+class TestExponentialSmoothing:
+    """The one-pass grid search matches per-parameter scalar runs"""
+
+    def test_fit_picks_grid_minimum(self, series):
+        """Chosen parameters have the smallest scalar SSE on the grid"""
+        model = ExponentialSmoothing.fit(series)
+        grid_sse = [reference_run(series, params, 7)[3] for params in zip(*forecast._grid())]
+        assert model.sse == pytest.approx(min(grid_sse))
+
+        level, trend, seasonal, sse = reference_run(series, model.params, 7)
+        assert model.level == pytest.approx(level)
+        assert model.trend == pytest.approx(trend)
+        np.testing.assert_allclose(model.seasonal, seasonal)
+
+    def test_update_equals_full_run(self, series):
+        """Fit on a prefix then update = the same parameters run over the whole series"""
+        model = ExponentialSmoothing.fit(series[:60]).update(series[60:])
+        level, trend, seasonal, sse = reference_run(series, model.params, 7)
+        assert model.level == pytest.approx(level)
+        assert model.trend == pytest.approx(trend)
+        np.testing.assert_allclose(model.seasonal, seasonal)
+        assert model.sse == pytest.approx(sse)
+        assert (model.n_seen, model.updates_since_fit) == (70, 10)
+
+    def test_short_history(self):
+        """Below two seasons there is no seasonal term; under 3 days is rejected"""
+        assert ExponentialSmoothing.fit([1.0, 2.0, 3.0, 4.0]).season_length == 1
+        with pytest.raises(ValueError):
+            ExponentialSmoothing.fit([1.0, 2.0])
+
+    def test_forecast_band(self, series):
+        """Point forecast follows the damped trend; the band widens with the horizon"""
+        model = ExponentialSmoothing.fit(series)
+        point, lower, upper = model.forecast(14)
+        alpha, beta, gamma, phi = model.params
+        h = np.arange(1, 15)
+        expected = model.level + np.cumsum(phi ** h) * model.trend + model.seasonal[(70 + h - 1) % 7]
+        np.testing.assert_allclose(point, expected)
+        assert (np.diff(upper - lower) >= -1e-9).all()
+        assert (lower < point).all() and (point < upper).all()
+
+
+class TestFittedModel:
+    """Models are extended over new days instead of refitted"""
+
+    def test_incremental_update(self, series):
+        """A longer history with the same prefix advances the stored model"""
+        first = fitted_model('mrr', series[:60])
+        extended = fitted_model('mrr', series)
+        assert extended.params == first.params
+        assert extended.updates_since_fit == 10
+        assert first.n_seen == 60  # the stored model is copied, not mutated
+        assert fitted_model('mrr', series) is extended
+
+    def test_changed_history_refits(self, series):
+        """Edited past values trigger a new grid search"""
+        fitted_model('mrr', series[:60])
+        edited = series.copy()
+        edited[5] += 50
+        assert fitted_model('mrr', edited).updates_since_fit == 0
+
+    def test_refit_after_many_days(self, series):
+        """REFIT_AFTER_DAYS of incremental updates trigger a refit"""
+        fitted_model('mrr', series[:30])
+        assert fitted_model('mrr', series[:30 + forecast.REFIT_AFTER_DAYS]).updates_since_fit == 0
+
+    def test_store_is_bounded_lru(self, series, monkeypatch):
+        """Above _MAX_FITTED the least recently used series is evicted"""
+        monkeypatch.setattr(forecast, '_MAX_FITTED', 2)
+        fitted_model('a', series)
+        fitted_model('b', series)
+        fitted_model('a', series)  # touch a
+        fitted_model('c', series)
+        assert list(forecast._FITTED) == ['a', 'c']
+
+    def test_concurrent_sessions(self, series, monkeypatch):
+        """Threads sharing the store see consistent models and never exceed the bound"""
+        monkeypatch.setattr(forecast, '_MAX_FITTED', 4)
+        calls = [(f'metric_{i % 6}', 60 + i % 3) for i in range(48)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            models = list(pool.map(lambda call: fitted_model(call[0], series[:call[1]]), calls))
+        assert len(forecast._FITTED) <= 4
+        assert [model.n_seen for model in models] == [days for _, days in calls]
+
+
+class TestGetForecast:
+    """Analytics forecasts start the day after the snapshot"""
+
+    def test_signup_history(self, make_analytics):
+        """Signup history is the daily signup count over the timeline"""
+        analytics = make_analytics()
+        history = analytics._forecast_history('signups')
+        counts = analytics.users['signup_date'].dt.normalize().value_counts()
+        np.testing.assert_array_equal(history, counts.reindex(history.index, fill_value=0))
+
+    def test_forecast_frame(self, make_analytics):
+        """Dates continue the timeline; values are non-negative"""
+        analytics = make_analytics()
+        result = analytics.get_forecast('mrr', horizon=10)
+        assert result.index[0] == analytics._series_timeline()[-1] + pd.Timedelta(days=1)
+        assert len(result) == 10
+        assert (result >= 0).all().all()
+        assert (result['lower'] <= result['forecast']).all() and (result['forecast'] <= result['upper']).all()
+
+    def test_unknown_metric(self, make_analytics):
+        """Only FORECAST_METRICS can be projected"""
+        with pytest.raises(ValueError):
+            make_analytics().get_forecast('churn')
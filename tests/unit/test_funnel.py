@@ -0,0 +1,91 @@
+"""
+Unit tests for conversion funnel metrics
+
+Run with: pytest tests/unit/test_funnel.py
+"""
+from datetime import timedelta
+
+import pytest
+
+
+def reference_stages(users, scans, subscriptions):
+    """Funnel stage counts with per-cohort isin() filters (original implementation)"""
+    user_ids = set(users['user_id'])
+    cohort_scans = scans[scans['user_id'].isin(user_ids)]
+    per_user = cohort_scans.groupby('user_id').size()
+    return (
+        len(user_ids),
+        cohort_scans['user_id'].nunique(),
+        int((per_user > 1).sum()),
+        len(subscriptions[subscriptions['user_id'].isin(user_ids)]),
+    )
+
+
+class TestConversionFunnel:
+    """Stage counts from the shared per-user vectors match per-cohort filters"""
+
+    def test_funnel_matches_reference(self, make_analytics):
+        """Whole-snapshot funnel stages"""
+        analytics = make_analytics()
+        funnel = analytics.get_conversion_funnel()
+        expected = reference_stages(analytics.users, analytics.scans, analytics.subscriptions)
+        assert list(funnel.iloc[:, 1]) == list(expected)
+
+    @pytest.mark.parametrize('time_range_days', [None, 90])
+    def test_trend_matches_reference(self, make_analytics, time_range_days):
+        """Recent (last 30 days) and previous (30-60 days) cohort rates"""
+        analytics = make_analytics(time_range_days)
+        users = analytics.users
+        latest = users['signup_date'].max()
+        recent = users[users['signup_date'] > latest - timedelta(days=30)]
+        previous = users[(users['signup_date'] <= latest - timedelta(days=30)) &
+                         (users['signup_date'] > latest - timedelta(days=60))]
+
+        trend = analytics.get_conversion_funnel_trend()
+        for key, cohort in (('recent', recent), ('previous', previous)):
+            total, with_scan, multiple, paid = reference_stages(cohort, analytics.scans, analytics.subscriptions)
+            assert trend[f'{key}_cohort_size'] == total
+            stages = trend['conversion_stages']
+            assert stages['signup_to_first_scan'][f'{key}_rate'] == pytest.approx(with_scan / total * 100)
+            assert stages['first_to_second_scan'][f'{key}_rate'] == pytest.approx(multiple / with_scan * 100)
+            assert stages['second_scan_to_paid'][f'{key}_rate'] == pytest.approx(paid / multiple * 100)
+            assert stages['overall_conversion'][f'{key}_rate'] == pytest.approx(paid / total * 100)
+
+
+class TestConversionFunnelSeries:
+    """Every cohort (and rolling window) matches the reference stage counts"""
+
+    @pytest.mark.parametrize('granularity,freq', [('day', 'D'), ('week', 'W-SUN')])
+    def test_cohorts_match_reference(self, make_analytics, granularity, freq):
+        """Each signup cohort's stages equal the per-cohort filters"""
+        analytics = make_analytics()
+        series = analytics.get_conversion_funnel_series(granularity).set_index('cohort')
+        cohorts = analytics.users['signup_date'].dt.to_period(freq)
+        for cohort, users in analytics.users.groupby(cohorts):
+            row = series.loc[cohort]
+            expected = reference_stages(users, analytics.scans, analytics.subscriptions)
+            assert (row['signups'], row['with_scan'], row['with_multiple_scans'], row['paid']) == expected
+
+    def test_empty_cohorts_are_zero(self, make_analytics):
+        """Days without signups are present with zero counts and rates"""
+        series = make_analytics().get_conversion_funnel_series('day')
+        empty = series[series['signups'] == 0]
+        assert (empty[['with_scan', 'paid', 'overall_conversion']] == 0).all().all()
+
+    def test_rolling_window(self, make_analytics):
+        """window=4 pools the trailing four weekly cohorts"""
+        analytics = make_analytics()
+        single = analytics.get_conversion_funnel_series('week')
+        pooled = analytics.get_conversion_funnel_series('week', window=4)
+        expected = single['paid'].rolling(4, min_periods=1).sum()
+        assert list(pooled['paid']) == list(expected.astype(int))
+        rate = pooled['paid'] / pooled['signups'] * 100
+        assert pooled['overall_conversion'].to_numpy() == pytest.approx(rate.fillna(0).to_numpy())
+
+    def test_invalid_arguments(self, make_analytics):
+        """Unsupported granularity and window values are rejected"""
+        analytics = make_analytics()
+        with pytest.raises(ValueError):
+            analytics.get_conversion_funnel_series('month')
+        with pytest.raises(ValueError):
+            analytics.get_conversion_funnel_series('week', window=0)
@@ -0,0 +1,63 @@
+"""
+Unit tests for the per-job-title scan breakdown
+
+Run with: pytest tests/unit/test_job_titles.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def reference_breakdown(scans, keys):
+    """Per-group scan metrics with a pandas groupby"""
+    grouped = scans.groupby(keys)
+    return pd.DataFrame({
+        'scans': grouped.size(),
+        'users': grouped['user_id'].nunique(),
+        'paid_share': grouped['is_paid_user'].mean() * 100,
+        'avg_match_rate': grouped['match_rate'].mean(),
+        'match_rate_p50': grouped['match_rate'].quantile(0.5),
+        'match_rate_p90': grouped['match_rate'].quantile(0.9),
+        'avg_processing_time_ms': grouped['processing_time_ms'].mean(),
+        'processing_time_p90': grouped['processing_time_ms'].quantile(0.9),
+    })
+
+
+def assert_matches(result, expected):
+    for column in expected.columns:
+        np.testing.assert_allclose(result[column].to_numpy(dtype=float),
+                                   expected[column].to_numpy(dtype=float), err_msg=column)
+
+
+class TestJobTitleBreakdown:
+    """Bincount/sort summaries equal a pandas groupby"""
+
+    def test_whole_window(self, make_analytics):
+        """One row per title, most scanned first"""
+        analytics = make_analytics()
+        result = analytics.get_job_title_breakdown()
+        assert result['scans'].is_monotonic_decreasing
+        expected = reference_breakdown(analytics.scans, 'job_title').loc[result['job_title']]
+        assert_matches(result, expected)
+
+    @pytest.mark.parametrize('granularity,freq', [('week', 'W-SUN'), ('month', 'M')])
+    def test_periods(self, make_analytics, granularity, freq):
+        """Period x title groups"""
+        analytics = make_analytics()
+        result = analytics.get_job_title_breakdown(granularity)
+        scans = analytics.scans.assign(period=analytics.scans['scan_date'].dt.to_period(freq))
+        expected = reference_breakdown(scans, ['period', 'job_title'])
+        keys = list(zip(result['period'].dt.start_time, result['job_title']))
+        expected.index = [(period.start_time, title) for period, title in expected.index]
+        assert_matches(result, expected.loc[keys])
+        assert len(result) == len(expected)
+
+    def test_window_and_percentiles(self, make_analytics):
+        """Inclusive date window and custom percentiles"""
+        analytics = make_analytics()
+        result = analytics.get_job_title_breakdown(start='2024-03-01', end='2024-03-31', percentiles=(25,))
+        day = analytics.scans['scan_date'].dt.normalize()
+        scans = analytics.scans[(day >= '2024-03-01') & (day <= '2024-03-31')]
+        expected = scans.groupby('job_title')['match_rate'].quantile(0.25).loc[result['job_title']]
+        np.testing.assert_allclose(result['match_rate_p25'], expected)
+        assert result['scans'].sum() == len(scans)
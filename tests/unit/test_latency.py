@@ -0,0 +1,82 @@
+"""
+Unit tests for the scan latency SLO report and its anomaly checks
+
+Run with: pytest tests/unit/test_latency.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import config
+
+
+def reference_report(scans, keys, slo_ms):
+    """Per-group latency percentiles and breaches with a pandas groupby"""
+    scans = scans.assign(breached=scans['processing_time_ms'] > slo_ms,
+                         minute=scans['scan_date'].dt.floor('min'))
+    grouped = scans.groupby(keys)
+    return pd.DataFrame({
+        'scans': grouped.size(),
+        'p50_ms': grouped['processing_time_ms'].quantile(0.5),
+        'p95_ms': grouped['processing_time_ms'].quantile(0.95),
+        'p99_ms': grouped['processing_time_ms'].quantile(0.99),
+        'breaches': grouped['breached'].sum(),
+        'breach_rate': grouped['breached'].mean() * 100,
+        'breach_minutes': scans[scans['breached']].groupby(keys)['minute'].nunique(),
+    }).fillna({'breach_minutes': 0})
+
+
+def latency_anomalies(analytics):
+    return {anomaly['metric'] for anomaly in analytics.detect_anomalies()} & {'Scan Latency p95', 'Latency SLO Breaches'}
+
+
+class TestLatencyReport:
+    """One grouped pass equals a pandas groupby"""
+
+    def test_by_title_and_tier(self, make_analytics):
+        """Whole window per job title and paid/free tier"""
+        analytics = make_analytics()
+        result = analytics.get_latency_report(granularity=None, slo_ms=1500)
+        scans = analytics.scans.assign(tier=np.where(analytics.scans['is_paid_user'], 'paid', 'free'))
+        expected = reference_report(scans, ['job_title', 'tier'], 1500)
+        expected = expected.loc[list(zip(result['job_title'], result['tier']))]
+        for column in expected.columns:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float), err_msg=column)
+
+    def test_daily_overall(self, make_analytics):
+        """One row per scan day without dimensions"""
+        analytics = make_analytics()
+        result = analytics.get_latency_report(by=(), slo_ms=2000)
+        scans = analytics.scans.assign(day=analytics.scans['scan_date'].dt.normalize())
+        expected = reference_report(scans, 'day', 2000)
+        np.testing.assert_array_equal(result['period'].dt.start_time, expected.index)
+        np.testing.assert_array_equal(result['breach_minutes'], expected['breach_minutes'])
+        np.testing.assert_allclose(result['p95_ms'], expected['p95_ms'])
+
+    def test_unknown_dimension(self, make_analytics):
+        """Only LATENCY_DIMENSIONS are accepted"""
+        with pytest.raises(ValueError):
+            make_analytics().get_latency_report(by=('country',))
+
+
+class TestLatencyAnomalies:
+    """p95 and breach-rate checks each apply their own min_scans gate"""
+
+    @pytest.fixture
+    def alerting(self, monkeypatch):
+        """Thresholds every snapshot exceeds"""
+        monkeypatch.setitem(config.THRESHOLDS, 'latency_p95_ms', {'warning': 0, 'critical': 1e9, 'min_scans': 0})
+        monkeypatch.setitem(config.THRESHOLDS, 'slo_breach_rate', {'warning': 0, 'critical': 1.0, 'min_scans': 0})
+
+    def test_both_checks_fire(self, make_analytics, alerting):
+        assert latency_anomalies(make_analytics()) == {'Scan Latency p95', 'Latency SLO Breaches'}
+
+    def test_breach_gate_is_independent(self, make_analytics, alerting, monkeypatch):
+        """A p95 gate the window misses no longer hides breach alerts, and vice versa"""
+        monkeypatch.setitem(config.THRESHOLDS['latency_p95_ms'], 'min_scans', 10**9)
+        assert latency_anomalies(make_analytics()) == {'Latency SLO Breaches'}
+
+        monkeypatch.setitem(config.THRESHOLDS['latency_p95_ms'], 'min_scans', 0)
+        monkeypatch.setitem(config.THRESHOLDS['slo_breach_rate'], 'min_scans', 10**9)
+        assert latency_anomalies(make_analytics()) == {'Scan Latency p95'}
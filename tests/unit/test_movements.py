@@ -0,0 +1,138 @@
+"""
+Unit tests for MRR movements, the MRR waterfall and net revenue retention
+
+Run with: pytest tests/unit/test_movements.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.movements import MOVEMENT_TYPES, MRRMovements
+
+
+def reference_user_mrr(analytics):
+    """Per-user MRR on each timeline day, one active mask per day"""
+    subs = analytics.subscriptions
+    columns = {}
+    for day in analytics._series_timeline():
+        active = subs[(subs['subscription_start'] <= day) &
+                      (subs['subscription_end'].isna() | (subs['subscription_end'] > day))]
+        columns[day] = active.groupby('user_id')['mrr'].sum()
+    return pd.DataFrame(columns).reindex(subs['user_id'].unique()).fillna(0.0).round(6)
+
+
+def reference_movements(user_mrr):
+    """Classify each user's day-over-day MRR change"""
+    after = user_mrr.to_numpy()
+    before = np.hstack([np.zeros((len(after), 1)), after[:, :-1]])
+    had_paid = np.hstack([np.zeros((len(after), 1), dtype=bool),
+                          np.maximum.accumulate(after > 0, axis=1)[:, :-1]])
+    delta = after - before
+    kinds = {
+        'new': (before == 0) & (after > 0) & ~had_paid,
+        'reactivation': (before == 0) & (after > 0) & had_paid,
+        'expansion': (before > 0) & (after > before),
+        'contraction': (before > 0) & (after > 0) & (after < before),
+        'churn': (before > 0) & (after == 0),
+    }
+    return pd.DataFrame({kind: np.where(mask, delta, 0).sum(axis=0) for kind, mask in kinds.items()},
+                        index=user_mrr.columns)
+
+
+class TestMRRMovements:
+    """Daily components match a per-user day-by-day classification"""
+
+    @pytest.fixture
+    def analytics(self, make_analytics):
+        return make_analytics()
+
+    @pytest.fixture
+    def user_mrr(self, analytics):
+        return reference_user_mrr(analytics)
+
+    def test_daily_components(self, analytics, user_mrr):
+        """Every movement type on every day"""
+        daily = analytics.get_mrr_movements()
+        expected = reference_movements(user_mrr)
+        for kind in MOVEMENT_TYPES:
+            np.testing.assert_allclose(daily[kind], expected[kind], atol=1e-6, err_msg=kind)
+        assert (daily['contraction'] <= 0).all() and (daily['churn'] <= 0).all()
+
+    def test_mrr_matches_series(self, analytics, user_mrr):
+        """Running net change equals total active MRR each day"""
+        daily = analytics.get_mrr_movements()
+        np.testing.assert_allclose(daily['mrr'], user_mrr.sum(axis=0), atol=1e-6)
+        np.testing.assert_allclose(daily['mrr'], analytics.series('mrr'), atol=1e-6)
+
+    def test_monthly_rollup(self, analytics):
+        """Monthly components sum the days; mrr is the month-end value"""
+        daily = analytics.get_mrr_movements()
+        monthly = analytics.get_mrr_movements('month')
+        months = daily.index.to_period('M')
+        np.testing.assert_allclose(monthly['new'], daily['new'].groupby(months).sum())
+        np.testing.assert_allclose(monthly['mrr'], daily['mrr'].groupby(months).last())
+
+    def test_unknown_granularity(self, analytics):
+        """Unsupported granularities are rejected"""
+        with pytest.raises(ValueError):
+            analytics.get_mrr_movements('quarter')
+
+
+    def test_upgrade_downgrade_and_return(self):
+        """Same-day plan switches are expansion / contraction; a comeback is reactivation"""
+        timeline = pd.date_range('2024-01-01', periods=10, freq='D')
+        starts = pd.to_datetime(['2024-01-02', '2024-01-04', '2024-01-06', '2024-01-09', '2024-01-03'])
+        ends = pd.to_datetime(['2024-01-04', '2024-01-06', '2024-01-07', None, None])
+        movements = MRRMovements.build(['u', 'u', 'u', 'u', 'v'], starts, ends,
+                                       [30.0, 50.0, 10.0, 20.0, 40.0], timeline).daily()
+        day = lambda d: movements.loc[pd.Timestamp(f'2024-01-{d:02d}')]
+
+        assert day(2)['new'] == 30 and day(3)['new'] == 40
+        assert day(4)['expansion'] == 20
+        assert day(6)['contraction'] == -40
+        assert day(7)['churn'] == -10
+        assert day(9)['reactivation'] == 20
+        assert movements['mrr'].iloc[-1] == 60
+
+
+class TestMRRWaterfall:
+    """The bridge starts and ends at the MRR on the window edges"""
+
+    def test_window(self, make_analytics):
+        """Components telescope from starting to ending MRR"""
+        analytics = make_analytics()
+        user_mrr = reference_user_mrr(analytics).sum(axis=0)
+        waterfall = analytics.get_mrr_waterfall('2024-03-01', '2024-04-30')
+
+        assert waterfall['starting_mrr'] == pytest.approx(user_mrr[pd.Timestamp('2024-02-29')])
+        assert waterfall['ending_mrr'] == pytest.approx(user_mrr[pd.Timestamp('2024-04-30')])
+        parts = sum(waterfall[kind] for kind in MOVEMENT_TYPES)
+        assert parts == pytest.approx(waterfall['net_change'])
+
+    def test_full_range(self, make_analytics):
+        """Without bounds the bridge starts at zero"""
+        analytics = make_analytics()
+        waterfall = analytics.get_mrr_waterfall()
+        assert waterfall['starting_mrr'] == 0
+        assert waterfall['ending_mrr'] == pytest.approx(analytics.series('mrr').iloc[-1])
+
+
+class TestNetRevenueRetention:
+    """Cohort MRR relative to the end of the cohort's first paid month"""
+
+    def test_matches_reference(self, make_analytics):
+        """Per-cohort month-end MRR ratios"""
+        analytics = make_analytics()
+        user_mrr = reference_user_mrr(analytics)
+        first_paid = (user_mrr > 0).idxmax(axis=1)[(user_mrr > 0).any(axis=1)]
+        cohorts = first_paid.dt.to_period('M')
+        month_ends = user_mrr.columns.to_series().groupby(user_mrr.columns.to_period('M')).max()
+
+        nrr = analytics.get_net_revenue_retention()
+        assert list(nrr.index) == sorted(cohorts.unique())
+        for cohort in nrr.index:
+            members = user_mrr.loc[cohorts.index[cohorts == cohort]]
+            cohort_mrr = members[month_ends[month_ends.index >= cohort]].sum(axis=0).to_numpy()
+            expected = cohort_mrr / cohort_mrr[0] * 100
+            np.testing.assert_allclose(nrr.loc[cohort].to_numpy()[:len(expected)], expected, rtol=1e-9)
+            assert nrr.loc[cohort].iloc[len(expected):].isna().all()
@@ -0,0 +1,62 @@
+"""
+Unit tests for per-day quantile sketches and the daily checker's tail metrics
+
+Run with: pytest tests/unit/test_quantiles.py
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from daily_anomaly_checker import DailyAnomalyChecker
+
+
+class TestScanPercentiles:
+    """Sketch percentiles stay within each metric's bucket accuracy"""
+
+    @pytest.mark.parametrize('metric,rel,abs_', [
+        ('match_rate', 0, 0.05), ('processing_time_ms', 0.01, 0), ('keywords_extracted', 0, 0),
+    ])
+    @pytest.mark.parametrize('days', [None, 1, 30])
+    def test_matches_exact_quantiles(self, make_analytics, metric, rel, abs_, days):
+        """Nearest-rank percentiles of the scans in the window"""
+        analytics = make_analytics()
+        scan_days = analytics.scans['scan_date'].dt.normalize()
+        values = analytics.scans[metric]
+        if days is not None:
+            values = values[scan_days > scan_days.max() - pd.Timedelta(days=days)]
+
+        result = analytics.get_scan_percentiles(metric, days=days)
+        expected = np.quantile(values, [0.5, 0.9, 0.99], method='inverted_cdf')
+        for value, exact in zip(result.values(), expected):
+            assert value == pytest.approx(exact, rel=rel, abs=abs_ + 1e-9)
+
+    def test_empty_window_is_nan(self, make_analytics):
+        """A window without scans returns NaN percentiles"""
+        result = make_analytics().get_scan_percentiles('match_rate', days=7, end_date='2020-01-01')
+        assert all(np.isnan(value) for value in result.values())
+
+    def test_unknown_metric(self, make_analytics):
+        """Columns without a sketch are rejected"""
+        with pytest.raises(ValueError):
+            make_analytics().get_scan_percentiles('user_id')
+
+
+class TestCheckerTailMetrics:
+    """The checker's report stays valid JSON when a day has no values"""
+
+    def make_checker(self, analytics):
+        checker = DailyAnomalyChecker.__new__(DailyAnomalyChecker)
+        checker.analytics = analytics
+        return checker
+
+    def test_empty_day_is_none(self, make_analytics, raw_data):
+        """NaN percentiles become None and serialize as null"""
+        scans = raw_data['scans'].assign(processing_time_ms=np.nan)
+        checker = self.make_checker(make_analytics(data=dict(raw_data, scans=scans)))
+
+        tail = checker._tail_metrics()
+        assert all(value is None for value in tail['processing_time_ms'].values())
+        assert all(value is not None for value in tail['match_rate'].values())
+        json.dumps(tail, allow_nan=False)
@@ -0,0 +1,65 @@
+"""
+Unit tests for rebuilding and reconciling the revenue table
+
+Run with: pytest tests/unit/test_reconcile.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.reconcile import REVENUE_COLUMNS
+from tests.unit.conftest import build_revenue
+
+
+class TestRebuildRevenue:
+    """The event-sweep rebuild matches the per-day definition"""
+
+    def test_matches_reference(self, make_analytics, raw_data):
+        """Every revenue column on every day, including days with subscription edges"""
+        analytics = make_analytics()
+        dates = pd.date_range('2023-12-30', '2024-07-05', freq='D')
+        rebuilt = analytics.rebuild_revenue(dates)
+        expected = build_revenue(raw_data['subscriptions'], dates)
+        for column in REVENUE_COLUMNS:
+            np.testing.assert_allclose(rebuilt[column], expected[column], err_msg=column)
+
+    def test_agrees_with_series(self, make_analytics):
+        """Rebuilt MRR is the mrr series on the same days"""
+        analytics = make_analytics()
+        mrr = analytics.series('mrr')
+        np.testing.assert_allclose(analytics.rebuild_revenue(mrr.index)['mrr'], mrr)
+
+
+class TestReconcileRevenue:
+    """Mismatches, missing days and the unfiltered-snapshot requirement"""
+
+    def test_consistent_tables(self, make_analytics):
+        """Revenue built from the same subscriptions reconciles cleanly"""
+        assert make_analytics().reconcile_revenue().empty
+
+    def test_reports_mismatches(self, make_analytics, raw_data):
+        """Edited values and dropped days are reported"""
+        revenue = raw_data['revenue'].copy()
+        revenue.loc[10, 'mrr'] += 5
+        revenue.loc[20, 'new_subscriptions'] += 1
+        revenue = revenue.drop(index=30)
+        report = make_analytics(data=dict(raw_data, revenue=revenue)).reconcile_revenue()
+
+        dates = raw_data['revenue']['date']
+        assert set(zip(report['date'], report['column'])) == {
+            (dates[10], 'mrr'), (dates[20], 'new_subscriptions'), (dates[30], 'missing_day'),
+        }
+        assert report.loc[report['column'] == 'mrr', 'difference'].iloc[0] == pytest.approx(5)
+
+    def test_tolerance(self, make_analytics, raw_data):
+        """Money differences within the tolerance are accepted"""
+        revenue = raw_data['revenue'].copy()
+        revenue.loc[10, 'mrr'] += 0.5
+        analytics = make_analytics(data=dict(raw_data, revenue=revenue))
+        assert len(analytics.reconcile_revenue()) == 1
+        assert analytics.reconcile_revenue(tolerance=1).empty
+
+    def test_needs_unfiltered_snapshot(self, make_analytics):
+        """Time-filtered snapshots are rejected"""
+        with pytest.raises(ValueError):
+            make_analytics(90).reconcile_revenue()
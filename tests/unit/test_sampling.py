@@ -0,0 +1,58 @@
+"""
+Unit tests for hash-based sampling and estimate()
+
+Run with: pytest tests/unit/test_sampling.py
+"""
+import pytest
+
+from src.core import config
+
+METRICS = ['total_users', 'total_scans', 'conversion_rate', 'avg_match_rate', 'current_mrr', 'churn_rate']
+
+
+@pytest.fixture
+def sampling_enabled(monkeypatch):
+    """Lower the size gate so the small test snapshot is sampled"""
+    monkeypatch.setattr(config, 'SAMPLE_MIN_SCANS', 0)
+
+
+class TestEstimate:
+    """Sampled estimates, their intervals and the size gate"""
+
+    def test_small_snapshot_is_exact(self, make_analytics):
+        """Below SAMPLE_MIN_SCANS estimate() returns compute() values without sampling"""
+        analytics = make_analytics()
+        assert len(analytics.scans) < config.SAMPLE_MIN_SCANS
+        result = analytics.estimate(METRICS)
+        exact = make_analytics().compute(METRICS)
+        for name in METRICS:
+            assert result[name]['approximate'] is False
+            assert result[name]['value'] == pytest.approx(exact[name])
+        assert ('sample', config.SAMPLE_RATE) not in analytics.__dict__.get('_snapshot_cache', {})
+
+    def test_sampled_estimates_near_exact(self, make_analytics, sampling_enabled):
+        """Scaled counts and rates from a 50% sample land near the exact values"""
+        analytics = make_analytics()
+        result = analytics.estimate(METRICS, sample_rate=0.5)
+        exact = make_analytics().compute(METRICS)
+        assert result['current_mrr']['approximate'] is False
+        assert result['current_mrr']['value'] == exact['current_mrr']
+        for name in ('total_users', 'total_scans', 'conversion_rate', 'avg_match_rate'):
+            assert result[name]['approximate'] is True
+            assert result[name]['ci_low'] <= result[name]['value'] <= result[name]['ci_high']
+            assert result[name]['value'] == pytest.approx(exact[name], rel=0.2)
+
+    def test_full_rate_is_exact(self, make_analytics, sampling_enabled):
+        """sample_rate=1 skips sampling even above the gate"""
+        result = make_analytics().estimate(['total_users'], sample_rate=1)
+        assert result['total_users']['approximate'] is False
+
+    def test_sample_is_stable(self, make_analytics, sampling_enabled):
+        """The same users are sampled in every snapshot, smaller rates are subsets"""
+        small, _ = make_analytics().sample(0.2)
+        large, replicates = make_analytics().sample(0.4)
+        again, _ = make_analytics().sample(0.2)
+        assert set(small.users['user_id']) == set(again.users['user_id'])
+        assert set(small.users['user_id']) <= set(large.users['user_id'])
+        assert sum(len(r.users) for r in replicates) == len(large.users)
+        assert set(large.scans['user_id']) <= set(large.users['user_id'])
@@ -0,0 +1,80 @@
+"""
+Unit tests for the what-if scenario grid
+
+Run with: pytest tests/unit/test_scenarios.py
+"""
+import numpy as np
+import pytest
+
+from src.core.scenarios import LTV_CAP_MONTHS, SCENARIO_METRICS, ScenarioGrid
+
+BASE = dict(arpu=40.0, monthly_churn=0.08, conversion_rate=0.12, paid_subscribers=500, monthly_signups=900)
+
+
+def reference_scenario(arpu, monthly_churn, conversion_rate, paid_subscribers, monthly_signups, horizon_months):
+    """One scenario stepped month by month"""
+    lifetime = min(1 / monthly_churn, LTV_CAP_MONTHS) if monthly_churn > 0 else LTV_CAP_MONTHS
+    paid, revenue = float(paid_subscribers), 0.0
+    for _ in range(horizon_months):
+        paid = paid * (1 - monthly_churn) + monthly_signups * conversion_rate
+        revenue += arpu * paid
+    return {'ltv': arpu * lifetime, 'paid_subscribers': paid, 'mrr': arpu * paid, 'revenue': revenue}
+
+
+class TestScenarioGrid:
+    """The broadcast grid equals evaluating each scenario on its own"""
+
+    def test_broadcast_equals_loop(self):
+        """Every metric in every cell"""
+        levers = dict(churn_reductions=[0, 0.2, 0.5, 1.0], arpu_uplifts=[0, 0.1], conversion_uplifts=[0, 0.25, 0.5])
+        grid = ScenarioGrid.build(**BASE, **levers, horizon_months=6)
+        for i, churn_reduction in enumerate(levers['churn_reductions']):
+            for j, arpu_uplift in enumerate(levers['arpu_uplifts']):
+                for k, conversion_uplift in enumerate(levers['conversion_uplifts']):
+                    expected = reference_scenario(
+                        BASE['arpu'] * (1 + arpu_uplift), BASE['monthly_churn'] * (1 - churn_reduction),
+                        BASE['conversion_rate'] * (1 + conversion_uplift), BASE['paid_subscribers'],
+                        BASE['monthly_signups'], 6,
+                    )
+                    for metric in SCENARIO_METRICS:
+                        assert grid.values[metric][i, j, k] == pytest.approx(expected[metric]), metric
+
+    def test_surface_and_frame(self):
+        """A surface is a conversion slice; frame() has one row per scenario"""
+        grid = ScenarioGrid.build(**BASE, churn_reductions=[0, 0.1], arpu_uplifts=[0, 0.1, 0.2],
+                                  conversion_uplifts=[0, 0.3])
+        np.testing.assert_array_equal(grid.surface('mrr', 0.28).to_numpy(), grid.values['mrr'][:, :, 1])
+        assert len(grid.frame()) == len(grid) == 12
+
+    def test_ltv_cap(self):
+        """Rows past the cap are flat along churn and flagged"""
+        grid = ScenarioGrid.build(**dict(BASE, monthly_churn=0.04), churn_reductions=[0, 0.2, 0.4],
+                                  arpu_uplifts=[0], conversion_uplifts=[0])
+        np.testing.assert_array_equal(grid.ltv_capped(), [False, False, True])
+        assert grid.values['ltv'][2, 0, 0] == pytest.approx(BASE['arpu'] * LTV_CAP_MONTHS)
+
+    def test_invalid_inputs(self):
+        """Churn reductions outside [0, 1] and unknown metrics are rejected"""
+        with pytest.raises(ValueError):
+            ScenarioGrid.build(**BASE, churn_reductions=[1.5], arpu_uplifts=[0], conversion_uplifts=[0])
+        grid = ScenarioGrid.build(**BASE, churn_reductions=[0], arpu_uplifts=[0], conversion_uplifts=[0])
+        with pytest.raises(ValueError):
+            grid.surface('profit')
+
+
+class TestGetScenarioGrid:
+    """The snapshot grid starts from the same inputs as get_ltv"""
+
+    def test_zero_levers_equal_get_ltv(self, make_analytics):
+        """The no-change scenario reproduces today's LTV and paying base"""
+        analytics = make_analytics()
+        grid = analytics.get_scenario_grid()
+        assert grid.values['ltv'][0, 0, 0] == pytest.approx(analytics.get_ltv())
+        assert grid.base['paid_subscribers'] == (analytics.subscriptions['status'] == 'active').sum()
+        assert grid.base['monthly_churn'] == pytest.approx(analytics.get_churn_rate(30) / 100)
+
+    def test_custom_levers(self, make_analytics):
+        """Custom lever values define the axes"""
+        grid = make_analytics().get_scenario_grid([0, 0.3], [0.1], [0, 0.2, 0.4], horizon_months=3)
+        assert grid.values['mrr'].shape == (2, 1, 3)
+        assert grid.base['horizon_months'] == 3
@@ -0,0 +1,70 @@
+"""
+Unit tests for the vectorized daily metric series()
+
+Run with: pytest tests/unit/test_series.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def reference_series(analytics, metric, window):
+    """One mask per day, the straightforward definition series() replaces"""
+    subs = analytics.subscriptions
+    users = analytics.users
+    scan_days = analytics.scans['scan_date'].dt.normalize()
+    values = []
+    for day in analytics.series(metric, window).index:
+        if metric == 'churn':
+            start = day - pd.Timedelta(days=window)
+            active = ((subs['subscription_start'] <= start) &
+                      (subs['subscription_end'].isna() | (subs['subscription_end'] > start))).sum()
+            churned = ((subs['subscription_end'] >= start) & (subs['subscription_end'] <= day)).sum()
+            values.append(churned / active * 100 if active else 0.0)
+        elif metric in ('mrr', 'arpu'):
+            active = subs[(subs['subscription_start'] <= day) &
+                          (subs['subscription_end'].isna() | (subs['subscription_end'] > day))]
+            if metric == 'mrr':
+                values.append(active['mrr'].sum())
+            else:
+                values.append(active['mrr'].mean() if len(active) else 0.0)
+        elif metric == 'conversion':
+            lower = day - pd.Timedelta(days=window) if window else pd.Timestamp.min
+            conversions = ((subs['subscription_start'] > lower) & (subs['subscription_start'] <= day)).sum()
+            signups = ((users['signup_date'] > lower) & (users['signup_date'] <= day)).sum()
+            values.append(conversions / signups * 100 if signups else 0.0)
+        else:  # active_users: scanned on one of the last `window` calendar days
+            in_window = (scan_days > day - pd.Timedelta(days=window)) & (scan_days <= day)
+            values.append(analytics.scans.loc[in_window.to_numpy(), 'user_id'].nunique())
+    return np.asarray(values, dtype=float)
+
+
+class TestSeries:
+    """series() must match the per-day mask definitions on every day"""
+
+    @pytest.mark.parametrize('metric,window', [
+        ('churn', 30), ('churn', 7), ('mrr', None), ('arpu', None),
+        ('conversion', None), ('conversion', 30), ('active_users', 1), ('active_users', 7),
+    ])
+    def test_matches_per_day_reference(self, make_analytics, metric, window):
+        """Every day equals the one-mask-per-day reference"""
+        analytics = make_analytics()
+        window = analytics.SERIES_DEFAULT_WINDOWS[metric] if window is None else window
+        result = analytics.series(metric, window)
+        np.testing.assert_allclose(result.to_numpy(dtype=float), reference_series(analytics, metric, window))
+
+    def test_last_values_match_getters(self, make_analytics):
+        """The last day agrees with the point-in-time getters"""
+        analytics = make_analytics()
+        assert analytics.series('churn', 30).iloc[-1] == pytest.approx(analytics.get_churn_rate(30))
+        assert analytics.series('mrr').iloc[-1] == pytest.approx(analytics.get_current_mrr())
+
+    def test_mrr_matches_revenue_table(self, make_analytics):
+        """Daily MRR reproduces the stored revenue table"""
+        analytics = make_analytics()
+        np.testing.assert_allclose(analytics.series('mrr').to_numpy(), analytics.revenue['mrr'].to_numpy())
+
+    def test_unknown_metric(self, make_analytics):
+        """Unknown metric names are rejected"""
+        with pytest.raises(ValueError):
+            make_analytics().series('not_a_metric')
@@ -0,0 +1,74 @@
+"""
+Unit tests for HyperLogLog user sketches and sketch-based active users
+
+Run with: pytest tests/unit/test_sketches.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.sketches import HyperLogLog
+
+
+class TestHyperLogLog:
+    """Distinct-count estimates stay within the documented error"""
+
+    def test_large_cardinality(self):
+        """100k distinct values are estimated within 3 standard errors"""
+        sketch = HyperLogLog(precision=12)
+        sketch.add(np.arange(100_000, dtype='int64'))
+        assert sketch.count() == pytest.approx(100_000, rel=3 * 0.016)
+
+    def test_duplicates_do_not_count(self):
+        """Adding the same values again does not change the estimate"""
+        sketch = HyperLogLog(precision=12)
+        values = np.arange(5_000, dtype='int64')
+        sketch.add(values)
+        first = sketch.count()
+        sketch.add(values)
+        assert sketch.count() == first
+
+    def test_merge_is_union(self):
+        """Merging two sketches estimates the size of the union"""
+        a, b = HyperLogLog(precision=12), HyperLogLog(precision=12)
+        a.add(np.arange(0, 30_000, dtype='int64'))
+        b.add(np.arange(20_000, 50_000, dtype='int64'))
+        assert a.merge(b).count() == pytest.approx(50_000, rel=3 * 0.016)
+
+
+class TestActiveUsers:
+    """Exact path keeps the rolling window; the sketch path counts calendar days"""
+
+    @pytest.mark.parametrize('days', [1, 7, 30, 90])
+    def test_exact_rolling_window(self, make_analytics, days):
+        """nunique() over scans after latest scan - days"""
+        analytics = make_analytics()
+        scans = analytics.scans
+        cutoff = scans['scan_date'].max() - pd.Timedelta(days=days)
+        expected = scans.loc[scans['scan_date'] > cutoff, 'user_id'].nunique()
+        assert analytics.get_active_users(days=days, exact=True) == expected
+
+    @pytest.mark.parametrize('days', [1, 7, 30, 90])
+    def test_sketch_close_to_calendar_days(self, make_analytics, days):
+        """Merged per-day sketches agree with the exact calendar-day count"""
+        analytics = make_analytics()
+        exact = analytics.get_active_users_exact(days)
+        assert analytics.get_active_users(days=days, exact=False) == pytest.approx(exact, rel=0.05)
+
+    def test_windows_differ_by_partial_day(self, make_analytics):
+        """The rolling window reaches into the day before the calendar window"""
+        analytics = make_analytics()
+        scans = analytics.scans
+        latest = scans['scan_date'].max()
+        assert latest != latest.normalize()  # the rolling window starts mid-day
+        rolling = set(scans.loc[scans['scan_date'] > latest - pd.Timedelta(days=1), 'user_id'])
+        calendar = set(scans.loc[scans['scan_date'] >= latest.normalize(), 'user_id'])
+        assert calendar <= rolling
+        assert analytics.get_active_users('daily', exact=True) == len(rolling)
+        assert analytics.get_active_users_exact(1) == len(calendar)
+
+    def test_calendar_count_matches_series(self, make_analytics):
+        """series('active_users') on the latest scan day uses the calendar-day window"""
+        analytics = make_analytics()
+        last_scan_day = analytics.scans['scan_date'].max().normalize()
+        assert analytics.series('active_users', 7).loc[last_scan_day] == analytics.get_active_users_exact(7)
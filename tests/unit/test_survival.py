@@ -0,0 +1,107 @@
+"""
+Unit tests for Kaplan-Meier survival curves and survival-based LTV
+
+Run with: pytest tests/unit/test_survival.py
+"""
+import numpy as np
+import pytest
+
+from src.core.survival import DAYS_PER_MONTH, SurvivalCurves
+
+
+def reference_km(durations, observed):
+    """Textbook Kaplan-Meier: one loop over distinct times"""
+    times = np.unique(durations)
+    survival, steps = 1.0, []
+    for t in times:
+        at_risk = (durations >= t).sum()
+        events = ((durations == t) & observed).sum()
+        survival *= 1 - events / at_risk
+        steps.append((t, at_risk, events, survival))
+    return np.array(steps)
+
+
+def reference_restricted_mean(steps, horizon):
+    """Area under a step curve up to the horizon"""
+    area, last_time, last_survival = 0.0, 0.0, 1.0
+    for t, _, _, s in steps:
+        if t >= horizon:
+            break
+        area += last_survival * (t - last_time)
+        last_time, last_survival = t, s
+    return area + last_survival * (horizon - last_time)
+
+
+class TestSurvivalCurves:
+    """Grouped one-pass fit matches a per-group textbook fit"""
+
+    @pytest.fixture
+    def sample(self):
+        rng = np.random.default_rng(3)
+        durations = np.round(rng.exponential(120, 400))
+        observed = rng.random(400) < 0.6
+        groups = rng.choice(['a', 'b', 'c'], 400)
+        return durations, observed, groups
+
+    def test_matches_reference_per_group(self, sample):
+        """Every group's steps equal the textbook estimate"""
+        durations, observed, groups = sample
+        curves = SurvivalCurves.fit(durations, observed, groups)
+        for label in ('a', 'b', 'c'):
+            in_group = groups == label
+            expected = reference_km(durations[in_group], observed[in_group])
+            curve = curves.curve(label)
+            np.testing.assert_allclose(curve['time_days'], expected[:, 0])
+            np.testing.assert_array_equal(curve['at_risk'], expected[:, 1])
+            np.testing.assert_array_equal(curve['events'], expected[:, 2])
+            np.testing.assert_allclose(curve['survival'], expected[:, 3])
+
+    def test_restricted_mean_and_median(self, sample):
+        """Area under the curve and median lifetime per group"""
+        durations, observed, groups = sample
+        curves = SurvivalCurves.fit(durations, observed, groups)
+        means = curves.restricted_mean(365)
+        medians = curves.median_lifetime()
+        for code, label in enumerate(curves.labels):
+            steps = reference_km(durations[groups == label], observed[groups == label])
+            assert means[code] == pytest.approx(reference_restricted_mean(steps, 365))
+            assert medians[code] == steps[steps[:, 3] <= 0.5][0, 0]
+
+    def test_all_censored(self):
+        """No churn keeps survival at 1 and the mean at the horizon"""
+        curves = SurvivalCurves.fit([10, 20, 30], [False, False, False])
+        assert (curves.curve()['survival'] == 1).all()
+        assert curves.restricted_mean(100)[0] == pytest.approx(100)
+        assert np.isnan(curves.median_lifetime()[0])
+
+    def test_unknown_group(self, sample):
+        """Asking for a missing group raises"""
+        with pytest.raises(ValueError):
+            SurvivalCurves.fit(*sample).curve('z')
+
+
+class TestSurvivalLTV:
+    """get_survival_ltv wires snapshot durations into the curves"""
+
+    def test_overall(self, make_analytics):
+        """Overall LTV = average MRR x restricted mean lifetime"""
+        analytics = make_analytics()
+        subs = analytics.subscriptions
+        end = analytics.revenue['date'].max()
+        durations = (subs['subscription_end'].fillna(end) - subs['subscription_start']).dt.total_seconds() / 86400
+        steps = reference_km(np.maximum(durations.to_numpy(), 0), subs['subscription_end'].notna().to_numpy())
+        expected_months = reference_restricted_mean(steps, 36 * DAYS_PER_MONTH) / DAYS_PER_MONTH
+
+        ltv = analytics.get_survival_ltv()
+        assert ltv['subscriptions'].iloc[0] == len(subs)
+        assert ltv['churned'].iloc[0] == subs['subscription_end'].notna().sum()
+        assert ltv['expected_lifetime_months'].iloc[0] == pytest.approx(expected_months)
+        assert ltv['ltv'].iloc[0] == pytest.approx(subs['mrr'].mean() * expected_months)
+
+    def test_by_plan(self, make_analytics):
+        """Per-plan rows cover every plan with its subscription count"""
+        analytics = make_analytics()
+        ltv = analytics.get_survival_ltv('plan_type').set_index('plan_type')
+        counts = analytics.subscriptions['plan_type'].value_counts()
+        np.testing.assert_array_equal(ltv['subscriptions'], counts.reindex(ltv.index))
+        np.testing.assert_allclose(ltv['avg_mrr'], analytics.subscriptions.groupby('plan_type')['mrr'].mean())